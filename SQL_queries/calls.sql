@@ -11,8 +11,9 @@ SELECT * FROM v_all_data WHERE run_id = 1 ORDER BY column_name;
 SELECT * FROM v_production_runs WHERE run_id = 1;
 
 #Customer değerini bul:
-SELECT rv.string_value
+SELECT d.string_value
 FROM runid_stringvalues rv
+JOIN string_dictionary d ON d.string_code = rv.string_code
 JOIN stringcols sc ON rv.stringcol_id = sc.stringcol_id
 WHERE rv.run_id = 1 AND sc.column_name = 'customer';
 
@@ -25,5 +26,6 @@ WHERE rv.run_id = 1 AND nc.column_name = 'proof_cut';
 #Band oluşan run'ları bul:
 SELECT DISTINCT rv.run_id
 FROM runid_stringvalues rv
-JOIN stringcols sc ON rv.stringcol_id = sc.stringcol_id
-WHERE sc.column_name = 'band_type' AND rv.string_value = 'band';
\ No newline at end of file
+JOIN string_dictionary d ON d.string_code = rv.string_code
+JOIN stringcols sc ON d.stringcol_id = sc.stringcol_id
+WHERE sc.column_name = 'band_type' AND d.string_value = 'band';
\ No newline at end of file
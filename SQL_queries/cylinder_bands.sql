@@ -31,14 +31,26 @@ CREATE TABLE numericcols (
 -- VALUE TABLES - Değerler
 -- ============================================================================
 
--- String değerler
+-- String değer sözlüğü: sütun başına farklı değerler -> tam sayı kod
+-- (customer, ink_type, band_type... birkaç / birkaç yüz farklı değer; hücreler kodu saklar)
+-- utf8mb4_bin: kod değerin birebir karşılığı ('Abc' ile 'abc' ayrı kod)
+CREATE TABLE string_dictionary (
+    string_code INT AUTO_INCREMENT PRIMARY KEY,
+    stringcol_id INT NOT NULL,
+    string_value VARCHAR(200) COLLATE utf8mb4_bin NOT NULL,
+    UNIQUE INDEX idx_dictionary_value (stringcol_id, string_value),
+    FOREIGN KEY (stringcol_id) REFERENCES stringcols(stringcol_id) ON DELETE CASCADE
+);
+
+-- String değerler (string_dictionary kodu)
 CREATE TABLE runid_stringvalues (
     run_id INT NOT NULL,
     stringcol_id INT NOT NULL,
-    string_value VARCHAR(200),
+    string_code INT NOT NULL,
     PRIMARY KEY (run_id, stringcol_id),
     FOREIGN KEY (run_id) REFERENCES runs(run_id) ON DELETE CASCADE,
-    FOREIGN KEY (stringcol_id) REFERENCES stringcols(stringcol_id) ON DELETE CASCADE
+    FOREIGN KEY (stringcol_id) REFERENCES stringcols(stringcol_id) ON DELETE CASCADE,
+    FOREIGN KEY (string_code) REFERENCES string_dictionary(string_code)
 );
 
 -- Numeric değerler
@@ -51,15 +63,137 @@ CREATE TABLE runid_numericvalues (
     FOREIGN KEY (numericcol_id) REFERENCES numericcols(numericcol_id) ON DELETE CASCADE
 );
 
+-- ============================================================================
+-- INCREMENTAL LOAD - Run parmak izleri
+-- ============================================================================
+
+-- natural_key: hash(timestamp, job_number, cylinder_number) -> run kimliği
+-- row_hash: hash(tüm nitelikler) -> değişiklik tespiti
+CREATE TABLE run_fingerprints (
+    run_id INT PRIMARY KEY,
+    natural_key BIGINT UNSIGNED NOT NULL,
+    row_hash BIGINT UNSIGNED NOT NULL,
+    UNIQUE INDEX idx_natural_key (natural_key),
+    FOREIGN KEY (run_id) REFERENCES runs(run_id) ON DELETE CASCADE
+);
+
+-- ============================================================================
+-- DATA / SCHEMA VERSION - Loader her yazmada artırır
+-- ============================================================================
+CREATE TABLE load_state (
+    id TINYINT PRIMARY KEY,
+    data_version BIGINT NOT NULL DEFAULT 0,
+    schema_version BIGINT NOT NULL DEFAULT 0,  -- stringcols/numericcols değişince artar
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT INTO load_state (id, data_version, schema_version) VALUES (1, 0, 0);
+
+-- Materialized tabloların hangi data_version'dan üretildiği (staleness kontrolü)
+CREATE TABLE materialized_state (
+    name VARCHAR(50) PRIMARY KEY,
+    data_version BIGINT NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT INTO materialized_state (name, data_version) VALUES ('production_runs', 0);
+
+-- /statistics dashboard snapshot'ı (loader data_version ile birlikte yazar)
+CREATE TABLE statistics_snapshot (
+    id TINYINT PRIMARY KEY,
+    data_version BIGINT NOT NULL,
+    payload JSON NOT NULL,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- ============================================================================
+-- MATERIALIZED WIDE TABLE - v_production_runs pivot'unun yerine
+-- ============================================================================
+-- Loader tarafından toplu doldurulur, incremental yüklemede senkron tutulur
+CREATE TABLE production_runs (
+    run_id INT PRIMARY KEY,
+    timestamp DATE NOT NULL,
+
+    -- String sütunlar
+    cylinder_number VARCHAR(200),
+    customer VARCHAR(200),
+    job_number VARCHAR(200),
+    grain_screened VARCHAR(200),
+    proof_on_ctd_ink VARCHAR(200),
+    blade_mfg VARCHAR(200),
+    paper_type VARCHAR(200),
+    ink_type VARCHAR(200),
+    direct_steam VARCHAR(200),
+    solvent_type VARCHAR(200),
+    type_on_cylinder VARCHAR(200),
+    press_type VARCHAR(200),
+    press VARCHAR(200),
+    unit_number VARCHAR(200),
+    cylinder_size VARCHAR(200),
+    paper_mill_location VARCHAR(200),
+    plating_tank VARCHAR(200),
+    band_type VARCHAR(200),
+
+    -- Numeric sütunlar
+    proof_cut DECIMAL(10,5),
+    viscosity DECIMAL(10,5),
+    caliper DECIMAL(10,5),
+    ink_temperature DECIMAL(10,5),
+    humidity DECIMAL(10,5),
+    roughness DECIMAL(10,5),
+    blade_pressure DECIMAL(10,5),
+    varnish_pct DECIMAL(10,5),
+    press_speed DECIMAL(10,5),
+    ink_pct DECIMAL(10,5),
+    solvent_pct DECIMAL(10,5),
+    ESA_Voltage DECIMAL(10,5),
+    ESA_Amperage DECIMAL(10,5),
+    wax DECIMAL(10,5),
+    hardener DECIMAL(10,5),
+    roller_durometer DECIMAL(10,5),
+    current_density DECIMAL(10,5),
+    anode_space_ratio DECIMAL(10,5),
+    chrome_content DECIMAL(10,5),
+
+    INDEX idx_pr_customer (customer),
+    INDEX idx_pr_band_type (band_type),
+    INDEX idx_pr_press (press),
+    INDEX idx_pr_timestamp (timestamp),
+    FOREIGN KEY (run_id) REFERENCES runs(run_id) ON DELETE CASCADE
+);
+
+-- ============================================================================
+-- ROLLUP CUBE - (string değer, numeric sütun) başına count / sum / sum of squares
+-- ============================================================================
+-- Loader incremental olarak günceller; /api/aggregate tek sütunlu gruplamaları
+-- değer tablolarına dokunmadan buradan cevaplar.
+-- numericcol_id = 0 -> ölçü yok, sadece run sayısı
+CREATE TABLE rollup_cube (
+    stringcol_id INT NOT NULL,
+    numericcol_id INT NOT NULL,
+    string_value VARCHAR(200) COLLATE utf8mb4_bin NOT NULL,  -- string_dictionary ile aynı
+    n BIGINT NOT NULL,
+    total DOUBLE NOT NULL,
+    total_sq DOUBLE NOT NULL,
+    PRIMARY KEY (stringcol_id, numericcol_id, string_value)
+);
+
+INSERT INTO materialized_state (name, data_version) VALUES ('rollup_cube', 0);
+
 -- ============================================================================
 -- ADDITIONAL INDEXES - Query performance optimization
 -- ============================================================================
 
--- String value aramaları için index (opsiyonel - büyük datada faydalı)
--- CREATE INDEX idx_string_value ON runid_stringvalues(string_value(50));
+-- (sütun, kod) eşitlik filtreleri ve GROUP BY (/runs customer ve band_type EXISTS semijoin'leri;
+-- değer -> kod çözümü string_dictionary'nin unique index'inden)
+CREATE INDEX idx_stringcol_code ON runid_stringvalues(stringcol_id, string_code);
 
 -- Composite index - stringcol_id ile filtreleme ve run_id ile join
 CREATE INDEX idx_stringcol_run ON runid_stringvalues(stringcol_id, run_id);
 
 -- Composite index - numericcol_id ile filtreleme ve run_id ile join
 CREATE INDEX idx_numericcol_run ON runid_numericvalues(numericcol_id, run_id);
+
+-- Covering index - numeric aralık araması (search_numeric_attribute): (sütun, değer) aralık
+-- taraması (value, run_id) sırasında döner, ayrı sıralama ve tablo erişimi yok
+CREATE INDEX idx_numericcol_value ON runid_numericvalues(numericcol_id, numeric_value, run_id);
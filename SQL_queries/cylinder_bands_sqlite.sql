@@ -0,0 +1,230 @@
+-- ============================================================================
+-- CYLINDER BANDS DATABASE - GÖMÜLÜ (SQLite) ŞEMA
+-- cylinder_bands.sql ile aynı tablolar; storage.SQLiteBackend ilk açılışta çalıştırır
+-- ============================================================================
+-- Farklar:
+--   - AUTO_INCREMENT -> INTEGER PRIMARY KEY AUTOINCREMENT
+--   - DECIMAL(10,5) -> REAL
+--   - production_runs string sütunları COLLATE NOCASE (MySQL'in varsayılan _ci collation'ı gibi;
+--     LIKE 'abc%' önek aramaları index'i kullanabilir); string_dictionary BINARY (utf8mb4_bin gibi)
+--   - Stored procedure yok: karşılıkları storage.StorageBackend metotları
+
+PRAGMA foreign_keys = ON;
+
+-- ============================================================================
+-- RUNS TABLE - Temel bilgiler
+-- ============================================================================
+CREATE TABLE runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp DATE NOT NULL  -- 'YYYY-MM-DD'
+);
+
+CREATE INDEX idx_timestamp ON runs(timestamp);
+
+-- ============================================================================
+-- METADATA TABLES - Sütun isimleri
+-- ============================================================================
+
+-- String sütun isimleri
+CREATE TABLE stringcols (
+    stringcol_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    column_name VARCHAR(50) NOT NULL UNIQUE
+);
+
+-- Numeric sütun isimleri
+CREATE TABLE numericcols (
+    numericcol_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    column_name VARCHAR(50) NOT NULL UNIQUE
+);
+
+-- ============================================================================
+-- VALUE TABLES - Değerler
+-- ============================================================================
+
+-- String değer sözlüğü: sütun başına farklı değerler -> tam sayı kod
+CREATE TABLE string_dictionary (
+    string_code INTEGER PRIMARY KEY AUTOINCREMENT,
+    stringcol_id INTEGER NOT NULL,
+    string_value VARCHAR(200) NOT NULL,
+    UNIQUE (stringcol_id, string_value),
+    FOREIGN KEY (stringcol_id) REFERENCES stringcols(stringcol_id) ON DELETE CASCADE
+);
+
+-- String değerler (string_dictionary kodu)
+CREATE TABLE runid_stringvalues (
+    run_id INTEGER NOT NULL,
+    stringcol_id INTEGER NOT NULL,
+    string_code INTEGER NOT NULL,
+    PRIMARY KEY (run_id, stringcol_id),
+    FOREIGN KEY (run_id) REFERENCES runs(run_id) ON DELETE CASCADE,
+    FOREIGN KEY (stringcol_id) REFERENCES stringcols(stringcol_id) ON DELETE CASCADE,
+    FOREIGN KEY (string_code) REFERENCES string_dictionary(string_code)
+) WITHOUT ROWID;
+
+-- Numeric değerler
+CREATE TABLE runid_numericvalues (
+    run_id INTEGER NOT NULL,
+    numericcol_id INTEGER NOT NULL,
+    numeric_value REAL,
+    PRIMARY KEY (run_id, numericcol_id),
+    FOREIGN KEY (run_id) REFERENCES runs(run_id) ON DELETE CASCADE,
+    FOREIGN KEY (numericcol_id) REFERENCES numericcols(numericcol_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- ============================================================================
+-- INCREMENTAL LOAD - Run parmak izleri
+-- ============================================================================
+
+-- SQLite INTEGER işaretli 64 bit: uint64 parmak izleri aynı bitlerle int64 saklanır
+CREATE TABLE run_fingerprints (
+    run_id INTEGER PRIMARY KEY,
+    natural_key INTEGER NOT NULL UNIQUE,
+    row_hash INTEGER NOT NULL,
+    FOREIGN KEY (run_id) REFERENCES runs(run_id) ON DELETE CASCADE
+);
+
+-- ============================================================================
+-- DATA / SCHEMA VERSION - Loader her yazmada artırır
+-- ============================================================================
+CREATE TABLE load_state (
+    id INTEGER PRIMARY KEY,
+    data_version INTEGER NOT NULL DEFAULT 0,
+    schema_version INTEGER NOT NULL DEFAULT 0,  -- stringcols/numericcols değişince artar
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO load_state (id, data_version, schema_version) VALUES (1, 0, 0);
+
+-- Materialized tabloların hangi data_version'dan üretildiği (staleness kontrolü)
+CREATE TABLE materialized_state (
+    name VARCHAR(50) PRIMARY KEY,
+    data_version INTEGER NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO materialized_state (name, data_version) VALUES ('production_runs', 0);
+
+-- /statistics dashboard snapshot'ı (loader data_version ile birlikte yazar)
+CREATE TABLE statistics_snapshot (
+    id INTEGER PRIMARY KEY,
+    data_version INTEGER NOT NULL,
+    payload TEXT NOT NULL,  -- JSON
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================================================
+-- MATERIALIZED WIDE TABLE - v_production_runs pivot'unun yerine
+-- ============================================================================
+CREATE TABLE production_runs (
+    run_id INTEGER PRIMARY KEY,
+    timestamp DATE NOT NULL,
+
+    -- String sütunlar
+    cylinder_number VARCHAR(200) COLLATE NOCASE,
+    customer VARCHAR(200) COLLATE NOCASE,
+    job_number VARCHAR(200) COLLATE NOCASE,
+    grain_screened VARCHAR(200) COLLATE NOCASE,
+    proof_on_ctd_ink VARCHAR(200) COLLATE NOCASE,
+    blade_mfg VARCHAR(200) COLLATE NOCASE,
+    paper_type VARCHAR(200) COLLATE NOCASE,
+    ink_type VARCHAR(200) COLLATE NOCASE,
+    direct_steam VARCHAR(200) COLLATE NOCASE,
+    solvent_type VARCHAR(200) COLLATE NOCASE,
+    type_on_cylinder VARCHAR(200) COLLATE NOCASE,
+    press_type VARCHAR(200) COLLATE NOCASE,
+    press VARCHAR(200) COLLATE NOCASE,
+    unit_number VARCHAR(200) COLLATE NOCASE,
+    cylinder_size VARCHAR(200) COLLATE NOCASE,
+    paper_mill_location VARCHAR(200) COLLATE NOCASE,
+    plating_tank VARCHAR(200) COLLATE NOCASE,
+    band_type VARCHAR(200) COLLATE NOCASE,
+
+    -- Numeric sütunlar
+    proof_cut REAL,
+    viscosity REAL,
+    caliper REAL,
+    ink_temperature REAL,
+    humidity REAL,
+    roughness REAL,
+    blade_pressure REAL,
+    varnish_pct REAL,
+    press_speed REAL,
+    ink_pct REAL,
+    solvent_pct REAL,
+    ESA_Voltage REAL,
+    ESA_Amperage REAL,
+    wax REAL,
+    hardener REAL,
+    roller_durometer REAL,
+    current_density REAL,
+    anode_space_ratio REAL,
+    chrome_content REAL,
+
+    FOREIGN KEY (run_id) REFERENCES runs(run_id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_pr_customer ON production_runs(customer);
+CREATE INDEX idx_pr_band_type ON production_runs(band_type);
+CREATE INDEX idx_pr_press ON production_runs(press);
+CREATE INDEX idx_pr_timestamp ON production_runs(timestamp);
+
+-- ============================================================================
+-- ROLLUP CUBE - (string değer, numeric sütun) başına count / sum / sum of squares
+-- ============================================================================
+-- Loader incremental olarak günceller; /api/aggregate tek sütunlu gruplamaları
+-- değer tablolarına dokunmadan buradan cevaplar.
+-- numericcol_id = 0 -> ölçü yok, sadece run sayısı
+CREATE TABLE rollup_cube (
+    stringcol_id INTEGER NOT NULL,
+    numericcol_id INTEGER NOT NULL,
+    string_value VARCHAR(200) NOT NULL,  -- string_dictionary ile aynı (BINARY)
+    n INTEGER NOT NULL,
+    total REAL NOT NULL,
+    total_sq REAL NOT NULL,
+    PRIMARY KEY (stringcol_id, numericcol_id, string_value)
+) WITHOUT ROWID;
+
+INSERT INTO materialized_state (name, data_version) VALUES ('rollup_cube', 0);
+
+-- ============================================================================
+-- ADDITIONAL INDEXES - Query performance optimization
+-- ============================================================================
+
+-- (sütun, kod) eşitlik filtreleri ve GROUP BY
+CREATE INDEX idx_stringcol_code ON runid_stringvalues(stringcol_id, string_code);
+
+-- Composite index - stringcol_id ile filtreleme ve run_id ile join
+CREATE INDEX idx_stringcol_run ON runid_stringvalues(stringcol_id, run_id);
+
+-- Composite index - numericcol_id ile filtreleme ve run_id ile join
+CREATE INDEX idx_numericcol_run ON runid_numericvalues(numericcol_id, run_id);
+
+-- Covering index - numeric aralık araması (search_numeric_attribute): (sütun, değer) aralık
+-- taraması (value, run_id) sırasında döner, ayrı sıralama ve tablo erişimi yok
+CREATE INDEX idx_numericcol_value ON runid_numericvalues(numericcol_id, numeric_value, run_id);
+
+-- ============================================================================
+-- VIEWS (views.sql ile aynı)
+-- ============================================================================
+CREATE VIEW v_string_data AS
+SELECT rv.run_id, r.timestamp, sc.column_name, d.string_value
+FROM runid_stringvalues rv
+JOIN runs r ON rv.run_id = r.run_id
+JOIN stringcols sc ON rv.stringcol_id = sc.stringcol_id
+JOIN string_dictionary d ON d.string_code = rv.string_code;
+
+CREATE VIEW v_numeric_data AS
+SELECT rv.run_id, r.timestamp, nc.column_name, rv.numeric_value
+FROM runid_numericvalues rv
+JOIN runs r ON rv.run_id = r.run_id
+JOIN numericcols nc ON rv.numericcol_id = nc.numericcol_id;
+
+CREATE VIEW v_all_data AS
+SELECT run_id, timestamp, column_name, string_value AS value, 'string' AS data_type
+FROM v_string_data
+UNION ALL
+SELECT run_id, timestamp, column_name, CAST(numeric_value AS TEXT) AS value, 'numeric' AS data_type
+FROM v_numeric_data;
+
+CREATE VIEW v_production_runs AS
+SELECT * FROM production_runs;
@@ -0,0 +1,42 @@
+-- ============================================================================
+-- MIGRATION: search_numeric_attribute aralık index'i + keyset sayfalama
+-- ============================================================================
+-- Bu index'ten önce kurulmuş MySQL veritabanları için tek seferlik.
+-- SQLite dosyalarında sadece CREATE INDEX satırı çalıştırılır:
+--   sqlite3 data/cylinder_bands.db "CREATE INDEX idx_numericcol_value ON runid_numericvalues(numericcol_id, numeric_value, run_id);"
+-- ============================================================================
+USE cylinder_bands_db;
+
+CREATE INDEX idx_numericcol_value ON runid_numericvalues(numericcol_id, numeric_value, run_id);
+
+-- Eski 3 parametreli procedure -> 6 parametreli (imleç + limit)
+DROP PROCEDURE IF EXISTS search_numeric_attribute;
+
+DELIMITER $$
+
+-- Tek sargable aralık: idx_numericcol_value üzerinde (value, run_id) sırasında tarama.
+-- p_after_value + p_after_run_id: önceki sayfanın son satırı (keyset imleci), NULL -> ilk sayfa
+CREATE PROCEDURE search_numeric_attribute(
+    IN p_numericcol_id INT,
+    IN p_min_value DECIMAL(10,5),
+    IN p_max_value DECIMAL(10,5),
+    IN p_after_value DECIMAL(10,5),
+    IN p_after_run_id INT,
+    IN p_limit INT
+)
+BEGIN
+    SELECT r.run_id, r.timestamp, nv.numeric_value as value
+    FROM runid_numericvalues nv
+    JOIN runs r ON r.run_id = nv.run_id
+    WHERE nv.numericcol_id = p_numericcol_id
+    AND nv.numeric_value BETWEEN GREATEST(COALESCE(p_min_value, -99999.99999),
+                                          COALESCE(p_after_value, -99999.99999))
+                             AND COALESCE(p_max_value, 99999.99999)
+    AND (p_after_run_id IS NULL
+         OR nv.numeric_value > p_after_value
+         OR nv.run_id > p_after_run_id)
+    ORDER BY nv.numeric_value, nv.run_id
+    LIMIT p_limit;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,65 @@
+-- ============================================================================
+-- MIGRATION: runid_stringvalues.string_value -> string_dictionary kodu
+-- ============================================================================
+-- Eski şemayla (string_value sütunlu) kurulmuş MySQL veritabanları için tek seferlik.
+-- Yeni kurulumlar cylinder_bands.sql'den zaten sözlüklü gelir.
+-- Sonrasında: SOURCE views.sql; SOURCE stored_procedures.sql;
+--             python load_data.py --refresh-mv
+-- (SQLite dosyaları yeniden yüklenir: python load_data.py --sqlite PATH)
+-- ============================================================================
+USE cylinder_bands_db;
+
+CREATE TABLE string_dictionary (
+    string_code INT AUTO_INCREMENT PRIMARY KEY,
+    stringcol_id INT NOT NULL,
+    string_value VARCHAR(200) COLLATE utf8mb4_bin NOT NULL,
+    UNIQUE INDEX idx_dictionary_value (stringcol_id, string_value),
+    FOREIGN KEY (stringcol_id) REFERENCES stringcols(stringcol_id) ON DELETE CASCADE
+);
+
+-- Farklı değerler birebir (büyük/küçük harf ayrı) -> kod
+INSERT INTO string_dictionary (stringcol_id, string_value)
+SELECT DISTINCT stringcol_id, string_value COLLATE utf8mb4_bin
+FROM runid_stringvalues
+WHERE string_value IS NOT NULL;
+
+ALTER TABLE runid_stringvalues ADD COLUMN string_code INT NULL;
+
+UPDATE runid_stringvalues sv
+JOIN string_dictionary d
+    ON d.stringcol_id = sv.stringcol_id
+    AND d.string_value = sv.string_value COLLATE utf8mb4_bin
+SET sv.string_code = d.string_code;
+
+-- NULL değerler loader tarafından zaten saklanmıyordu
+DELETE FROM runid_stringvalues WHERE string_code IS NULL;
+
+ALTER TABLE runid_stringvalues
+    DROP INDEX idx_stringcol_value,
+    DROP COLUMN string_value,
+    MODIFY string_code INT NOT NULL,
+    ADD INDEX idx_stringcol_code (stringcol_id, string_code),
+    ADD FOREIGN KEY (string_code) REFERENCES string_dictionary(string_code);
+
+-- Küp kod üzerinden (birebir) gruplanır
+ALTER TABLE rollup_cube MODIFY string_value VARCHAR(200) COLLATE utf8mb4_bin NOT NULL;
+
+-- views.sql / stored_procedures.sql yeniden çalıştırılabilsin
+DROP VIEW IF EXISTS v_all_data;
+DROP VIEW IF EXISTS v_string_data;
+DROP VIEW IF EXISTS v_numeric_data;
+DROP VIEW IF EXISTS v_production_runs;
+
+DROP PROCEDURE IF EXISTS get_run_details;
+DROP PROCEDURE IF EXISTS count_band_types;
+DROP PROCEDURE IF EXISTS get_customer_run_count;
+DROP PROCEDURE IF EXISTS search_runs_by_date;
+DROP PROCEDURE IF EXISTS get_customer_report;
+DROP PROCEDURE IF EXISTS delete_runs_before_date;
+DROP PROCEDURE IF EXISTS quick_search;
+DROP PROCEDURE IF EXISTS search_string_attribute;
+DROP PROCEDURE IF EXISTS search_numeric_attribute;
+DROP PROCEDURE IF EXISTS get_statistics;
+
+-- App önbellekleri (sözlük, arama index'i, run detay) yeniden okusun
+UPDATE load_state SET data_version = data_version + 1 WHERE id = 1;
@@ -13,16 +13,15 @@ BEGIN
     -- Get run timestamp
     SELECT run_id, timestamp FROM runs WHERE run_id = p_run_id;
     
-    -- Get string values
-    SELECT sc.column_name, sv.string_value
+    -- Get string values (column_name ve string_code uygulamada id -> isim / kod -> değer
+    -- önbelleklerinden çözülür)
+    SELECT sv.stringcol_id, sv.string_code
     FROM runid_stringvalues sv
-    JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     WHERE sv.run_id = p_run_id;
     
     -- Get numeric values
-    SELECT nc.column_name, nv.numeric_value
+    SELECT nv.numericcol_id, nv.numeric_value
     FROM runid_numericvalues nv
-    JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
     WHERE nv.run_id = p_run_id;
 END$$
 
@@ -43,13 +42,15 @@ CREATE PROCEDURE count_band_types(
 BEGIN
     SELECT COUNT(*) INTO band_count
     FROM runid_stringvalues sv
-    JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-    WHERE sc.column_name = 'band_type' AND sv.string_value = 'band';
+    JOIN string_dictionary d ON d.string_code = sv.string_code
+    JOIN stringcols sc ON d.stringcol_id = sc.stringcol_id
+    WHERE sc.column_name = 'band_type' AND d.string_value = 'band';
     
     SELECT COUNT(*) INTO noband_count
     FROM runid_stringvalues sv
-    JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-    WHERE sc.column_name = 'band_type' AND sv.string_value = 'noband';
+    JOIN string_dictionary d ON d.string_code = sv.string_code
+    JOIN stringcols sc ON d.stringcol_id = sc.stringcol_id
+    WHERE sc.column_name = 'band_type' AND d.string_value = 'noband';
 END$$
 
 DELIMITER ;
@@ -72,9 +73,10 @@ BEGIN
     
     SELECT COUNT(*) INTO run_count
     FROM runid_stringvalues sv
-    JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
+    JOIN string_dictionary d ON d.string_code = sv.string_code
+    JOIN stringcols sc ON d.stringcol_id = sc.stringcol_id
     WHERE sc.column_name = 'customer' 
-    AND sv.string_value = customer_name;
+    AND LOWER(d.string_value) = LOWER(customer_name);
     
     -- Return format: "customer_name: X runs"
     SET customer_name = CONCAT(customer_name, ': ', run_count, ' runs');
@@ -108,11 +110,12 @@ BEGIN
     -- Calculate band percentage
     SELECT 
         ROUND(
-            (SUM(CASE WHEN sv.string_value = 'band' THEN 1 ELSE 0 END) / COUNT(*)) * 100,
+            (SUM(CASE WHEN d.string_value = 'band' THEN 1 ELSE 0 END) / COUNT(*)) * 100,
             2
         ) INTO band_percentage
     FROM runs r
     JOIN runid_stringvalues sv ON r.run_id = sv.run_id
+    JOIN string_dictionary d ON d.string_code = sv.string_code
     JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     WHERE r.timestamp BETWEEN start_date AND end_date
     AND sc.column_name = 'band_type';
@@ -147,19 +150,22 @@ BEGIN
     SELECT COUNT(DISTINCT r.run_id) INTO total_runs
     FROM runs r
     JOIN runid_stringvalues sv ON r.run_id = sv.run_id
+    JOIN string_dictionary d ON d.string_code = sv.string_code
     JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     WHERE sc.column_name = 'customer' 
-    AND sv.string_value = p_customer_name;
+    AND LOWER(d.string_value) = LOWER(p_customer_name);
     
     -- Get band runs
     SELECT COUNT(DISTINCT r.run_id) INTO band_runs
     FROM runs r
     JOIN runid_stringvalues sv1 ON r.run_id = sv1.run_id
+    JOIN string_dictionary d1 ON d1.string_code = sv1.string_code
     JOIN stringcols sc1 ON sv1.stringcol_id = sc1.stringcol_id
     JOIN runid_stringvalues sv2 ON r.run_id = sv2.run_id
+    JOIN string_dictionary d2 ON d2.string_code = sv2.string_code
     JOIN stringcols sc2 ON sv2.stringcol_id = sc2.stringcol_id
-    WHERE sc1.column_name = 'customer' AND sv1.string_value = p_customer_name
-    AND sc2.column_name = 'band_type' AND sv2.string_value = 'band';
+    WHERE sc1.column_name = 'customer' AND LOWER(d1.string_value) = LOWER(p_customer_name)
+    AND sc2.column_name = 'band_type' AND d2.string_value = 'band';
     
     -- Calculate band rate
     IF total_runs > 0 THEN
@@ -172,15 +178,17 @@ BEGIN
     SELECT 
         r.run_id,
         r.timestamp,
-        sv_band.string_value as band_type
+        d_band.string_value as band_type
     FROM runs r
     JOIN runid_stringvalues sv_cust ON r.run_id = sv_cust.run_id
+    JOIN string_dictionary d_cust ON d_cust.string_code = sv_cust.string_code
     JOIN stringcols sc_cust ON sv_cust.stringcol_id = sc_cust.stringcol_id
     LEFT JOIN runid_stringvalues sv_band ON r.run_id = sv_band.run_id
+    LEFT JOIN string_dictionary d_band ON d_band.string_code = sv_band.string_code
     LEFT JOIN stringcols sc_band ON sv_band.stringcol_id = sc_band.stringcol_id
         AND sc_band.column_name = 'band_type'
     WHERE sc_cust.column_name = 'customer'
-    AND sv_cust.string_value = p_customer_name
+    AND LOWER(d_cust.string_value) = LOWER(p_customer_name)
     ORDER BY r.timestamp;
 END$$
 
@@ -225,81 +233,11 @@ DELIMITER ;
 -- ============================================================================
 -- Get filtered runs list
 -- ============================================================================
-DELIMITER $$
-
-CREATE PROCEDURE get_runs_list(
-    IN p_date_from DATE,
-    IN p_date_to DATE,
-    IN p_customer VARCHAR(100),
-    IN p_band_type VARCHAR(50),
-    IN p_sort_by VARCHAR(50),
-    IN p_sort_order VARCHAR(4)
-)
-BEGIN
-    SET @query = 'SELECT DISTINCT r.run_id, r.timestamp FROM runs r';
-    SET @where_clause = '';
-    SET @join_customer = '';
-    SET @join_band = '';
-    
-    -- Build JOINs
-    IF p_customer IS NOT NULL AND p_customer != '' THEN
-        SET @join_customer = ' JOIN runid_stringvalues sv_cust ON r.run_id = sv_cust.run_id
-            JOIN stringcols sc_cust ON sv_cust.stringcol_id = sc_cust.stringcol_id';
-    END IF;
-    
-    IF p_band_type IS NOT NULL AND p_band_type != '' THEN
-        SET @join_band = ' JOIN runid_stringvalues sv_band ON r.run_id = sv_band.run_id
-            JOIN stringcols sc_band ON sv_band.stringcol_id = sc_band.stringcol_id';
-    END IF;
-    
-    SET @query = CONCAT(@query, @join_customer, @join_band);
-    
-    -- Build WHERE
-    SET @conditions = '';
-    
-    IF p_date_from IS NOT NULL THEN
-        SET @conditions = CONCAT(@conditions, ' r.timestamp >= ''', p_date_from, '''');
-    END IF;
-    
-    IF p_date_to IS NOT NULL THEN
-        IF @conditions != '' THEN
-            SET @conditions = CONCAT(@conditions, ' AND');
-        END IF;
-        SET @conditions = CONCAT(@conditions, ' r.timestamp <= ''', p_date_to, '''');
-    END IF;
-    
-    IF p_customer IS NOT NULL AND p_customer != '' THEN
-        IF @conditions != '' THEN
-            SET @conditions = CONCAT(@conditions, ' AND');
-        END IF;
-        SET @conditions = CONCAT(@conditions, ' sc_cust.column_name = ''customer'' AND sv_cust.string_value LIKE ''%', p_customer, '%''');
-    END IF;
-    
-    IF p_band_type IS NOT NULL AND p_band_type != '' THEN
-        IF @conditions != '' THEN
-            SET @conditions = CONCAT(@conditions, ' AND');
-        END IF;
-        SET @conditions = CONCAT(@conditions, ' sc_band.column_name = ''band_type'' AND sv_band.string_value = ''', p_band_type, '''');
-    END IF;
-    
-    IF @conditions != '' THEN
-        SET @query = CONCAT(@query, ' WHERE', @conditions);
-    END IF;
-    
-    -- Add ORDER BY
-    IF p_sort_by IS NOT NULL AND p_sort_order IS NOT NULL THEN
-        SET @query = CONCAT(@query, ' ORDER BY r.', p_sort_by, ' ', p_sort_order);
-    ELSE
-        SET @query = CONCAT(@query, ' ORDER BY r.run_id DESC');
-    END IF;
-    
-    -- Execute
-    PREPARE stmt FROM @query;
-    EXECUTE stmt;
-    DEALLOCATE PREPARE stmt;
-END$$
-
-DELIMITER ;
+-- get_runs_list kaldırıldı: kullanıcı girdisini CONCAT ile SQL'e ekliyordu
+-- (injection + plan cache yok) ve sayfalama yapmıyordu. Yerine app.py
+-- build_runs_query(): parametreli EXISTS semijoin'ler, sıralama whitelist'i,
+-- keyset pagination (after_run_id, limit).
+DROP PROCEDURE IF EXISTS get_runs_list;
 
 -- ============================================================================
 -- Quick search by run_id or customer
@@ -308,6 +246,7 @@ DELIMITER $$
 
 CREATE PROCEDURE quick_search(
     IN search_query VARCHAR(100),
+    IN p_customer_col_id INT,
     OUT search_type VARCHAR(50)
 )
 BEGIN
@@ -316,14 +255,14 @@ BEGIN
         SET search_type = 'Run ID';
         SELECT * FROM runs WHERE run_id = CAST(search_query AS UNSIGNED);
     ELSE
-        -- Search by customer
+        -- Search by customer: LIKE küçük sözlükte, hücreler kodla (idx_stringcol_code)
         SET search_type = 'Customer Name';
-        SELECT DISTINCT r.run_id, r.timestamp, sv.string_value as customer
-        FROM runs r
-        JOIN runid_stringvalues sv ON r.run_id = sv.run_id
-        JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-        WHERE sc.column_name = 'customer' 
-        AND sv.string_value LIKE CONCAT('%', search_query, '%')
+        SELECT DISTINCT r.run_id, r.timestamp, d.string_value as customer
+        FROM string_dictionary d
+        JOIN runid_stringvalues sv ON sv.stringcol_id = d.stringcol_id AND sv.string_code = d.string_code
+        JOIN runs r ON r.run_id = sv.run_id
+        WHERE d.stringcol_id = p_customer_col_id
+        AND LOWER(d.string_value) LIKE CONCAT('%', LOWER(search_query), '%')
         ORDER BY r.run_id
         LIMIT 50;
     END IF;
@@ -337,16 +276,16 @@ DELIMITER ;
 DELIMITER $$
 
 CREATE PROCEDURE search_string_attribute(
-    IN p_column_name VARCHAR(50),
+    IN p_stringcol_id INT,
     IN p_search_value VARCHAR(200)
 )
 BEGIN
-    SELECT r.run_id, r.timestamp, sv.string_value as value
-    FROM runs r
-    JOIN runid_stringvalues sv ON r.run_id = sv.run_id
-    JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-    WHERE sc.column_name = p_column_name 
-    AND sv.string_value LIKE CONCAT('%', p_search_value, '%')
+    SELECT r.run_id, r.timestamp, d.string_value as value
+    FROM string_dictionary d
+    JOIN runid_stringvalues sv ON sv.stringcol_id = d.stringcol_id AND sv.string_code = d.string_code
+    JOIN runs r ON r.run_id = sv.run_id
+    WHERE d.stringcol_id = p_stringcol_id
+    AND LOWER(d.string_value) LIKE CONCAT('%', LOWER(p_search_value), '%')
     ORDER BY r.run_id
     LIMIT 100;
 END$$
@@ -358,48 +297,29 @@ DELIMITER ;
 -- ============================================================================
 DELIMITER $$
 
+-- Tek sargable aralık: idx_numericcol_value üzerinde (value, run_id) sırasında tarama.
+-- p_after_value + p_after_run_id: önceki sayfanın son satırı (keyset imleci), NULL -> ilk sayfa
 CREATE PROCEDURE search_numeric_attribute(
-    IN p_column_name VARCHAR(50),
+    IN p_numericcol_id INT,
     IN p_min_value DECIMAL(10,5),
-    IN p_max_value DECIMAL(10,5)
+    IN p_max_value DECIMAL(10,5),
+    IN p_after_value DECIMAL(10,5),
+    IN p_after_run_id INT,
+    IN p_limit INT
 )
 BEGIN
-    IF p_min_value IS NOT NULL AND p_max_value IS NOT NULL THEN
-        SELECT r.run_id, r.timestamp, nv.numeric_value as value
-        FROM runs r
-        JOIN runid_numericvalues nv ON r.run_id = nv.run_id
-        JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
-        WHERE nc.column_name = p_column_name 
-        AND nv.numeric_value BETWEEN p_min_value AND p_max_value
-        ORDER BY r.run_id
-        LIMIT 100;
-    ELSEIF p_min_value IS NOT NULL THEN
-        SELECT r.run_id, r.timestamp, nv.numeric_value as value
-        FROM runs r
-        JOIN runid_numericvalues nv ON r.run_id = nv.run_id
-        JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
-        WHERE nc.column_name = p_column_name 
-        AND nv.numeric_value >= p_min_value
-        ORDER BY r.run_id
-        LIMIT 100;
-    ELSEIF p_max_value IS NOT NULL THEN
-        SELECT r.run_id, r.timestamp, nv.numeric_value as value
-        FROM runs r
-        JOIN runid_numericvalues nv ON r.run_id = nv.run_id
-        JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
-        WHERE nc.column_name = p_column_name 
-        AND nv.numeric_value <= p_max_value
-        ORDER BY r.run_id
-        LIMIT 100;
-    ELSE
-        SELECT r.run_id, r.timestamp, nv.numeric_value as value
-        FROM runs r
-        JOIN runid_numericvalues nv ON r.run_id = nv.run_id
-        JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
-        WHERE nc.column_name = p_column_name
-        ORDER BY r.run_id
-        LIMIT 100;
-    END IF;
+    SELECT r.run_id, r.timestamp, nv.numeric_value as value
+    FROM runid_numericvalues nv
+    JOIN runs r ON r.run_id = nv.run_id
+    WHERE nv.numericcol_id = p_numericcol_id
+    AND nv.numeric_value BETWEEN GREATEST(COALESCE(p_min_value, -99999.99999),
+                                          COALESCE(p_after_value, -99999.99999))
+                             AND COALESCE(p_max_value, 99999.99999)
+    AND (p_after_run_id IS NULL
+         OR nv.numeric_value > p_after_value
+         OR nv.run_id > p_after_run_id)
+    ORDER BY nv.numeric_value, nv.run_id
+    LIMIT p_limit;
 END$$
 
 DELIMITER ;
@@ -422,13 +342,15 @@ BEGIN
     -- Band counts
     SELECT COUNT(*) INTO band_count
     FROM runid_stringvalues sv
-    JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-    WHERE sc.column_name = 'band_type' AND sv.string_value = 'band';
+    JOIN string_dictionary d ON d.string_code = sv.string_code
+    JOIN stringcols sc ON d.stringcol_id = sc.stringcol_id
+    WHERE sc.column_name = 'band_type' AND d.string_value = 'band';
     
     SELECT COUNT(*) INTO noband_count
     FROM runid_stringvalues sv
-    JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-    WHERE sc.column_name = 'band_type' AND sv.string_value = 'noband';
+    JOIN string_dictionary d ON d.string_code = sv.string_code
+    JOIN stringcols sc ON d.stringcol_id = sc.stringcol_id
+    WHERE sc.column_name = 'band_type' AND d.string_value = 'noband';
     
     -- Band percentage
     IF total_runs > 0 THEN
@@ -438,37 +360,41 @@ BEGIN
     END IF;
     
     -- Also return top cylinder
-    SELECT sv.string_value as cylinder, COUNT(*) as count
+    SELECT d.string_value as cylinder, COUNT(*) as count
     FROM runid_stringvalues sv
+    JOIN string_dictionary d ON d.string_code = sv.string_code
     JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     WHERE sc.column_name = 'cylinder_number'
-    GROUP BY sv.string_value
+    GROUP BY d.string_code
     ORDER BY count DESC
     LIMIT 1;
     
     -- Top customers
-    SELECT sv.string_value as customer, COUNT(*) as count
+    SELECT d.string_value as customer, COUNT(*) as count
     FROM runid_stringvalues sv
+    JOIN string_dictionary d ON d.string_code = sv.string_code
     JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     WHERE sc.column_name = 'customer'
-    GROUP BY sv.string_value
+    GROUP BY d.string_code
     ORDER BY count DESC
     LIMIT 10;
     
     -- Ink distribution
-    SELECT sv.string_value as ink_type, COUNT(*) as count
+    SELECT d.string_value as ink_type, COUNT(*) as count
     FROM runid_stringvalues sv
+    JOIN string_dictionary d ON d.string_code = sv.string_code
     JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     WHERE sc.column_name = 'ink_type'
-    GROUP BY sv.string_value
+    GROUP BY d.string_code
     ORDER BY count DESC;
     
     -- Press distribution
-    SELECT sv.string_value as press, COUNT(*) as count
+    SELECT d.string_value as press, COUNT(*) as count
     FROM runid_stringvalues sv
+    JOIN string_dictionary d ON d.string_code = sv.string_code
     JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     WHERE sc.column_name = 'press'
-    GROUP BY sv.string_value
+    GROUP BY d.string_code
     ORDER BY count DESC;
     
     -- Avg numeric values
@@ -0,0 +1,401 @@
+"""
+CYLINDER BANDS DATABASE - COLUMNAR ANALYTICS ENGINE
+EAV değer tabloları bir kez belleğe: string nitelikler sözlük kodlu int dizileri,
+numeric nitelikler float dizileri + NULL maskesi (satır = run_id sırası).
+"string ile grupla, numeric'i topla" soruları bincount çekirdekleriyle cevaplanır.
+"""
+
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from string_dictionary import decode_frame, fetch_dictionary
+from versioned_cache import VersionedCache
+
+
+# Kombine grup anahtarı bu boyuta kadar doğrudan bincount; üstünde np.unique ile sıkıştırılır
+DENSE_GROUP_LIMIT = 1 << 20
+
+# Desteklenen aggregate'ler (+ p0..p100 yüzdelikler)
+AGGREGATES = ('count', 'sum', 'avg', 'var', 'std', 'min', 'max')
+PERCENTILE_PATTERN = re.compile(r'^p(\d{1,2}(\.\d+)?|100)$')
+
+# Türetilmiş grup anahtarları (runs.timestamp'ten)
+DERIVED_KEYS = {
+    'month': lambda ts: ts.str[:7],   # 'YYYY-MM'
+    'year': lambda ts: ts.str[:4],
+}
+
+# questions/*.sql karşılıkları: (grup, ölçü, aggregate'ler, sıralama, azalan)
+QUESTIONS = {
+    'q1': ('press_type', 'press_speed', ('avg', 'count'), 'avg', True),
+    'q2': ('cylinder_size', 'ink_temperature', ('max', 'count'), 'max', True),
+    'q3': ('customer', None, ('count',), 'count', True),
+    'q4': ('cylinder_number', 'roughness', ('avg', 'count'), 'avg', True),
+    'q5': ('press', 'ink_pct', ('sum', 'avg', 'count'), 'sum', True),
+    'q6': ('job_number', 'viscosity', ('min', 'count'), 'min', False),
+    'q7': ('paper_type', 'humidity', ('avg', 'count'), 'avg', True),
+    'q8': ('month', None, ('count',), 'month', False),
+    'q9': ('press_type', 'chrome_content', ('avg', 'count'), 'avg', True),
+    'q10': ('solvent_type', 'varnish_pct', ('sum', 'avg', 'count'), 'sum', True),
+}
+
+
+def parse_aggregate(name):
+    """'avg' -> ('avg', None), 'p95' -> ('percentile', 95.0)"""
+    if name in AGGREGATES:
+        return name, None
+    match = PERCENTILE_PATTERN.match(name)
+    if match:
+        return 'percentile', float(match.group(1))
+    raise ValueError(f"Bilinmeyen aggregate: {name} "
+                     f"(seçenekler: {', '.join(AGGREGATES)}, p0..p100)")
+
+
+# ============================================================================
+# SÜTUNSAL DEPO
+# ============================================================================
+
+class ColumnarStore:
+    """run x nitelik seyrek dizileri
+
+    - run_ids: sıralı int64; i. satır = run_ids[i]
+    - strings: isim -> (codes int32, categories) ; kod -1 = NULL, kategoriler sıralı
+    - numerics: isim -> (values float64, valid bool) ; valid=False = NULL
+    """
+
+    def __init__(self, run_ids, timestamps, strings, numerics):
+        self.run_ids = run_ids
+        self.timestamps = timestamps
+        self.strings = strings
+        self.numerics = numerics
+        self._derived = {}
+        self._value_order = {}
+        self._dates = None
+
+    @classmethod
+    def from_connection(cls, connection):
+        """runs + değer tablolarını tek geçişte oku"""
+        cursor = connection.cursor()
+        cursor.execute("SELECT stringcol_id, column_name FROM stringcols")
+        string_names = dict(cursor.fetchall())
+        cursor.execute("SELECT numericcol_id, column_name FROM numericcols")
+        numeric_names = dict(cursor.fetchall())
+
+        cursor.execute("SELECT run_id, timestamp FROM runs ORDER BY run_id")
+        runs = pd.DataFrame(cursor.fetchall(), columns=['run_id', 'timestamp'])
+        cursor.execute("SELECT run_id, stringcol_id, string_code FROM runid_stringvalues")
+        string_rows = pd.DataFrame(cursor.fetchall(), columns=['run_id', 'col_id', 'code'])
+        dictionary = fetch_dictionary(cursor)
+        string_rows = decode_frame(string_rows, dict(zip(dictionary['code'], dictionary['value'])))
+        cursor.execute("SELECT run_id, numericcol_id, numeric_value FROM runid_numericvalues")
+        numeric_rows = pd.DataFrame(cursor.fetchall(), columns=['run_id', 'col_id', 'value'])
+        cursor.close()
+
+        run_ids = runs['run_id'].to_numpy(dtype=np.int64)
+        timestamps = runs['timestamp'].astype(str).to_numpy(dtype=object)
+        return cls.from_frames(run_ids, timestamps,
+                               string_rows, numeric_rows, string_names, numeric_names)
+
+    @classmethod
+    def from_frames(cls, run_ids, timestamps, string_rows, numeric_rows,
+                    string_names, numeric_names):
+        """Uzun (run_id, col_id, value) tablolarından dizileri kur"""
+        n = len(run_ids)
+
+        strings = {}
+        string_rows = string_rows.dropna(subset=['value'])
+        for col_id, group in string_rows.groupby('col_id', sort=False):
+            rows = np.searchsorted(run_ids, group['run_id'].to_numpy(dtype=np.int64))
+            group_codes, categories = pd.factorize(group['value'].astype(str), sort=True)
+            codes = np.full(n, -1, dtype=np.int32)
+            codes[rows] = group_codes
+            strings[string_names[col_id]] = (codes, np.asarray(categories, dtype=object))
+
+        numerics = {}
+        numeric_rows = numeric_rows.dropna(subset=['value'])
+        for col_id, group in numeric_rows.groupby('col_id', sort=False):
+            rows = np.searchsorted(run_ids, group['run_id'].to_numpy(dtype=np.int64))
+            values = np.zeros(n, dtype=np.float64)
+            valid = np.zeros(n, dtype=bool)
+            values[rows] = group['value'].astype(float).to_numpy()
+            valid[rows] = True
+            numerics[numeric_names[col_id]] = (values, valid)
+
+        return cls(run_ids, timestamps, strings, numerics)
+
+    def __len__(self):
+        return len(self.run_ids)
+
+    def columns(self):
+        return {'string': sorted(self.strings), 'numeric': sorted(self.numerics),
+                'derived': sorted(DERIVED_KEYS)}
+
+    def key(self, name):
+        """Grup anahtarı olarak sütun -> (codes, categories)
+
+        string: sözlük kodları; derived: timestamp'ten; numeric: farklı değerler
+        """
+        if name in self.strings:
+            return self.strings[name]
+        if name not in self._derived:
+            if name in DERIVED_KEYS:
+                values = DERIVED_KEYS[name](pd.Series(self.timestamps, dtype=str))
+                codes, categories = pd.factorize(values, sort=True)
+                self._derived[name] = (codes.astype(np.int32), np.asarray(categories, dtype=object))
+            elif name in self.numerics:
+                values, valid = self.numerics[name]
+                categories, inverse = np.unique(values[valid], return_inverse=True)
+                codes = np.full(len(values), -1, dtype=np.int32)
+                codes[valid] = inverse
+                self._derived[name] = (codes, categories)
+            else:
+                raise ValueError(f"Bilinmeyen sütun: {name}")
+        return self._derived[name]
+
+    def mask(self, filters=None, date_from=None, date_to=None):
+        """Satır filtresi: {sütun: [değerler]} eşitlik (IN) + tarih aralığı -> bool dizi"""
+        selected = np.ones(len(self), dtype=bool)
+        for name, values in (filters or {}).items():
+            codes, categories = self.key(name)
+            lookup = {value: code for code, value in enumerate(categories)}
+            if np.issubdtype(np.asarray(categories).dtype, np.number):
+                wanted = [lookup.get(float(value)) for value in values]
+            else:
+                wanted = [lookup.get(str(value)) for value in values]
+            selected &= np.isin(codes, [code for code in wanted if code is not None])
+        if date_from or date_to:
+            if self._dates is None:
+                self._dates = np.asarray(self.timestamps, dtype='datetime64[D]')
+            dates = self._dates
+            if date_from:
+                selected &= dates >= np.datetime64(date_from, 'D')
+            if date_to:
+                selected &= dates <= np.datetime64(date_to, 'D')
+        return selected
+
+    def measure(self, name):
+        """Ölçü sütunu -> (values, valid)"""
+        if name not in self.numerics:
+            raise ValueError(f"Bilinmeyen numeric sütun: {name}")
+        return self.numerics[name]
+
+    def value_order(self, name):
+        """Ölçünün NULL olmayan satırları, değere göre sıralı (ilk kullanımda bir kez)"""
+        if name not in self._value_order:
+            values, valid = self.measure(name)
+            rows = np.flatnonzero(valid)
+            self._value_order[name] = rows[np.argsort(values[rows], kind='stable')]
+        return self._value_order[name]
+
+    # ------------------------------------------------------------------------
+    # GROUP BY + AGGREGATE
+    # ------------------------------------------------------------------------
+
+    def _group_ids(self, keys, selected):
+        """Seçili satırların kombine grup numarası -> (group_ids, grup sayısı, çözücü)
+
+        çözücü(g) -> g grubunun anahtar kodları (her anahtar için bir dizi)
+        """
+        codes = [self.key(name)[0][selected].astype(np.int64) for name in keys]
+        sizes = [len(self.key(name)[1]) for name in keys]
+
+        combined = codes[0]
+        for column, size in zip(codes[1:], sizes[1:]):
+            combined = combined * size + column
+
+        total = int(np.prod(sizes, dtype=np.float64)) if sizes else 0
+        if total <= DENSE_GROUP_LIMIT:
+            return combined, total, lambda groups: np.unravel_index(groups, sizes)
+
+        # Çok büyük kartezyen uzay -> sadece görülen kombinasyonlar
+        unique, group_ids = np.unique(combined, return_inverse=True)
+        return group_ids, len(unique), lambda groups: np.unravel_index(unique[groups], sizes)
+
+    def _sorted_by_group(self, measure, all_values, selected, group_ids, group_count):
+        """Seçili değerler grup, grup içinde değer sırasında (min / max / yüzdelik)
+
+        Önbellekli değer sırası + küçük tamsayı grup numarasında stable (radix) sıralama;
+        her sorguda lexsort'tan ~10x hızlı
+        """
+        row_group = np.full(len(self), -1, dtype=np.int64)
+        row_group[selected] = group_ids
+        order = self.value_order(measure)
+        order = order[selected[order]]
+        groups = row_group[order]
+        if group_count <= np.iinfo(np.int16).max:
+            groups = groups.astype(np.int16)
+        elif group_count <= np.iinfo(np.int32).max:
+            groups = groups.astype(np.int32)
+        return all_values[order[np.argsort(groups, kind='stable')]]
+
+    def group_aggregate(self, group_by, measure=None, aggs=('count',), mask=None,
+                        order_by=None, descending=True, limit=None):
+        """group_by (str veya liste) ile grupla, measure'ı aggs ile topla
+
+        mask: satır filtresi (bool dizi, len == run sayısı)
+        -> [{anahtar: değer, ..., 'count': n, 'avg': x, 'p95': y, ...}]
+        measure=None -> sadece run sayısı (count)
+        """
+        keys = [group_by] if isinstance(group_by, str) else list(group_by)
+        if not keys:
+            raise ValueError("En az bir grup sütunu gerekli")
+        parsed = [(name, *parse_aggregate(name)) for name in aggs]
+        if measure is None and any(kind != 'count' for _, kind, _ in parsed):
+            raise ValueError("count dışındaki aggregate'ler için measure gerekli")
+
+        # Satır seçimi: tüm anahtarlar ve ölçü NULL değil (SQL JOIN + IS NOT NULL)
+        selected = np.ones(len(self), dtype=bool) if mask is None else mask.copy()
+        for name in keys:
+            selected &= self.key(name)[0] >= 0
+        if measure is not None:
+            all_values, valid = self.measure(measure)
+            selected &= valid
+            values = all_values[selected]
+
+        group_ids, group_count, decode = self._group_ids(keys, selected)
+        counts = np.bincount(group_ids, minlength=group_count)
+        present = np.flatnonzero(counts)
+        counts_present = counts[present]
+
+        columns = {'count': counts_present}
+        sums = None
+        sorted_values = starts = None
+        for name, kind, q in parsed:
+            if kind in ('sum', 'avg', 'var', 'std'):
+                if sums is None:
+                    sums = np.bincount(group_ids, weights=values, minlength=group_count)[present]
+                if kind == 'sum':
+                    columns[name] = sums
+                elif kind == 'avg':
+                    columns[name] = sums / counts_present
+                else:
+                    # Popülasyon varyansı (MySQL VARIANCE / STDDEV gibi)
+                    means = np.zeros(group_count)
+                    means[present] = sums / counts_present
+                    deviations = values - means[group_ids]
+                    variance = np.bincount(group_ids, weights=deviations * deviations,
+                                           minlength=group_count)[present] / counts_present
+                    columns[name] = variance if kind == 'var' else np.sqrt(variance)
+            elif kind in ('min', 'max', 'percentile'):
+                if sorted_values is None:
+                    sorted_values = self._sorted_by_group(measure, all_values, selected,
+                                                          group_ids, group_count)
+                    starts = np.concatenate(([0], np.cumsum(counts_present)[:-1]))
+                if kind == 'min':
+                    columns[name] = sorted_values[starts]
+                elif kind == 'max':
+                    columns[name] = sorted_values[starts + counts_present - 1]
+                else:
+                    # Doğrusal interpolasyon (np.percentile varsayılanı)
+                    position = starts + (counts_present - 1) * (q / 100.0)
+                    low = np.floor(position).astype(np.int64)
+                    high = np.ceil(position).astype(np.int64)
+                    fraction = position - low
+                    columns[name] = (sorted_values[low] * (1 - fraction)
+                                     + sorted_values[high] * fraction)
+
+        # Sıralama
+        key_codes = decode(present)
+        if order_by is not None and order_by in columns:
+            order = np.argsort(-columns[order_by] if descending else columns[order_by],
+                               kind='stable')
+        elif order_by in keys:
+            # Kategoriler sıralı -> kod sırası = değer sırası
+            order = np.argsort(key_codes[keys.index(order_by)], kind='stable')
+            if descending:
+                order = order[::-1]
+        else:
+            order = np.arange(len(present))  # anahtar sırası (kategoriler sıralı)
+        if limit is not None:
+            order = order[:limit]
+
+        # Satırları oluştur
+        output = {name: self.key(name)[1][codes][order]
+                  for name, codes in zip(keys, key_codes)}
+        for name in ['count'] + [name for name, _, _ in parsed if name != 'count']:
+            output[name] = columns[name][order]
+        names = list(output)
+        return [
+            {name: value.item() if hasattr(value, 'item') else value
+             for name, value in zip(names, row)}
+            for row in zip(*(output[name] for name in names))
+        ]
+
+
+# ============================================================================
+# UYGULAMA GENELİ MOTOR (data_version değişince yeniden kurulur)
+# ============================================================================
+
+class AnalyticsEngine(VersionedCache):
+    """Uygulama genelinde ColumnarStore; data_version değişince yeniden kurulur"""
+
+    def __init__(self, check_interval=30.0, poll=None):
+        super().__init__(check_interval, poll)
+        self._store = None
+        self.build_seconds = None
+
+    def build(self, connection, data_version=None):
+        """Değer tablolarından yeni depo kur ve atomik olarak değiştir"""
+        self.reload(connection, data_version)
+        return self._store
+
+    def refresh(self, connection, data_version):
+        start = time.perf_counter()
+        store = ColumnarStore.from_connection(connection)
+        with self._lock:
+            self._store = store
+        self.build_seconds = time.perf_counter() - start
+
+    def ensure_fresh(self, connection):
+        """data_version değiştiyse yeniden kur; güncel depoyu döndür"""
+        super().ensure_fresh(connection)
+        return self._store
+
+    @property
+    def store(self):
+        return self._store
+
+
+def answer_question(store, question):
+    """questions/qN.sql'in motor karşılığı"""
+    group_by, measure, aggs, order_by, descending = QUESTIONS[question]
+    return store.group_aggregate(group_by, measure, aggs,
+                                 order_by=order_by, descending=descending)
+
+
+if __name__ == '__main__':
+    from load_data import connect_to_db
+
+    parser = argparse.ArgumentParser(description="questions/*.sql sorularını bellek içi motorla cevapla")
+    parser.add_argument('--sqlite', default=None, metavar='PATH',
+                        help="MySQL yerine gömülü SQLite dosyasından oku")
+    parser.add_argument('--question', choices=sorted(QUESTIONS, key=lambda q: int(q[1:])),
+                        help="Tek soru (varsayılan: hepsi)")
+    parser.add_argument('--repeat', type=int, default=100,
+                        help="Süre ölçümü için tekrar sayısı")
+    args = parser.parse_args()
+
+    connection = connect_to_db(sqlite_path=args.sqlite)
+    if connection:
+        engine = AnalyticsEngine()
+        store = engine.build(connection)
+        connection.close()
+        print(f"✓ {len(store)} run, {len(store.strings)} string / {len(store.numerics)} numeric "
+              f"nitelik belleğe alındı ({engine.build_seconds:.3f} sn)")
+
+        questions = [args.question] if args.question else sorted(QUESTIONS, key=lambda q: int(q[1:]))
+        for question in questions:
+            rows = answer_question(store, question)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                answer_question(store, question)
+            elapsed_us = (time.perf_counter() - start) / args.repeat * 1e6
+            print(f"\n📊 {question}: {len(rows)} grup ({elapsed_us:,.0f} µs)")
+            for row in rows[:5]:
+                print("  " + ", ".join(
+                    f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()
+                ))
@@ -3,25 +3,132 @@ CYLINDER BANDS DATABASE - FRONTEND USER INTERFACE
 Flask web application
 """
 
-from flask import Flask, render_template, request, jsonify
+import csv
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from flask import (Flask, render_template, request, jsonify, redirect, url_for,
+                   Response, stream_with_context)
 import mysql.connector
 import pandas as pd
 
+from analytics import AnalyticsEngine, parse_aggregate
+from column_registry import ColumnRegistry
+from facet_index import FacetIndex
+from instrumentation import InstrumentedBackend, Metrics, configure_slow_query_log, instrument_flask
+from rollup_cube import CUBE_AGGREGATES, cube_version, query_cube
+from run_cache import RunDetailCache
+from search_index import SearchIndex
+from stats_snapshot import STATISTICS_QUERIES, StatisticsCache, json_default
+from storage import create_backend, escape_like, like_clause, table_columns
+from string_dictionary import StringDictionary
+from versioned_cache import VersionPoll
+
 app = Flask(__name__)
 
 # ============================================================================
 # Database Connection
 # ============================================================================
 
-def get_db_connection():
-    """MySQL bağlantısı"""
-    return mysql.connector.connect(
-        host='localhost',
-            port=3306,
-            user='root',
-            password='***CHANGE_THIS***',
-            database='cylinder_bands_db'
-    )
+DB_CONFIG = {
+    'host': 'localhost',
+    'port': 3306,
+    'user': 'root',
+    'password': '***CHANGE_THIS***',
+    'database': os.environ.get('CYLINDER_MYSQL_DATABASE', 'cylinder_bands_db')
+}
+
+# Depolama: 'mysql' (sunucu) veya 'sqlite' (gömülü dosya, sunucu gerekmez)
+STORAGE_BACKEND = os.environ.get('CYLINDER_DB_BACKEND', 'mysql')
+SQLITE_PATH = os.environ.get('CYLINDER_SQLITE_PATH', 'data/cylinder_bands.db')
+
+# Connection pool ayarları
+POOL_SIZE = 10                   # en fazla açık bağlantı
+POOL_TIMEOUT = 5.0               # boş bağlantı için bekleme (saniye)
+POOL_HEALTH_CHECK_INTERVAL = 30  # bu süreden uzun boşta kalan bağlantı ping'lenir
+
+db_backend = create_backend(
+    STORAGE_BACKEND,
+    **({'path': SQLITE_PATH} if STORAGE_BACKEND == 'sqlite' else {'db_config': DB_CONFIG}),
+    size=POOL_SIZE,
+    timeout=POOL_TIMEOUT,
+    health_check_interval=POOL_HEALTH_CHECK_INTERVAL
+)
+
+
+# Instrumentation: route / sorgu / procedure histogramları (/metrics) + slow-query log
+INSTRUMENTATION_ENABLED = os.environ.get('CYLINDER_INSTRUMENTATION', '1') != '0'
+SLOW_QUERY_MS = float(os.environ.get('CYLINDER_SLOW_QUERY_MS', 250))  # execute + fetch
+SLOW_QUERY_LOG = os.environ.get('CYLINDER_SLOW_QUERY_LOG')            # yoksa stderr
+instrumentation = Metrics(slow_query_seconds=SLOW_QUERY_MS / 1000)
+configure_slow_query_log(SLOW_QUERY_LOG)
+if INSTRUMENTATION_ENABLED:
+    db_backend = InstrumentedBackend(db_backend, instrumentation)
+    instrument_flask(app, instrumentation)
+
+
+# /statistics snapshot'ının process içi kopyası
+STATS_CACHE_TTL = 60  # saniye; dolunca data_version tek sorguyla kontrol edilir
+STATS_QUERY_TIMEOUT = 5.0  # snapshot yenilenirken sorgu başına süre sınırı (saniye)
+# Snapshot sorguları paralel, her biri havuzdan kendi bağlantısıyla (POOL_SIZE'ı aşmaz)
+stats_executor = ThreadPoolExecutor(max_workers=min(len(STATISTICS_QUERIES), POOL_SIZE - 1),
+                                    thread_name_prefix='stats')
+stats_cache = StatisticsCache(ttl=STATS_CACHE_TTL, backend=db_backend, executor=stats_executor,
+                              query_timeout=STATS_QUERY_TIMEOUT)
+
+
+# load_state sürümleri: tüm önbellekler aynı okumayı paylaşır (aralıkta tek sorgu,
+# bir yüklemeden sonra hepsi aynı data_version'a geçer). Bu aralıkta If-None-Match
+# veritabanına gitmeden cevaplanır.
+VERSION_CHECK_INTERVAL = 30  # saniye
+version_poll = VersionPoll(check_interval=VERSION_CHECK_INTERVAL)
+
+
+# column_name -> id önbelleği (schema_version değişince yenilenir)
+column_registry = ColumnRegistry(poll=version_poll)
+
+
+# string_dictionary kod -> değer haritası (data_version değişince yeniden okunur)
+string_dictionary = StringDictionary(poll=version_poll)
+
+
+# Bellek içi trigram arama index'i (data_version değişince yeniden kurulur)
+search_index = SearchIndex(poll=version_poll)
+QUICK_SEARCH_LIMIT = 50
+
+
+# /runs filtreleri + facet sayıları için bitmap index'i (data_version değişince incremental güncellenir)
+FACET_INDEX_ENABLED = os.environ.get('CYLINDER_FACET_INDEX', '1') != '0'  # 0 -> SQL EXISTS filtreleri
+facet_index = FacetIndex(poll=version_poll)
+RUNS_FACETS = ('customer', 'band_type')
+RUNS_FACET_VALUES = 50  # customer önerilerinde en çok run'lı N değer
+
+
+# Render edilmiş /run/<run_id> sayfaları (LRU, data_version değişince boşaltılır)
+RUN_CACHE_MAX_ENTRIES = 2000
+RUN_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RUN_PREFETCH_LIMIT = 500       # /api/runs/prefetch başına en fazla run
+run_cache = RunDetailCache(max_entries=RUN_CACHE_MAX_ENTRIES, max_bytes=RUN_CACHE_MAX_BYTES,
+                           poll=version_poll)
+
+
+# Bellek içi sütunsal analitik motoru (data_version değişince yeniden kurulur)
+analytics_engine = AnalyticsEngine(poll=version_poll)
+
+
+@contextmanager
+def get_db_cursor(dictionary=True):
+    """Havuzdan bağlantı al, cursor ver; çıkışta cursor kapanır, bağlantı havuza döner"""
+    with db_backend.connection() as connection:
+        column_registry.ensure_fresh(connection)
+        cursor = connection.cursor(dictionary=dictionary)
+        try:
+            yield cursor
+        finally:
+            cursor.close()
 
 # ============================================================================
 # HOME PAGE
@@ -36,56 +143,202 @@ def index():
 # QUICK SEARCH
 # ============================================================================
 
+def get_search_index():
+    """Güncel trigram index'i (gerekirse veritabanından kurar)"""
+    with db_backend.connection() as connection:
+        column_registry.ensure_fresh(connection)
+        return search_index.ensure_fresh(connection)
+
+
 @app.route('/quick-search')
 def quick_search():
-    """Hızlı arama - Stored Procedure ile"""
+    """Hızlı arama - run_id veya trigram index ile customer (substring + fuzzy)"""
     query = request.args.get('q', '').strip()
     
     if not query:
         return redirect('/')
     
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-    
     try:
-        # STORED PROCEDURE KULLAN!
-        cursor.callproc('quick_search', [query, ''])
+        index = get_search_index()
+        customer_col = column_registry.string_id('customer')
         
-        # İlk result set - runs
-        results = []
-        for result in cursor.stored_results():
-            results = result.fetchall()
-        
-        # Search type OUT parameter al
-        cursor.execute("SELECT @_quick_search_1 AS search_type")
-        search_type_row = cursor.fetchone()
-        search_type = search_type_row['search_type'] if search_type_row else 'Unknown'
+        if query.isascii() and query.isdigit():
+            # Run ID araması (prosedürdeki REGEXP '^[0-9]+$' gibi; '²', '٣' customer aramasına düşer)
+            search_type = 'Run ID'
+            run_id = int(query)
+            timestamp = index.timestamp(run_id)
+            results = [] if timestamp is None else [{
+                'run_id': run_id,
+                'timestamp': timestamp,
+                'customer': index.value(run_id, customer_col)
+            }]
+        else:
+            # Customer araması - index'ten sıralı top-k
+            matches, used_fuzzy = index.search_runs(query, customer_col, limit=QUICK_SEARCH_LIMIT)
+            search_type = 'Customer Name (fuzzy)' if used_fuzzy else 'Customer Name'
+            results = [
+                {'run_id': run_id, 'timestamp': index.timestamp(run_id), 'customer': value}
+                for run_id, value in matches
+            ]
         
         # Eğer tek run ise direkt detay sayfasına git
         if search_type == 'Run ID' and len(results) == 1:
-            connection.close()
             return redirect(f'/run/{results[0]["run_id"]}')
         
-        connection.close()
-        
         return render_template('quick_search_results.html', 
                              query=query, 
                              results=results,
                              search_type=search_type)
     except Exception as e:
-        connection.close()
         return f"Error: {str(e)}", 500
 
+
+@app.route('/api/quick-search')
+def api_quick_search():
+    """Typeahead için sıralı top-k eşleşen değerler (JSON)"""
+    query = request.args.get('q', '').strip()
+    column_name = request.args.get('column', 'customer')
+    k = max(1, min(request.args.get('k', 10, type=int), 100))
+    
+    try:
+        index = get_search_index()
+        col_id = column_registry.string_id(column_name)
+        if col_id is None:
+            return jsonify({'error': f'Unknown column: {column_name}'}), 400
+        
+        matches = index.search(query, col_id, k=k)
+        return jsonify({
+            'query': query,
+            'column': column_name,
+            'matches': [
+                {'value': m['value'], 'match': m['match'], 'score': m['score'],
+                 'run_count': len(m['run_ids'])}
+                for m in matches
+            ]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ============================================================================
+# RUNS QUERY BUILDER
+# ============================================================================
+
+# Sıralanabilir sütunlar (whitelist) -> SQL ifadesi
+RUNS_SORT_COLUMNS = {
+    'run_id': 'r.run_id',
+    'timestamp': 'r.timestamp',
+}
+RUNS_SORT_ORDERS = ('ASC', 'DESC')
+RUNS_PAGE_SIZE = 50
+RUNS_MAX_PAGE_SIZE = 500
+
+
+def build_runs_query(date_from=None, date_to=None, customer=None, band_type=None,
+                     sort_by='run_id', sort_order='DESC',
+                     after_run_id=None, limit=RUNS_PAGE_SIZE):
+    """get_runs_list prosedürünün parametreli karşılığı -> (sql, params)
+
+    - Filtreler (stringcol_id, string_code) üzerinde EXISTS semijoin; değer -> kod
+      çözümü küçük string_dictionary tablosunda
+    - customer önek eşleşmesi (LIKE 'abc%'), baştaki joker yok
+    - Keyset pagination: after_run_id'den sonraki en fazla `limit` run
+      (sonraki sayfa var mı diye limit + 1 satır istenir)
+    """
+    sort_column = RUNS_SORT_COLUMNS.get(sort_by, 'r.run_id')
+    sort_order = (sort_order or '').upper()
+    if sort_order not in RUNS_SORT_ORDERS:
+        sort_order = 'DESC'
+    limit = max(1, min(int(limit), RUNS_MAX_PAGE_SIZE))
+    
+    conditions = []
+    params = []
+    
+    if date_from:
+        conditions.append("r.timestamp >= %s")
+        params.append(date_from)
+    
+    if date_to:
+        conditions.append("r.timestamp <= %s")
+        params.append(date_to)
+    
+    if customer:
+        # Sözlük birebir (utf8mb4_bin / BINARY); önek araması eskisi gibi büyük/küçük harf duyarsız
+        conditions.append(f"""EXISTS (
+            SELECT 1 FROM runid_stringvalues sv
+            JOIN string_dictionary d ON d.string_code = sv.string_code
+            WHERE sv.run_id = r.run_id AND sv.stringcol_id = %s
+            AND LOWER(d.string_value) {like_clause(db_backend.dialect)})""")
+        params += [column_registry.string_id('customer'), escape_like(customer.lower()) + '%']
+    
+    if band_type:
+        conditions.append("""EXISTS (
+            SELECT 1 FROM runid_stringvalues sv
+            JOIN string_dictionary d ON d.string_code = sv.string_code
+            WHERE sv.run_id = r.run_id AND sv.stringcol_id = %s
+            AND d.string_value = %s)""")
+        params += [column_registry.string_id('band_type'), band_type]
+    
+    if after_run_id is not None:
+        op = '<' if sort_order == 'DESC' else '>'
+        if sort_column == 'r.run_id':
+            conditions.append(f"r.run_id {op} %s")
+            params.append(after_run_id)
+        else:
+            # (timestamp, run_id) keyset - imlecin timestamp'i run_id'den bulunur
+            conditions.append(f"""(r.timestamp {op} (SELECT timestamp FROM runs WHERE run_id = %s)
+            OR (r.timestamp = (SELECT timestamp FROM runs WHERE run_id = %s) AND r.run_id {op} %s))""")
+            params += [after_run_id, after_run_id, after_run_id]
+    
+    sql = "SELECT r.run_id, r.timestamp FROM runs r"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {sort_column} {sort_order}"
+    if sort_column != 'r.run_id':
+        sql += f", r.run_id {sort_order}"
+    sql += " LIMIT %s"
+    params.append(limit + 1)
+    
+    return sql, params
+
 # ============================================================================
 # VIEW ALL RUNS
 # ============================================================================
 
+def facet_filters(index, date_from=None, date_to=None, customer=None, band_type=None):
+    """/runs filtreleri -> {ad: RunBitmap} (build_runs_query koşullarının bitmap karşılığı)"""
+    filters = {}
+    if date_from or date_to:
+        filters['date'] = index.date_range(date_from, date_to)
+    if customer:
+        filters['customer'] = index.prefix(column_registry.string_id('customer'), customer)
+    if band_type:
+        filters['band_type'] = index.equals(column_registry.string_id('band_type'), [band_type])
+    return filters
+
+
+def facet_counts(index, filters, names):
+    """Her facet için değer -> run sayısı; facet'in kendi filtresi hariç diğerlerinin kesişiminde"""
+    counts = {}
+    for name in names:
+        others = [bitmap for key, bitmap in filters.items() if key != name]
+        within = index.intersect(others) if others else None
+        counts[name] = index.counts(column_registry.string_id(name), within)
+    return counts
+
+
+def fetch_runs_by_id(cursor, run_ids):
+    """run_id listesi -> runs satırları, aynı sırada (silinmiş run'lar atlanır)"""
+    if not run_ids:
+        return []
+    cursor.execute(f"SELECT run_id, timestamp FROM runs WHERE run_id IN ({', '.join(['%s'] * len(run_ids))})",
+                   tuple(run_ids))
+    rows = {row['run_id']: row for row in cursor.fetchall()}
+    return [rows[run_id] for run_id in run_ids if run_id in rows]
+
+
 @app.route('/runs')
 def view_runs():
-    """Tüm run'ları listele - Stored Procedure ile"""
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-    
+    """Run'ları listele - bitmap index (veya parametreli sorgu) + keyset pagination + facet sayıları"""
     # Filter parametreleri
     date_from = request.args.get('date_from') or None
     date_to = request.args.get('date_to') or None
@@ -93,137 +346,304 @@ def view_runs():
     band_type = request.args.get('band_type') or None
     sort_by = request.args.get('sort_by', 'run_id')
     sort_order = request.args.get('sort_order', 'DESC')
+    after_run_id = request.args.get('after_run_id', type=int)
+    limit = request.args.get('limit', RUNS_PAGE_SIZE, type=int)
+    
+    if sort_by not in RUNS_SORT_COLUMNS:
+        sort_by = 'run_id'
+    if sort_order not in RUNS_SORT_ORDERS:
+        sort_order = 'DESC'
+    limit = max(1, min(limit, RUNS_MAX_PAGE_SIZE))
     
     try:
-        # STORED PROCEDURE KULLAN!
-        cursor.callproc('get_runs_list', [date_from, date_to, customer, band_type, sort_by, sort_order])
+        facets, total = {}, None
+        with db_backend.connection() as connection:
+            column_registry.ensure_fresh(connection)
+            cursor = connection.cursor(dictionary=True)
+            if FACET_INDEX_ENABLED:
+                # Filtreler bitmap kesişimi; veritabanından sadece sayfadaki run'lar okunur
+                index = facet_index.ensure_fresh(connection)
+                filters = facet_filters(index, date_from, date_to, customer, band_type)
+                result = index.intersect(filters.values())
+                total = len(result)
+                facets = facet_counts(index, filters, RUNS_FACETS)
+                run_ids = index.page(result, sort_by, sort_order == 'DESC', after_run_id, limit)
+                runs = fetch_runs_by_id(cursor, run_ids)
+            else:
+                sql, params = build_runs_query(date_from, date_to, customer, band_type,
+                                               sort_by, sort_order, after_run_id, limit)
+                cursor.execute(sql, params)
+                runs = cursor.fetchall()
+
+                # Customer önerileri (facet sayıları yok): production_runs.idx_pr_customer
+                cursor.execute("""
+                    SELECT customer, COUNT(*) AS n
+                    FROM production_runs
+                    WHERE customer IS NOT NULL
+                    GROUP BY customer
+                    ORDER BY n DESC, customer
+                    LIMIT %s
+                """, (RUNS_FACET_VALUES,))
+                facets['customer'] = [(row['customer'], row['n']) for row in cursor.fetchall()]
+            cursor.close()
         
-        runs = []
-        for result in cursor.stored_results():
-            runs = result.fetchall()
+        filters = {
+            'date_from': date_from or '',
+            'date_to': date_to or '',
+            'customer': customer or '',
+            'band_type': band_type or '',
+            'sort_by': sort_by,
+            'sort_order': sort_order
+        }
         
-        # Get all customers for dropdown
-        cursor.execute("""
-            SELECT DISTINCT sv.string_value as customer
-            FROM runid_stringvalues sv
-            JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-            WHERE sc.column_name = 'customer'
-            ORDER BY sv.string_value
-        """)
-        customers = [row['customer'] for row in cursor.fetchall()]
+        # Sonraki sayfa imleci
+        next_url = None
+        if len(runs) > limit:
+            runs = runs[:limit]
+            next_url = url_for('view_runs', **filters, limit=limit,
+                               after_run_id=runs[-1]['run_id'])
+        first_url = url_for('view_runs', **filters, limit=limit) if after_run_id else None
         
-        connection.close()
+        # Customer önerileri: en çok run'lı değerler, alfabetik
+        customers = sorted(facets.get('customer', []), key=lambda item: -item[1])[:RUNS_FACET_VALUES]
         
         return render_template('runs.html', 
                              runs=runs,
-                             customers=customers,
-                             filters={
-                                 'date_from': date_from or '',
-                                 'date_to': date_to or '',
-                                 'customer': customer or '',
-                                 'band_type': band_type or '',
-                                 'sort_by': sort_by,
-                                 'sort_order': sort_order
-                             })
+                             customers=sorted(customers),
+                             band_types=dict(facets['band_type']) if 'band_type' in facets else None,
+                             total=total,
+                             filters=filters,
+                             next_url=next_url,
+                             first_url=first_url)
+    except ValueError as e:
+        return f"Error: {str(e)}", 400
     except Exception as e:
-        connection.close()
         return f"Error: {str(e)}", 500
 
 # ============================================================================
 # RUN DETAIL
 # ============================================================================
 
+def render_run_detail(run_info, string_rows, numeric_rows):
+    """get_run_details sonucunu run_detail.html'e render et"""
+    # id -> column_name, kod -> değer (metadata / sözlük tablolarına join yok)
+    string_data = [
+        {'column_name': column_registry.string_name(row['stringcol_id']),
+         'string_value': string_dictionary.value(row['string_code'])}
+        for row in string_rows
+    ]
+    numeric_data = [
+        {'column_name': column_registry.numeric_name(row['numericcol_id']),
+         'numeric_value': row['numeric_value']}
+        for row in numeric_rows
+    ]
+    return render_template('run_detail.html',
+                         run=run_info,
+                         string_attributes=string_data,
+                         numeric_attributes=numeric_data)
+
+
+def run_detail_response(body, etag):
+    response = app.response_class(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # tarayıcı her seferinde If-None-Match ile sorar
+    return response
+
+
+def cached_run_detail(run_id):
+    """ETag eşleşirse 304, sayfa önbellekteyse 200; yoksa None (veritabanına gidilmez)"""
+    etag = run_cache.etag(run_id)
+    if etag is None:
+        return None
+    if request.if_none_match.contains(etag):
+        return run_detail_response(b'', etag), 304
+    cached = run_cache.get(run_id)
+    return run_detail_response(*cached) if cached is not None else None
+
+
 @app.route('/run/<int:run_id>')
 def run_detail(run_id):
-    """Run detayı - Stored Procedure ile"""
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-    
+    """Run detayı - get_run_details (MySQL: Stored Procedure, SQLite: Python karşılığı)
+
+    Önbellekteyse veritabanına gidilmez; ETag eşleşirse 304.
+    """
+    response = cached_run_detail(run_id)
+    if response is not None:
+        return response
+    checked = run_cache.etag(run_id) is not None
+
     try:
-        # STORED PROCEDURE KULLAN!
-        cursor.callproc('get_run_details', [run_id])
-        
-        # 3 result set gelir
-        results_list = []
-        for result in cursor.stored_results():
-            results_list.append(result.fetchall())
-        
-        if len(results_list) < 3:
-            connection.close()
-            return "Run not found", 404
-        
-        run_info = results_list[0][0] if results_list[0] else None
-        string_data = results_list[1] if len(results_list) > 1 else []
-        numeric_data = results_list[2] if len(results_list) > 2 else []
-        
+        with db_backend.connection() as connection:
+            data_version = run_cache.ensure_fresh(connection)
+            if not checked:
+                response = cached_run_detail(run_id)
+                if response is not None:
+                    return response
+
+            column_registry.ensure_fresh(connection)
+            cursor = connection.cursor(dictionary=True)
+            try:
+                run_info, string_rows, numeric_rows = db_backend.get_run_details(cursor, run_id)
+            finally:
+                cursor.close()
+            string_dictionary.ensure_codes(connection, [row['string_code'] for row in string_rows])
+
         if not run_info:
-            connection.close()
             return "Run not found", 404
-        
-        connection.close()
-        
-        return render_template('run_detail.html',
-                             run=run_info,
-                             string_attributes=string_data,
-                             numeric_attributes=numeric_data)
+
+        body = render_run_detail(run_info, string_rows, numeric_rows)
+        entry = run_cache.put(run_id, body, data_version)
+        return run_detail_response(*(entry or (body, f"{data_version}-{run_id}")))
     except Exception as e:
-        connection.close()
         return f"Error: {str(e)}", 500
 
+
+@app.route('/api/runs/prefetch', methods=['POST'])
+def api_prefetch_runs():
+    """Run detay önbelleğini doldur: {"run_ids": [...]} -> tek sorgu (WHERE run_id IN ...)"""
+    payload = request.get_json(silent=True) or {}
+    run_ids = payload.get('run_ids', request.form.get('run_ids', request.args.get('run_ids', '')))
+    if isinstance(run_ids, str):
+        run_ids = [part for part in run_ids.split(',') if part.strip()]
+    try:
+        run_ids = list(dict.fromkeys(int(run_id) for run_id in run_ids))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'run_ids tam sayı listesi olmalı'}), 400
+    if len(run_ids) > RUN_PREFETCH_LIMIT:
+        return jsonify({'error': f'en fazla {RUN_PREFETCH_LIMIT} run_id'}), 400
+
+    try:
+        with db_backend.connection() as connection:
+            data_version = run_cache.ensure_fresh(connection)
+            missing = [run_id for run_id in run_ids if run_id not in run_cache]
+            details = {}
+            if missing:
+                column_registry.ensure_fresh(connection)
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    details = db_backend.get_runs_details(cursor, missing)
+                finally:
+                    cursor.close()
+                string_dictionary.ensure_codes(connection, [
+                    row['string_code'] for _, string_rows, _ in details.values() for row in string_rows])
+
+        for run_id, (run_info, string_rows, numeric_rows) in details.items():
+            run_cache.put(run_id, render_run_detail(run_info, string_rows, numeric_rows), data_version)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    return jsonify({
+        'requested': len(run_ids),
+        'already_cached': len(run_ids) - len(missing),
+        'loaded': len(details),
+        'not_found': sorted(set(missing) - set(details)),
+        'cache': run_cache.metrics(),
+    })
+
 # ============================================================================
 # SEARCH
 # ============================================================================
 
+SEARCH_PAGE_SIZE = 100
+
+
+def numeric_search(column_name, min_value=None, max_value=None,
+                   after_value=None, after_run_id=None, limit=SEARCH_PAGE_SIZE):
+    """Numeric aralık sayfası -> (satırlar, sonraki sayfa imleci, aralıktaki toplam, histogram)
+
+    Bitmap index açıksa sıralı dizide bisect (toplam ve histogram hazır); değilse
+    search_numeric_attribute (idx_numericcol_value aralık taraması, toplam/histogram None)
+    """
+    total, histogram = None, None
+    with db_backend.connection() as connection:
+        column_registry.ensure_fresh(connection)
+        numericcol_id = column_registry.numeric_id(column_name)
+        if numericcol_id is None:
+            raise ValueError(f"Unknown column: {column_name}")
+        cursor = connection.cursor(dictionary=True)
+        if FACET_INDEX_ENABLED:
+            index = facet_index.ensure_fresh(connection)
+            page, total = index.numeric_page(numericcol_id, min_value, max_value,
+                                             after_value, after_run_id, limit + 1)
+            values = dict(page)
+            rows = [dict(row, value=values[row['run_id']])
+                    for row in fetch_runs_by_id(cursor, [run_id for run_id, _ in page])]
+            histogram = index.histogram(numericcol_id)
+        else:
+            rows = db_backend.search_numeric_attribute(cursor, numericcol_id, min_value, max_value,
+                                                       after_value, after_run_id, limit + 1)
+        cursor.close()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if rows:
+            next_cursor = {'after_value': float(rows[-1]['value']), 'after_run_id': rows[-1]['run_id']}
+    return rows, next_cursor, total, histogram
+
+
+def optional_float(value):
+    return float(value) if value not in (None, '') else None
+
+
 @app.route('/search', methods=['GET', 'POST'])
 def search():
-    """Arama sayfası - Stored Procedure ile"""
+    """Arama sayfası - string: trigram index, numeric: sıralı aralık index'i / search_numeric_attribute"""
     if request.method == 'POST':
         search_type = request.form.get('search_type')
         column_name = request.form.get('column_name')
         
-        connection = get_db_connection()
-        cursor = connection.cursor(dictionary=True)
-        
         try:
             if search_type == 'string':
-                search_value = request.form.get('search_value')
-                # STORED PROCEDURE KULLAN!
-                cursor.callproc('search_string_attribute', [column_name, search_value])
-            else:  # numeric
-                min_value = request.form.get('min_value')
-                max_value = request.form.get('max_value')
-                
-                min_val = float(min_value) if min_value else None
-                max_val = float(max_value) if max_value else None
-                
-                # STORED PROCEDURE KULLAN!
-                cursor.callproc('search_numeric_attribute', [column_name, min_val, max_val])
+                index = get_search_index()
+                stringcol_id = column_registry.string_id(column_name)
+                if stringcol_id is None:
+                    return f"Unknown column: {column_name}", 400
+                search_value = request.form.get('search_value') or ''
+                # Trigram index (search_string_attribute'un LIKE '%q%' taraması yerine)
+                matches, _ = index.search_runs(search_value, stringcol_id, limit=100)
+                results = sorted(
+                    ({'run_id': run_id, 'timestamp': index.timestamp(run_id), 'value': value}
+                     for run_id, value in matches),
+                    key=lambda row: row['run_id']
+                )
+                return render_template('search_results.html', 
+                                     results=results, 
+                                     column_name=column_name,
+                                     search_type=search_type)
             
-            results = []
-            for result in cursor.stored_results():
-                results = result.fetchall()
+            # numeric - (value, run_id) sıralı, keyset sayfalı
+            min_value = optional_float(request.form.get('min_value'))
+            max_value = optional_float(request.form.get('max_value'))
+            after_run_id = request.form.get('after_run_id', type=int)
+            after_value = optional_float(request.form.get('after_value')) if after_run_id is not None else None
             
-            connection.close()
+            results, next_cursor, total, histogram = numeric_search(
+                column_name, min_value, max_value, after_value, after_run_id)
             
             return render_template('search_results.html', 
                                  results=results, 
                                  column_name=column_name,
-                                 search_type=search_type)
+                                 search_type=search_type,
+                                 min_value=min_value,
+                                 max_value=max_value,
+                                 total=total,
+                                 histogram=histogram,
+                                 next_cursor=next_cursor,
+                                 first_page=after_run_id is None)
+        except ValueError as e:
+            return f"Error: {str(e)}", 400
         except Exception as e:
-            connection.close()
             return f"Error: {str(e)}", 500
     
-    # GET request - arama formunu göster
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-    
-    cursor.execute("SELECT column_name FROM stringcols ORDER BY column_name")
-    string_columns = [row['column_name'] for row in cursor.fetchall()]
-    
-    cursor.execute("SELECT column_name FROM numericcols ORDER BY column_name")
-    numeric_columns = [row['column_name'] for row in cursor.fetchall()]
-    
-    connection.close()
+    # GET request - arama formunu göster (sütun listesi metadata önbelleğinden)
+    try:
+        with db_backend.connection() as connection:
+            column_registry.ensure_fresh(connection)
+        string_columns = column_registry.string_columns()
+        numeric_columns = column_registry.numeric_columns()
+    except Exception as e:
+        return f"Error: {str(e)}", 500
     
     return render_template('search.html', 
                          string_columns=string_columns,
@@ -231,97 +651,13 @@ def search():
 
 @app.route('/statistics')
 def statistics():
-    """İstatistikler sayfası - Direkt SQL ile (fallback)"""
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-    
-    # Toplam run sayısı
-    cursor.execute("SELECT COUNT(*) as total_runs FROM runs")
-    total_runs = cursor.fetchone()['total_runs']
-    
-    # Band type dağılımı
-    cursor.execute("""
-        SELECT sv.string_value, COUNT(*) as count
-        FROM runid_stringvalues sv
-        JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-        WHERE sc.column_name = 'band_type'
-        GROUP BY sv.string_value
-    """)
-    band_distribution = cursor.fetchall()
-    
-    # Band yüzdesi hesapla
-    band_count = sum([item['count'] for item in band_distribution if item['string_value'] == 'band'])
-    band_percentage = round((band_count / total_runs) * 100, 1) if total_runs > 0 else 0
-    
-    # En çok kullanılan silindir
-    cursor.execute("""
-        SELECT sv.string_value as cylinder, COUNT(*) as count
-        FROM runid_stringvalues sv
-        JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-        WHERE sc.column_name = 'cylinder_number'
-        GROUP BY sv.string_value
-        ORDER BY count DESC
-        LIMIT 1
-    """)
-    top_cylinder = cursor.fetchone()
-    
-    # Top 10 Customers
-    cursor.execute("""
-        SELECT sv.string_value as customer, COUNT(*) as count
-        FROM runid_stringvalues sv
-        JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-        WHERE sc.column_name = 'customer'
-        GROUP BY sv.string_value
-        ORDER BY count DESC
-        LIMIT 10
-    """)
-    top_customers = cursor.fetchall()
-    
-    # Ink Type dağılımı
-    cursor.execute("""
-        SELECT sv.string_value as ink_type, COUNT(*) as count
-        FROM runid_stringvalues sv
-        JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-        WHERE sc.column_name = 'ink_type'
-        GROUP BY sv.string_value
-        ORDER BY count DESC
-    """)
-    ink_distribution = cursor.fetchall()
-    
-    # Press kullanımı
-    cursor.execute("""
-        SELECT sv.string_value as press, COUNT(*) as count
-        FROM runid_stringvalues sv
-        JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-        WHERE sc.column_name = 'press'
-        GROUP BY sv.string_value
-        ORDER BY count DESC
-    """)
-    press_distribution = cursor.fetchall()
-    
-    # Ortalama numeric değerler
-    cursor.execute("""
-        SELECT 
-            AVG(CASE WHEN nc.column_name = 'proof_cut' THEN nv.numeric_value END) as avg_proof_cut,
-            AVG(CASE WHEN nc.column_name = 'viscosity' THEN nv.numeric_value END) as avg_viscosity,
-            AVG(CASE WHEN nc.column_name = 'wax' THEN nv.numeric_value END) as avg_wax,
-            AVG(CASE WHEN nc.column_name = 'hardener' THEN nv.numeric_value END) as avg_hardener
-        FROM runid_numericvalues nv
-        JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
-    """)
-    numeric_stats = cursor.fetchone()
-    
-    connection.close()
-    
-    return render_template('statistics.html',
-                         total_runs=total_runs,
-                         band_percentage=band_percentage,
-                         top_cylinder=top_cylinder,
-                         band_distribution=band_distribution,
-                         top_customers=top_customers,
-                         ink_distribution=ink_distribution,
-                         press_distribution=press_distribution,
-                         numeric_stats=numeric_stats)
+    """İstatistikler sayfası - data_version'a bağlı snapshot'tan (tek fetch)"""
+    try:
+        stats = stats_cache.get()
+    except Exception as e:
+        return f"Error: {str(e)}", 500
+    
+    return render_template('statistics.html', **stats)
 
 # ============================================================================
 # PROCEDURES & VIEWS DEMONSTRATION
@@ -330,61 +666,421 @@ def statistics():
 @app.route('/procedures-views')
 def procedures_views():
     """Stored Procedures ve Views demo sayfası"""
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-    
     results = {}
     
-    # 1. View kullanımı - v_string_data
-    try:
-        cursor.execute("SELECT * FROM v_string_data LIMIT 10")
-        results['view_string'] = cursor.fetchall()
-    except:
-        results['view_string'] = []
+    with get_db_cursor() as cursor:
+        # 1. View kullanımı - v_string_data
+        try:
+            cursor.execute("SELECT * FROM v_string_data LIMIT 10")
+            results['view_string'] = cursor.fetchall()
+        except:
+            results['view_string'] = []
+        
+        # 2. View kullanımı - v_numeric_data  
+        try:
+            cursor.execute("SELECT * FROM v_numeric_data LIMIT 10")
+            results['view_numeric'] = cursor.fetchall()
+        except:
+            results['view_numeric'] = []
+        
+        # 3. Stored Procedure - OUT parameter
+        try:
+            cursor.execute("CALL count_band_types(@band, @noband)")
+            cursor.execute("SELECT @band AS band_count, @noband AS noband_count")
+            results['band_counts'] = cursor.fetchone()
+        except Exception as e:
+            results['band_counts'] = {'error': str(e)}
+        
+        # 4. Stored Procedure - INOUT parameter
+        try:
+            cursor.execute("SET @customer = 'kmart'")
+            cursor.execute("CALL get_customer_run_count(@customer)")
+            cursor.execute("SELECT @customer AS result")
+            results['customer_count'] = cursor.fetchone()
+        except Exception as e:
+            results['customer_count'] = {'error': str(e)}
+        
+        # 5. Stored Procedure - Mixed parameters
+        try:
+            cursor.execute("CALL search_runs_by_date('1991-01-01', '1991-12-31', @total, @band_pct)")
+            cursor.execute("SELECT @total AS total_runs, @band_pct AS band_percentage")
+            results['date_search'] = cursor.fetchone()
+        except Exception as e:
+            results['date_search'] = {'error': str(e)}
+        
+        # 6. Stored Procedure - Customer report
+        try:
+            cursor.execute("CALL get_customer_report('kmart', @total, @band, @rate)")
+            cursor.execute("SELECT @total AS total_runs, @band AS band_runs, @rate AS band_rate")
+            results['customer_report'] = cursor.fetchone()
+        except Exception as e:
+            results['customer_report'] = {'error': str(e)}
     
-    # 2. View kullanımı - v_numeric_data  
-    try:
-        cursor.execute("SELECT * FROM v_numeric_data LIMIT 10")
-        results['view_numeric'] = cursor.fetchall()
-    except:
-        results['view_numeric'] = []
+    return render_template('procedures_views.html', results=results)
+
+# ============================================================================
+# JSON API - STREAMING EXPORT
+# ============================================================================
+
+EXPORT_FETCH_SIZE = 1000      # fetchmany başına satır (web process'te sabit bellek)
+EXPORT_MAX_FETCH_SIZE = 10000
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def get_export_columns():
+    """production_runs sütunları (projection whitelist'i)"""
+    with get_db_cursor(dictionary=False) as cursor:
+        return table_columns(cursor, 'production_runs')
+
+
+def build_export_query(columns, date_from=None, date_to=None, customer=None,
+                       band_type=None, after_run_id=None, limit=None):
+    """production_runs üzerinde get_runs_list filtreleri + projection -> (sql, params)"""
+    conditions = []
+    params = []
+    
+    if date_from:
+        conditions.append("timestamp >= %s")
+        params.append(date_from)
+    if date_to:
+        conditions.append("timestamp <= %s")
+        params.append(date_to)
+    if customer:
+        conditions.append(f"customer {like_clause(db_backend.dialect)}")  # idx_pr_customer (önek)
+        params.append(escape_like(customer) + '%')
+    if band_type:
+        conditions.append("band_type = %s")
+        params.append(band_type)
+    if after_run_id is not None:
+        conditions.append("run_id > %s")
+        params.append(after_run_id)
+    
+    sql = f"SELECT {', '.join(f'`{c}`' for c in columns)} FROM production_runs"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY run_id"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, params
+
+
+def stream_rows(sql, params, fmt, fetch_size):
+    """Unbuffered (server-side) cursor'dan fetchmany ile satır satır NDJSON / CSV üret"""
+    with db_backend.connection() as connection:
+        cursor = connection.cursor(buffered=False)
+        try:
+            cursor.execute(sql, params)
+            columns = cursor.column_names
+            
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if fmt == 'csv':
+                writer.writerow(columns)
+            
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    if fmt == 'csv':
+                        writer.writerow(row)
+                    else:
+                        buffer.write(json.dumps(dict(zip(columns, row)), default=json_default))
+                        buffer.write('\n')
+                # Her fetchmany partisi bir chunk olarak gönderilir
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            
+            if fmt == 'csv' and buffer.tell():
+                yield buffer.getvalue()
+        finally:
+            try:
+                cursor.close()
+            except mysql.connector.Error:
+                pass  # Yarıda kalan akış -> bağlantı havuzda atılır
+
+
+def export_response(default_format):
+    """/api/runs ve /api/export ortak gövdesi"""
+    fmt = request.args.get('format', default_format)
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'Unknown format: {fmt}'}), 400
+    
+    fetch_size = max(1, min(request.args.get('fetch_size', EXPORT_FETCH_SIZE, type=int),
+                            EXPORT_MAX_FETCH_SIZE))
+    limit = request.args.get('limit', type=int)
     
-    # 3. Stored Procedure - OUT parameter
     try:
-        cursor.execute("CALL count_band_types(@band, @noband)")
-        cursor.execute("SELECT @band AS band_count, @noband AS noband_count")
-        results['band_counts'] = cursor.fetchone()
+        available = get_export_columns()
     except Exception as e:
-        results['band_counts'] = {'error': str(e)}
+        return jsonify({'error': str(e)}), 500
+    
+    # Projection: ?columns=run_id,customer,press_speed
+    requested = request.args.get('columns')
+    if requested:
+        columns = [c.strip() for c in requested.split(',') if c.strip()]
+        unknown = [c for c in columns if c not in available]
+        if unknown:
+            return jsonify({'error': f'Unknown columns: {unknown}'}), 400
+    else:
+        columns = available
+    
+    sql, params = build_export_query(
+        columns,
+        date_from=request.args.get('date_from') or None,
+        date_to=request.args.get('date_to') or None,
+        customer=request.args.get('customer') or None,
+        band_type=request.args.get('band_type') or None,
+        after_run_id=request.args.get('after_run_id', type=int),
+        limit=limit
+    )
     
-    # 4. Stored Procedure - INOUT parameter
+    response = Response(stream_with_context(stream_rows(sql, params, fmt, fetch_size)),
+                        mimetype=EXPORT_FORMATS[fmt])
+    if fmt == 'csv':
+        response.headers['Content-Disposition'] = 'attachment; filename=production_runs.csv'
+    return response
+
+
+@app.route('/api/runs')
+def api_runs():
+    """Run'lar NDJSON olarak akış halinde (format=csv da desteklenir)"""
+    return export_response('ndjson')
+
+
+@app.route('/api/export')
+def api_export():
+    """Tüm geniş veri seti CSV olarak akış halinde (format=ndjson da desteklenir)"""
+    return export_response('csv')
+
+# ============================================================================
+# JSON API - GROUP BY / AGGREGATE
+# ============================================================================
+
+AGGREGATE_MAX_GROUP_KEYS = 4
+
+
+def parse_filters(args):
+    """?filter=band_type:band&filter=press:816|821 -> {'band_type': ['band'], 'press': ['816', '821']}"""
+    filters = {}
+    for item in args.getlist('filter'):
+        name, separator, values = item.partition(':')
+        if not separator or not name.strip():
+            raise ValueError(f"Geçersiz filtre: {item} (beklenen: sütun:değer1|değer2)")
+        filters.setdefault(name.strip(), []).extend(values.split('|'))
+    return filters
+
+
+def sort_rows(rows, order_by, descending, limit):
+    """Küp satırlarını motorla aynı sıraya getir (order_by yoksa grup anahtarı)"""
+    if order_by is not None:
+        rows = sorted(rows, key=lambda row: row[order_by], reverse=descending)
+    return rows[:limit] if limit is not None else rows
+
+
+@app.route('/api/aggregate')
+def api_aggregate():
+    """Genel group-by / aggregate (questions/*.sql şablonunun yerine)
+
+    ?group_by=press_type[,paper_type]&measure=press_speed&agg=avg,count,p95
+    &filter=band_type:band&date_from=1991-01-01&order_by=avg&order=desc&limit=10
+
+    Tek grup sütunu + filtre yok + count/sum/avg/var/std -> rollup küpü (değer
+    tablolarına dokunmaz); diğerleri -> bellek içi sütunsal motor
+    """
+    group_by = [c.strip() for c in request.args.get('group_by', '').split(',') if c.strip()]
+    measure = request.args.get('measure') or None
+    aggs = [a.strip() for a in request.args.get('agg', 'avg' if measure else 'count').split(',')
+            if a.strip()]
+    aggs = ['count'] + [a for a in aggs if a != 'count']
+    order_by = request.args.get('order_by') or None
+    descending = request.args.get('order', 'desc').lower() != 'asc'
+    limit = request.args.get('limit', type=int)
+    date_from = request.args.get('date_from') or None
+    date_to = request.args.get('date_to') or None
+    
+    if not group_by or len(group_by) > AGGREGATE_MAX_GROUP_KEYS:
+        return jsonify({'error': f'group_by: 1-{AGGREGATE_MAX_GROUP_KEYS} sütun gerekli'}), 400
+    if order_by is not None and order_by not in group_by + aggs:
+        return jsonify({'error': f'order_by group_by veya agg olmalı: {order_by}'}), 400
+    if measure is None and aggs != ['count']:
+        return jsonify({'error': 'measure olmadan sadece count kullanılabilir'}), 400
     try:
-        cursor.execute("SET @customer = 'kmart'")
-        cursor.execute("CALL get_customer_run_count(@customer)")
-        cursor.execute("SELECT @customer AS result")
-        results['customer_count'] = cursor.fetchone()
-    except Exception as e:
-        results['customer_count'] = {'error': str(e)}
+        filters = parse_filters(request.args)
+        for agg in aggs:
+            parse_aggregate(agg)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # 5. Stored Procedure - Mixed parameters
     try:
-        cursor.execute("CALL search_runs_by_date('1991-01-01', '1991-12-31', @total, @band_pct)")
-        cursor.execute("SELECT @total AS total_runs, @band_pct AS band_percentage")
-        results['date_search'] = cursor.fetchone()
+        rows, store = None, None
+        with db_backend.connection() as connection:
+            column_registry.ensure_fresh(connection)
+            
+            cube_eligible = (len(group_by) == 1 and not filters and not date_from and not date_to
+                             and all(agg in CUBE_AGGREGATES for agg in aggs))
+            stringcol_id = column_registry.string_id(group_by[0])
+            numericcol_id = column_registry.numeric_id(measure) if measure else None
+            if cube_eligible and stringcol_id is not None and (measure is None or numericcol_id):
+                cursor = connection.cursor()
+                data_version, cube_data_version = cube_version(cursor)
+                if data_version == cube_data_version:  # bayat küp -> motora düş
+                    rows = query_cube(cursor, group_by[0], stringcol_id, numericcol_id, aggs)
+                cursor.close()
+            
+            if rows is None:
+                store = analytics_engine.ensure_fresh(connection)
+        
+        if rows is not None:
+            source = 'cube'
+            rows = sort_rows(sorted(rows, key=lambda row: row[group_by[0]]),
+                             order_by, descending, limit)
+        else:
+            source = 'engine'
+            mask = store.mask(filters, date_from, date_to) if filters or date_from or date_to else None
+            rows = store.group_aggregate(group_by, measure, aggs, mask=mask, order_by=order_by,
+                                         descending=descending, limit=limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        results['date_search'] = {'error': str(e)}
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify({
+        'group_by': group_by,
+        'measure': measure,
+        'aggs': aggs,
+        'source': source,
+        'rows': rows,
+    })
+
+# ============================================================================
+# JSON API - FACETS
+# ============================================================================
+
+def parse_ranges(args):
+    """?range=press_speed:1500:2000&range=viscosity::50 -> {'press_speed': (1500.0, 2000.0), 'viscosity': (None, 50.0)}"""
+    ranges = {}
+    for item in args.getlist('range'):
+        name, _, bounds = item.partition(':')
+        low, separator, high = bounds.partition(':')
+        if not separator or not name.strip():
+            raise ValueError(f"Geçersiz aralık: {item} (beklenen: sütun:alt:üst)")
+        ranges[name.strip()] = (float(low) if low else None, float(high) if high else None)
+    return ranges
+
+
+@app.route('/api/facets')
+def api_facets():
+    """Bitmap index üzerinde çok nitelikli filtre + canlı facet sayıları
+
+    ?facets=customer,band_type&filter=press_type:WoodHoe|Motter70&range=press_speed:1500:2000
+    &date_from=1990-01-01&date_to=1991-12-31
+
+    filter: string eşitlik (| = veya), range: numeric alt:üst (boş uç = sınırsız).
+    Her facet kendi filtresi hariç diğer filtrelerin kesişiminde sayılır.
+    """
+    names = [c.strip() for c in request.args.get('facets', ','.join(RUNS_FACETS)).split(',') if c.strip()]
+    date_from = request.args.get('date_from') or None
+    date_to = request.args.get('date_to') or None
     
-    # 6. Stored Procedure - Customer report
     try:
-        cursor.execute("CALL get_customer_report('kmart', @total, @band, @rate)")
-        cursor.execute("SELECT @total AS total_runs, @band AS band_runs, @rate AS band_rate")
-        results['customer_report'] = cursor.fetchone()
+        with db_backend.connection() as connection:
+            column_registry.ensure_fresh(connection)
+            index = facet_index.ensure_fresh(connection)
+        
+        filters = {}
+        if date_from or date_to:
+            filters['date'] = index.date_range(date_from, date_to)
+        for name, values in parse_filters(request.args).items():
+            col_id = column_registry.string_id(name)
+            if col_id is None:
+                raise ValueError(f"Bilinmeyen string sütun: {name}")
+            filters[name] = index.equals(col_id, values)
+        for name, (low, high) in parse_ranges(request.args).items():
+            col_id = column_registry.numeric_id(name)
+            if col_id is None:
+                raise ValueError(f"Bilinmeyen numeric sütun: {name}")
+            filters[name] = index.between(col_id, low, high)
+        unknown = [name for name in names if column_registry.string_id(name) is None]
+        if unknown:
+            raise ValueError(f"Bilinmeyen facet: {', '.join(unknown)}")
+        
+        result = index.intersect(filters.values())
+        counts = facet_counts(index, filters, names)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        results['customer_report'] = {'error': str(e)}
+        return jsonify({'error': str(e)}), 500
     
-    connection.close()
+    return jsonify({
+        'total': len(result),
+        'facets': {name: [{'value': value, 'count': count} for value, count in counts[name]]
+                   for name in names},
+    })
+
+# ============================================================================
+# JSON API - NUMERIC RANGE
+# ============================================================================
+
+@app.route('/api/numeric-range')
+def api_numeric_range():
+    """Numeric aralık: toplam + eşit derinlikli histogram + (value, run_id) keyset sayfası
+
+    ?column=press_speed&min=1500&max=2000&limit=100&after_value=1650&after_run_id=812
+    limit=0 -> sadece toplam ve histogram (arama formundaki canlı sayaç)
+    """
+    column_name = request.args.get('column', '')
+    limit = max(0, min(request.args.get('limit', SEARCH_PAGE_SIZE, type=int), RUNS_MAX_PAGE_SIZE))
+    try:
+        min_value = optional_float(request.args.get('min'))
+        max_value = optional_float(request.args.get('max'))
+        after_run_id = request.args.get('after_run_id', type=int)
+        after_value = optional_float(request.args.get('after_value')) if after_run_id is not None else None
+        rows, next_cursor, total, histogram = numeric_search(
+            column_name, min_value, max_value, after_value, after_run_id, limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
     
-    return render_template('procedures_views.html', results=results)
+    return jsonify({
+        'column': column_name,
+        'min': min_value,
+        'max': max_value,
+        'total': total,
+        'histogram': None if histogram is None else
+            [{'low': low, 'high': high, 'count': count} for low, high, count in histogram],
+        'rows': [{'run_id': row['run_id'], 'timestamp': str(row['timestamp']), 'value': float(row['value'])}
+                 for row in rows],
+        'next': next_cursor,
+    })
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text formatı: route / sorgu / procedure histogramları + havuz gauge'ları"""
+    gauges = {f'cylinder_db_pool_{name}': value for name, value in db_backend.metrics().items()
+              if isinstance(value, (int, float))}
+    gauges.update({f'cylinder_run_cache_{name}': value for name, value in run_cache.metrics().items()
+                   if isinstance(value, (int, float))})
+    gauges.update({f'cylinder_facet_index_{name}': value for name, value in facet_index.metrics().items()
+                   if isinstance(value, (int, float))})
+    return Response(instrumentation.render(gauges=gauges),
+                    content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/metrics/pool')
+def pool_metrics():
+    """Connection pool metrikleri (JSON)"""
+    return jsonify(db_backend.metrics())
 
 # ============================================================================
 # RUN APP
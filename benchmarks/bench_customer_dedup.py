@@ -0,0 +1,127 @@
+"""
+CYLINDER BANDS DATABASE - CUSTOMER DEDUP BENCHMARK
+cleaning.find_fuzzy_replacements (blocking) ile eski tüm-çiftler difflib döngüsünün
+karşılaştırması: sentetik müşteri isimlerinde aynı sonuç + ölçeklenme
+
+Kullanım:
+    python benchmarks/bench_customer_dedup.py
+    python benchmarks/bench_customer_dedup.py --sizes 1000 2000 4000 8000 16000
+"""
+
+import argparse
+import difflib
+import os
+import random
+import string
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from cleaning import find_fuzzy_replacements
+
+
+CONSONANTS = 'bcdfghjklmnprstvwyz'
+VOWELS = 'aeiou'
+SUFFIXES = ['', ' inc', ' co', ' ltd', ' press', ' print', ' pack', ' graphics', ' publishing']
+
+
+def word(rng):
+    """Telaffuz edilebilir rastgele kelime (2-4 hece)"""
+    return ''.join(rng.choice(CONSONANTS) + rng.choice(VOWELS) + rng.choice(['', rng.choice(CONSONANTS)])
+                   for _ in range(rng.randint(2, 4)))
+
+
+def typo(name, rng):
+    """Tek karakterlik silme / ekleme / değiştirme / yer değiştirme"""
+    if len(name) < 2:
+        return name + rng.choice(string.ascii_lowercase)
+    i = rng.randrange(len(name) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return name[:i] + name[i + 1:]
+    if kind == 1:
+        return name[:i] + rng.choice(string.ascii_lowercase) + name[i:]
+    if kind == 2:
+        return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def synthetic_counts(n_names, seed=42):
+    """~n_names farklı yazım: %70 ana isim (Zipf frekanslı), %30 nadir typo varyantı"""
+    rng = random.Random(seed)
+    n_base = max(1, int(n_names * 0.7))
+
+    bases = set()
+    while len(bases) < n_base:
+        name = word(rng) if rng.random() < 0.6 else f"{word(rng)} {word(rng)}"
+        bases.add(name + rng.choice(SUFFIXES))
+    bases = sorted(bases)
+
+    counts = {}
+    for rank, name in enumerate(bases, start=1):
+        counts[name] = max(2, int(5000 / rank ** 0.8))
+    while len(counts) < n_names:
+        variant = typo(rng.choice(bases), rng)
+        counts.setdefault(variant, rng.randint(1, 3))
+
+    # value_counts() ile aynı sıra: sayıya göre azalan
+    return pd.Series(counts).sort_values(ascending=False, kind='stable')
+
+
+def legacy_replacements(counts):
+    """cleaning.py'nin eski Phase 5 döngüsü (tüm çiftler difflib)"""
+    unique_customers = counts.index.tolist()
+    replacements = {}
+    report = []
+    for i, val in enumerate(unique_customers):
+        if val in replacements.values() or pd.isna(val):
+            continue
+        matches = difflib.get_close_matches(val, unique_customers[i + 1:], n=5, cutoff=0.85)
+        for match in matches:
+            if counts[val] > counts[match]:
+                replacements[match] = val
+                report.append(f"  - Typo Düzeltildi: '{match}' -> '{val}'")
+    return replacements, report
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes, legacy_limit):
+    print("=" * 70)
+    print("CUSTOMER DEDUP BENCHMARK")
+    print("=" * 70)
+    print(f"{'isim':>8} {'blocking (s)':>14} {'legacy (s)':>12} {'hız':>8} {'eşleşme':>9}  aynı")
+
+    previous = None
+    for size in sizes:
+        counts = synthetic_counts(size)
+        (replacements, report), fast = timed(find_fuzzy_replacements, counts)
+
+        legacy_text, speedup, same = '-', '-', '-'
+        if size <= legacy_limit:
+            (old_replacements, old_report), legacy = timed(legacy_replacements, counts)
+            same = '✅' if (old_replacements, old_report) == (replacements, report) else '❌'
+            legacy_text = f"{legacy:.2f}"
+            speedup = f"{legacy / fast:.1f}x"
+
+        print(f"{size:>8} {fast:>14.3f} {legacy_text:>12} {speedup:>8} {len(replacements):>9}  {same}")
+        if previous:
+            prev_size, prev_time = previous
+            print(f"{'':>8} {'':>14} (boyut x{size / prev_size:.1f} -> süre x{fast / prev_time:.1f})")
+        previous = (size, fast)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fuzzy customer dedup benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 4000, 8000, 16000],
+                        help='Farklı müşteri yazımı sayıları')
+    parser.add_argument('--legacy-limit', type=int, default=2000,
+                        help='Eski tüm-çiftler döngüsünün de çalıştırılacağı en büyük boyut')
+    args = parser.parse_args()
+    main(args.sizes, args.legacy_limit)
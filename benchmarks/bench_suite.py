@@ -0,0 +1,520 @@
+"""
+CYLINDER BANDS DATABASE - UÇTAN UCA BENCHMARK
+Sentetik veri üret -> cleaning phase'leri -> loader aşamaları -> stored procedure /
+view / questions sorguları -> app.py route'ları (Flask test client).
+Sonuçlar JSON'a yazılır; --baseline ile önceki koşuyla karşılaştırılır.
+
+Kullanım:
+    python benchmarks/bench_suite.py --rows 100000                       # gömülü SQLite
+    python benchmarks/bench_suite.py --rows 1000000 --stages cleaning loader
+    python benchmarks/bench_suite.py --input data/cylinder_band.csv --repeat 20
+    python benchmarks/bench_suite.py --mysql-database cylinder_bench --rows 100000   # ayrı MySQL veritabanı
+    python benchmarks/bench_suite.py --rows 100000 --baseline benchmarks/results/önceki.json
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import load_data
+from cleaning import execute_senior_db_cleaning, snapshot_path
+from generate_data import generate
+from rollup_cube import cube_contributions
+from stats_snapshot import refresh_statistics_snapshot
+
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+STAGES = ('cleaning', 'loader', 'procedures', 'routes')
+DEFAULT_REPEAT = 5
+REGRESSION_THRESHOLD = 1.2   # median bu oranın üstünde yavaşladıysa ⚠️
+
+# Loader'ın doldurduğu tablolar (FK sırasıyla boşaltılır)
+RESET_TABLES = ['rollup_cube', 'production_runs', 'run_fingerprints', 'runid_stringvalues',
+                'string_dictionary', 'runid_numericvalues', 'runs', 'stringcols', 'numericcols',
+                'statistics_snapshot']
+
+
+# ============================================================================
+# ÖLÇÜM
+# ============================================================================
+
+def summarize(samples):
+    """Süre örnekleri (sn) -> min / median / p95 / max"""
+    values = np.asarray(samples, dtype=np.float64)
+    return {
+        'runs': len(values),
+        'min_s': float(values.min()),
+        'median_s': float(np.median(values)),
+        'p95_s': float(np.percentile(values, 95)),
+        'max_s': float(values.max()),
+    }
+
+
+class Recorder:
+    """Aşama sonuçlarını toplar ve satır satır yazdırır"""
+
+    def __init__(self, verbose=False):
+        self.results = []
+        self.verbose = verbose
+
+    def add(self, stage, name, samples, rows=None, **extra):
+        result = {'stage': stage, 'name': name, **summarize(samples), **extra}
+        if rows:
+            result['rows'] = int(rows)
+            result['rows_per_s'] = rows / result['median_s'] if result['median_s'] else None
+        self.results.append(result)
+
+        status = f"  [{extra['status']}]" if 'status' in extra else ''
+        error = f"  ❌ {extra['error']}" if 'error' in extra else ''
+        print(f"  {stage:<11} {name:<42} {result['median_s'] * 1000:>10.2f} ms "
+              f"(p95 {result['p95_s'] * 1000:.2f}){status}{error}")
+        return result
+
+    def time(self, stage, name, func, *args, repeat=1, rows=None, **kwargs):
+        """func'ı repeat kez çalıştır, son sonucu döndür (hata -> sonuç kaydı + None)"""
+        samples, value = [], None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                with self.quiet():
+                    value = func(*args, **kwargs)
+            except Exception as e:
+                self.add(stage, name, [time.perf_counter() - start], error=str(e))
+                return None
+            samples.append(time.perf_counter() - start)
+        self.add(stage, name, samples, rows=rows)
+        return value
+
+    def quiet(self):
+        """Modüllerin emoji çıktısını --verbose yoksa yut"""
+        return contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+
+
+# ============================================================================
+# CLEANING
+# ============================================================================
+
+def bench_cleaning(recorder, raw_csv, workdir, chunksize=None):
+    """cleaning.py phase süreleri -> temizlenmiş CSV (+ Arrow snapshot) yolu"""
+    cleaned_csv = os.path.join(workdir, 'cleaned_cylinder.csv')
+    timings = {}
+    start = time.perf_counter()
+    with recorder.quiet():
+        execute_senior_db_cleaning(raw_csv, cleaned_csv, os.path.join(workdir, 'cleaning_report.txt'),
+                                   chunksize=chunksize, timings=timings)
+    total = time.perf_counter() - start
+
+    rows = count_rows(raw_csv)
+    for phase, seconds in timings.items():
+        recorder.add('cleaning', phase, [seconds])
+    recorder.add('cleaning', 'total' + (f' (chunksize={chunksize})' if chunksize else ''), [total], rows=rows)
+    return cleaned_csv
+
+
+def count_rows(path):
+    with open(path, 'rb') as f:
+        return max(0, sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b'')) - 1)
+
+
+# ============================================================================
+# LOADER
+# ============================================================================
+
+def check_mysql_database(database):
+    """--mysql-database kontrolü -> hata mesajı veya None
+
+    Loader aşaması tabloları boşaltır: app / loader'ın veritabanı (varsayılan veya
+    CYLINDER_MYSQL_DATABASE) benchmark için kabul edilmez.
+    """
+    if not database:
+        return "MySQL benchmark'ı için ayrı bir veritabanı gerekli: --mysql-database cylinder_bench"
+    configured = {load_data.DEFAULT_MYSQL_DATABASE, load_data.MYSQL_DATABASE}
+    if database.lower() in {name.lower() for name in configured}:
+        return (f"'{database}' app / loader veritabanı; benchmark loader tablolarını boşaltır, "
+                f"ayrı bir veritabanı verin")
+    return None
+
+
+def reset_database(connection):
+    """Loader tablolarını boşalt, version sayaçlarını sıfırla (--mysql-database)"""
+    cursor = connection.cursor()
+    for table in RESET_TABLES:
+        cursor.execute(f"DELETE FROM {table}")
+    cursor.execute("UPDATE load_state SET data_version = 0, schema_version = 0 WHERE id = 1")
+    cursor.execute("UPDATE materialized_state SET data_version = 0")
+    connection.commit()
+    cursor.close()
+
+
+def read_loader_input(cleaned_csv):
+    """main() ile aynı girdi: Arrow snapshot varsa o, yoksa CSV + loader düzeltmeleri"""
+    snapshot = snapshot_path(cleaned_csv)
+    if load_data.pa is not None and os.path.exists(snapshot):
+        return load_data.load_snapshot(snapshot)
+    import pandas as pd
+    df = load_data.apply_loader_fixes(pd.read_csv(cleaned_csv))
+    string_cols, numeric_cols = load_data.categorize_columns(df)
+    return df, string_cols, numeric_cols
+
+
+def bench_loader(recorder, cleaned_csv, sqlite_path=None, batch_size=load_data.BATCH_SIZE,
+                 workers=1, database=None):
+    """load_data.main'in aşamaları tek tek, boş veritabanına (workers > 1: paralel değer yüklemesi)
+
+    sqlite_path yoksa MySQL'deki `database` boşaltılıp kullanılır (check_mysql_database)
+    """
+    stage = 'loader'
+    if sqlite_path is None:
+        problem = check_mysql_database(database)
+        if problem:
+            raise ValueError(problem)
+    with recorder.quiet():
+        connection = load_data.connect_to_db(sqlite_path=sqlite_path, database=database)
+    if connection is None:
+        raise RuntimeError("Veritabanına bağlanılamadı")
+
+    try:
+        if sqlite_path is None:
+            reset_database(connection)
+
+        df, string_cols, numeric_cols = recorder.time(stage, 'input', read_loader_input, cleaned_csv)
+        rows = len(df)
+        string_col_ids, numeric_col_ids = recorder.time(
+            stage, 'metadata_tables', load_data.populate_metadata_tables,
+            connection, string_cols, numeric_cols)
+        run_ids = recorder.time(stage, 'runs_table', load_data.populate_runs_table,
+                                connection, df, batch_size=batch_size, rows=rows)
+        if workers > 1:
+            long_frames = recorder.time(
+                stage, f'value_tables_parallel_{workers}', load_data.parallel_populate_values,
+                connection, df, string_cols, numeric_cols, string_col_ids, numeric_col_ids, run_ids,
+                connect=lambda: load_data.connect_to_db(sqlite_path=sqlite_path, database=database),
+                workers=workers, batch_size=batch_size,
+                rows=rows * (len(string_cols) + len(numeric_cols)))
+        else:
+            long_frames = recorder.time(
+                stage, 'value_tables', load_data.bulk_populate_values,
+                connection, df, string_cols, numeric_cols, string_col_ids, numeric_col_ids, run_ids,
+                batch_size=batch_size, rows=rows * (len(string_cols) + len(numeric_cols)))
+
+        fingerprints = recorder.time(stage, 'fingerprints_compute', load_data.compute_fingerprints,
+                                     df, string_cols, numeric_cols, rows=rows)
+        recorder.time(stage, 'fingerprints_save', load_data.save_fingerprints,
+                      connection, run_ids, *fingerprints, batch_size, rows=rows)
+        recorder.time(stage, 'production_runs_sync', load_data.sync_production_runs,
+                      connection, df, run_ids, string_cols, numeric_cols, batch_size,
+                      commit=False, rows=rows)
+        delta = recorder.time(stage, 'rollup_cube_contributions', cube_contributions,
+                              long_frames['string'], long_frames['numeric'])
+        recorder.time(stage, 'rollup_cube_upsert', load_data.update_rollup_cube,
+                      connection, delta, batch_size, commit=False)
+        recorder.time(stage, 'commit', lambda: (load_data.bump_data_version(connection),
+                                                connection.commit()))
+        recorder.time(stage, 'statistics_snapshot', refresh_statistics_snapshot, connection)
+
+        # Aynı besleme ikinci kez: parmak izi karşılaştırmasının sabit maliyeti
+        recorder.time(stage, 'incremental_noop', load_data.incremental_load,
+                      connection, df, string_cols, numeric_cols, string_col_ids, numeric_col_ids,
+                      batch_size=batch_size, rows=rows)
+        recorder.time(stage, 'refresh_production_runs', load_data.refresh_production_runs,
+                      connection, rows=rows)
+        recorder.time(stage, 'refresh_rollup_cube', load_data.refresh_rollup_cube, connection)
+        return rows
+    finally:
+        connection.close()
+
+
+# ============================================================================
+# STORED PROCEDURES / VIEWS / QUESTIONS
+# ============================================================================
+
+def sample_parameters(cursor, registry):
+    """Gerçek veriden örnek parametreler: orta run, en sık müşteri, basınç aralığı"""
+    cursor.execute("SELECT MIN(run_id), MAX(run_id) FROM runs")
+    low, high = cursor.fetchone()
+    cursor.execute(
+        "SELECT d.string_value FROM runid_stringvalues sv "
+        "JOIN string_dictionary d ON d.string_code = sv.string_code "
+        "WHERE sv.stringcol_id = %s GROUP BY d.string_code ORDER BY COUNT(*) DESC LIMIT 1",
+        (registry.string_id('customer'),))
+    customer = cursor.fetchone()[0]
+    cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM runs")
+    first, last = cursor.fetchone()
+    return {'run_id': (low + high) // 2, 'customer': customer,
+            'date_from': str(first), 'date_to': str(last)}
+
+
+def question_statements(path):
+    """questions/qN.sql -> çalıştırılabilir ifadeler (USE ve yorumlar atılır)"""
+    sql = re.sub(r'(?im)^\s*USE\s+\w+\s*;', '', open(path, encoding='utf-8').read())
+    return [s for s in sql.split(';') if re.sub(r'--[^\n]*', '', s).strip()]
+
+
+def run_statements(cursor, statements):
+    for statement in statements:
+        cursor.execute(statement)
+        cursor.fetchall()
+
+
+def bench_procedures(recorder, app_module, repeat):
+    """Procedure'ler (MySQL: CALL, SQLite: storage karşılıkları), view'lar ve questions/*.sql"""
+    stage = 'procedures'
+    backend, registry = app_module.db_backend, app_module.column_registry
+    with backend.connection() as connection:
+        registry.ensure_fresh(connection)
+        cursor = connection.cursor()
+        params = sample_parameters(cursor, registry)
+
+        procedures = [
+            ('get_run_details', backend.get_run_details, (cursor, params['run_id'])),
+            ('quick_search', backend.quick_search,
+             (cursor, params['customer'][:3], registry.string_id('customer'))),
+            ('search_string_attribute', backend.search_string_attribute,
+             (cursor, registry.string_id('press_type'), 'motter')),
+            ('search_numeric_attribute', backend.search_numeric_attribute,
+             (cursor, registry.numeric_id('press_speed'), 1500, 2000)),
+        ]
+        if backend.dialect == 'mysql':
+            def call(name, args):
+                result = cursor.callproc(name, args)
+                for stored in cursor.stored_results():
+                    stored.fetchall()
+                return result
+            procedures += [
+                ('count_band_types', call, ('count_band_types', (0, 0))),
+                ('get_customer_run_count', call, ('get_customer_run_count', (params['customer'],))),
+                ('search_runs_by_date', call,
+                 ('search_runs_by_date', (params['date_from'], params['date_to'], 0, 0))),
+                ('get_customer_report', call, ('get_customer_report', (params['customer'], 0, 0, 0))),
+                ('get_statistics', call, ('get_statistics', (0, 0, 0, 0))),
+            ]
+        for name, func, args in procedures:
+            recorder.time(stage, name, func, *args, repeat=repeat)
+
+        for view in ('v_string_data', 'v_numeric_data', 'v_all_data', 'v_production_runs'):
+            recorder.time(stage, f'{view} count', run_statements, cursor,
+                          [f"SELECT COUNT(*) FROM {view}"], repeat=repeat)
+            recorder.time(stage, f'{view} run lookup', run_statements, cursor,
+                          [f"SELECT * FROM {view} WHERE run_id = {int(params['run_id'])}"], repeat=repeat)
+
+        for path in sorted(glob.glob(os.path.join(REPO_DIR, 'questions', 'q*.sql')),
+                           key=lambda p: int(re.findall(r'\d+', os.path.basename(p))[0])):
+            name = os.path.splitext(os.path.basename(path))[0]
+            recorder.time(stage, f'questions/{name}', run_statements, cursor,
+                          question_statements(path), repeat=repeat)
+        cursor.close()
+    return params
+
+
+# ============================================================================
+# ROUTES (Flask test client)
+# ============================================================================
+
+def route_requests(params):
+    """(isim, method, url, form) - app.py'deki her route, gerçekçi parametrelerle"""
+    customer, run_id = params['customer'], params['run_id']
+    return [
+        ('GET /', 'GET', '/', None),
+        ('GET /quick-search', 'GET', f'/quick-search?q={customer[:3]}', None),
+        ('GET /api/quick-search', 'GET', f'/api/quick-search?q={customer[:3]}&k=10', None),
+        ('GET /runs', 'GET', '/runs', None),
+        ('GET /runs (filter)', 'GET', f'/runs?customer={customer}&band_type=band&sort_by=timestamp', None),
+        ('GET /run/<id>', 'GET', f'/run/{run_id}', None),
+        ('GET /search', 'GET', '/search', None),
+        ('POST /search (string)', 'POST', '/search',
+         {'search_type': 'string', 'column_name': 'customer', 'search_value': customer[:4]}),
+        ('POST /search (numeric)', 'POST', '/search',
+         {'search_type': 'numeric', 'column_name': 'press_speed', 'min_value': '1500', 'max_value': '2000'}),
+        ('GET /statistics', 'GET', '/statistics', None),
+        ('GET /procedures-views', 'GET', '/procedures-views', None),
+        ('GET /api/runs', 'GET', '/api/runs?limit=1000', None),
+        ('GET /api/export (csv)', 'GET', '/api/export?format=csv', None),
+        ('GET /api/export (projection)', 'GET',
+         f'/api/export?format=ndjson&columns=run_id,customer,press_speed&customer={customer}', None),
+        ('GET /api/aggregate (cube)', 'GET',
+         '/api/aggregate?group_by=press_type&measure=press_speed&agg=avg,std', None),
+        ('GET /api/aggregate (engine)', 'GET',
+         '/api/aggregate?group_by=press_type,paper_type&measure=viscosity&agg=p50,p95'
+         '&filter=band_type:band', None),
+        ('GET /api/facets', 'GET',
+         '/api/facets?facets=customer,band_type,press_type&filter=band_type:band'
+         '&range=press_speed:1500:2000', None),
+        ('GET /api/numeric-range', 'GET', '/api/numeric-range?column=press_speed&min=1500&max=2000', None),
+        ('GET /metrics/pool', 'GET', '/metrics/pool', None),
+    ]
+
+
+def bench_routes(recorder, app_module, params, repeat):
+    """İlk istek (soğuk önbellek) ayrı, sonra repeat kez sıcak"""
+    client = app_module.app.test_client()
+    if not recorder.verbose:
+        app_module.app.logger.disabled = True  # 500'lerin traceback'i; status zaten kaydediliyor
+    for name, method, url, form in route_requests(params):
+        for label, count in (('cold', 1), ('warm', repeat)):
+            samples, status = [], None
+            for _ in range(count):
+                start = time.perf_counter()
+                with recorder.quiet():
+                    response = client.open(url, method=method, data=form)
+                    response.get_data()  # streaming yanıtlar da sonuna kadar okunur
+                samples.append(time.perf_counter() - start)
+                status = response.status_code
+                response.close()
+            recorder.add('routes', f'{name} [{label}]', samples, status=status)
+
+
+def import_app(sqlite_path, database=None):
+    """app.py backend'i import anında seçer -> ortam değişkenleri önce ayarlanır"""
+    if sqlite_path:
+        os.environ['CYLINDER_DB_BACKEND'] = 'sqlite'
+        os.environ['CYLINDER_SQLITE_PATH'] = sqlite_path
+    else:
+        os.environ['CYLINDER_DB_BACKEND'] = 'mysql'
+        os.environ['CYLINDER_MYSQL_DATABASE'] = database
+    import app
+    return app
+
+
+# ============================================================================
+# SONUÇLAR
+# ============================================================================
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path):
+    """Önceki JSON ile median karşılaştırması; REGRESSION_THRESHOLD üstü ⚠️"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['stage'], r['name']): r for r in json.load(f)['results']}
+
+    print(f"\n📈 Karşılaştırma: {baseline_path}")
+    regressions = 0
+    for result in results:
+        previous = baseline.get((result['stage'], result['name']))
+        if not previous or not previous['median_s']:
+            continue
+        ratio = result['median_s'] / previous['median_s']
+        flag = '⚠️' if ratio > REGRESSION_THRESHOLD else ('🚀' if ratio < 1 / REGRESSION_THRESHOLD else '  ')
+        regressions += ratio > REGRESSION_THRESHOLD
+        print(f"  {flag} {result['stage']:<11} {result['name']:<42} "
+              f"{previous['median_s'] * 1000:>10.2f} -> {result['median_s'] * 1000:>10.2f} ms  x{ratio:.2f}")
+    print(f"  {regressions} regresyon (> x{REGRESSION_THRESHOLD})")
+    return regressions
+
+
+def main(args):
+    mysql = args.mysql or args.mysql_database is not None
+    if mysql:
+        problem = check_mysql_database(args.mysql_database)
+        if problem:
+            print(f"✗ {problem}")
+            return 1
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='cylinder_bench_')
+    os.makedirs(workdir, exist_ok=True)
+    recorder = Recorder(verbose=args.verbose)
+    meta = {**environment(), 'backend': 'mysql' if mysql else 'sqlite',
+            'mysql_database': args.mysql_database if mysql else None,
+            'rows': args.rows, 'seed': args.seed, 'repeat': args.repeat,
+            'chunksize': args.chunksize, 'stages': args.stages, 'workers': args.workers}
+
+    print("=" * 80)
+    print(f"CYLINDER BANDS BENCHMARK ({meta['backend']}, {workdir})")
+    print("=" * 80)
+
+    raw_csv = args.input
+    if raw_csv is None:
+        raw_csv = os.path.join(workdir, f'cylinder_{args.rows}.csv')
+        start = time.perf_counter()
+        generate(args.rows, raw_csv, seed=args.seed)
+        print(f"✓ {args.rows:,} sentetik run üretildi ({time.perf_counter() - start:.1f} sn)")
+    meta['input'] = raw_csv
+
+    cleaned_csv = os.path.join(workdir, 'cleaned_cylinder.csv')
+    if 'cleaning' in args.stages:
+        cleaned_csv = bench_cleaning(recorder, raw_csv, workdir, args.chunksize)
+
+    sqlite_path = None if mysql else (args.sqlite or os.path.join(workdir, 'cylinder_bench.db'))
+    if 'loader' in args.stages:
+        if sqlite_path and os.path.exists(sqlite_path):
+            os.remove(sqlite_path)
+        meta['loaded_runs'] = bench_loader(recorder, cleaned_csv, sqlite_path, args.batch_size,
+                                           args.workers, database=meta['mysql_database'])
+
+    if 'procedures' in args.stages or 'routes' in args.stages:
+        app_module = import_app(sqlite_path, meta['mysql_database'])
+        with app_module.db_backend.connection() as connection:
+            app_module.column_registry.ensure_fresh(connection)
+            params = sample_parameters(connection.cursor(), app_module.column_registry)
+        if 'procedures' in args.stages:
+            bench_procedures(recorder, app_module, args.repeat)
+        if 'routes' in args.stages:
+            bench_routes(recorder, app_module, params, args.repeat)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench-{meta['backend']}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': recorder.results}, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Sonuçlar: {output}")
+
+    if args.baseline:
+        return compare(recorder.results, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Cylinder bands uçtan uca benchmark')
+    parser.add_argument('--rows', type=int, default=100_000, help='Üretilecek sentetik run sayısı')
+    parser.add_argument('--input', default=None, help='Üretmek yerine bu ham CSV kullanılır')
+    parser.add_argument('--seed', type=int, default=42, help='Üretici tohumu')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES),
+                        help='Çalıştırılacak aşamalar (loader olmadan sonrakiler mevcut veritabanını kullanır)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='Procedure / route başına sıcak tekrar sayısı')
+    parser.add_argument('--chunksize', type=int, default=None, help='Cleaning streaming modu chunk boyutu')
+    parser.add_argument('--batch-size', type=int, default=load_data.BATCH_SIZE, help='Loader batch boyutu')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Loader değer tablolarını bu kadar bağlantıyla paralel yükle')
+    parser.add_argument('--sqlite', default=None, metavar='PATH',
+                        help='SQLite dosyası (varsayılan: çalışma dizininde; loader aşaması siler)')
+    parser.add_argument('--mysql', action='store_true',
+                        help='MySQL ile çalış (--mysql-database gerekli)')
+    parser.add_argument('--mysql-database', default=None, metavar='NAME',
+                        help='Benchmark\'ın MySQL veritabanı; loader tablolarını boşaltır, '
+                             'app / loader veritabanı kabul edilmez (ör. cylinder_bench)')
+    parser.add_argument('--workdir', default=None, help='Ara dosyaların dizini (varsayılan: geçici)')
+    parser.add_argument('--output', default=None, help='JSON sonuç yolu (varsayılan: benchmarks/results/)')
+    parser.add_argument('--baseline', default=None, help='Karşılaştırılacak önceki JSON')
+    parser.add_argument('--verbose', action='store_true', help='Modüllerin kendi çıktılarını da göster')
+    args = parser.parse_args()
+    sys.exit(1 if main(args) else 0)
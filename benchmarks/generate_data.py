@@ -0,0 +1,158 @@
+"""
+CYLINDER BANDS DATABASE - SENTETİK VERİ ÜRETİCİ
+data/cylinder_band.csv dağılımını 100k-10M run'a ölçekler: aynı 37 öznitelik,
+sütun başına aynı NULL oranları, büyüyen müşteri listesi + müşteri typo'ları.
+Çıktı ham UCI biçimindedir (timestamp YYYYMMDD, NULL = '?'); cleaning.py ile temizlenir.
+
+Kullanım:
+    python benchmarks/generate_data.py --rows 100000 --output /tmp/cylinder_100k.csv
+    python benchmarks/generate_data.py --rows 10000000 --output /tmp/cylinder_10m.csv --chunk-size 500000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_customer_dedup import SUFFIXES, typo, word
+
+
+SEED_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cylinder_band.csv')
+NULL_TOKEN = '?'
+
+# Run'a özgü kimlikler: tohum değerler tekrar edilmez, ölçekle birlikte üretilir
+ID_COLUMNS = ('cylinder_number', 'job_number')
+
+# Tohum veriye yakın oranlar: müşteri hücrelerinin ~%2'si typo, satırların ~%1'i mükerrer
+CUSTOMER_TYPO_RATE = 0.02
+DUPLICATE_RATE = 0.01
+CONTINUOUS_MIN_DISTINCT = 50   # daha az farklı değerli sütunlar ayar / kod gibi, olduğu gibi örneklenir
+NUMERIC_JITTER = 0.05          # sürekli ölçülere sütun std'sinin bu oranında gürültü
+MAX_SPAN_YEARS = 30      # tarih aralığı ölçekle genişler, en fazla bu kadar
+
+
+def fit_profile(seed_csv=SEED_CSV):
+    """Tohum CSV'den profil: ham satırlar + NULL maskesi, sürekli ölçülerin dağılımı, tarih aralığı"""
+    raw = pd.read_csv(seed_csv, dtype=str, keep_default_na=False)
+    null = raw.isin(['', NULL_TOKEN])
+
+    continuous = {}
+    for col in raw.columns:
+        if col == 'timestamp' or col in ID_COLUMNS:
+            continue
+        values = raw[col][~null[col]]
+        parsed = pd.to_numeric(values, errors='coerce')
+        if parsed.notna().all() and values.nunique() >= CONTINUOUS_MIN_DISTINCT:
+            decimals = values.str.partition('.')[2].str.len().max()
+            continuous[col] = {'std': float(parsed.std()), 'decimals': int(decimals),
+                               'low': float(parsed.min()), 'high': float(parsed.max())}
+
+    dates = pd.to_datetime(raw['timestamp'], errors='coerce').dropna()
+    return {
+        'columns': list(raw.columns),
+        'raw': raw,
+        'null': null,
+        'continuous': continuous,
+        'first_date': dates.min(),
+        'seed_span_days': max(1, (dates.max() - dates.min()).days),
+        'customer_counts': raw['customer'][~null['customer']].value_counts(),
+    }
+
+
+def customer_vocabulary(profile, rows, rng):
+    """Müşteri sayısı sqrt(run) ile büyür; tohum müşteriler + Zipf frekanslı yeni isimler"""
+    seed_counts = profile['customer_counts']
+    target = max(len(seed_counts), int(len(seed_counts) * np.sqrt(rows / len(profile['raw']))))
+
+    names = list(seed_counts.index)
+    known = set(names)
+    py_rng = random.Random(int(rng.integers(1 << 31)))
+    while len(names) < target:
+        name = (word(py_rng) if py_rng.random() < 0.6 else word(py_rng) + word(py_rng)) + \
+            py_rng.choice(SUFFIXES).replace(' ', '')
+        if name not in known:
+            known.add(name)
+            names.append(name)
+
+    weights = 1.0 / np.arange(1, len(names) + 1) ** 0.8
+    return np.array(names, dtype=object), weights / weights.sum(), py_rng
+
+
+def generate_chunk(profile, size, start, total_rows, vocabulary, rng):
+    """size satırlık ham chunk: tohum satırlarını örnekle, kimlik / tarih / ölçüleri yeniden üret"""
+    raw, null = profile['raw'], profile['null']
+    picks = rng.integers(0, len(raw), size)
+    chunk = raw.iloc[picks].reset_index(drop=True)
+    chunk_null = null.iloc[picks].reset_index(drop=True)
+
+    # Tarihler: tohum yoğunluğuna göre genişleyen aralıkta, satır sırasıyla artan
+    span = min(profile['seed_span_days'] * max(1.0, total_rows / len(raw)), MAX_SPAN_YEARS * 365)
+    offsets = np.sort(rng.uniform(start, start + size, size)) / total_rows * span
+    dates = profile['first_date'] + pd.to_timedelta(offsets.astype(np.int64), unit='D')
+    chunk['timestamp'] = dates.strftime('%Y%m%d')
+
+    # Kimlikler: harf + numara / 5 haneli iş numarası, ölçekle büyüyen havuzdan
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'), dtype=object)
+    pool = max(1000, total_rows // 2)
+    chunk['cylinder_number'] = letters[rng.integers(0, 26, size)] + rng.integers(1, pool, size).astype(str).astype(object)
+    chunk['job_number'] = rng.integers(10000, 10000 + max(90000, total_rows // 2), size).astype(str)
+
+    # Müşteriler: Zipf dağılımı + CUSTOMER_TYPO_RATE oranında tek karakter typo'su
+    names, weights, py_rng = vocabulary
+    customers = names[rng.choice(len(names), size, p=weights)]
+    for position in np.flatnonzero(rng.random(size) < CUSTOMER_TYPO_RATE):
+        customers[position] = typo(customers[position], py_rng)
+    chunk['customer'] = customers
+
+    # Sürekli ölçüler: örneklenen satırın değeri + gürültü, tohum aralığında ve ondalık hassasiyetinde
+    for col, stats in profile['continuous'].items():
+        base = pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=np.float64)
+        noisy = base + rng.normal(0.0, stats['std'] * NUMERIC_JITTER, size)
+        noisy = np.nan_to_num(np.clip(noisy, stats['low'], stats['high']).round(stats['decimals']))
+        chunk[col] = noisy.astype(np.int64).astype(str) if stats['decimals'] == 0 else noisy.astype(str)
+
+    # NULL'lar örneklenen satırınkiyle aynı (sütun başına tohum oranı), UCI biçiminde '?'
+    for col in chunk.columns:
+        if col not in ('timestamp', 'customer') + ID_COLUMNS:
+            chunk[col] = chunk[col].where(~chunk_null[col], NULL_TOKEN)
+
+    # Mükerrer satırlar (cleaning Phase 7'nin işi)
+    duplicates = np.flatnonzero(rng.random(size) < DUPLICATE_RATE)
+    duplicates = duplicates[duplicates > 0]
+    if len(duplicates):
+        chunk.iloc[duplicates] = chunk.iloc[duplicates - 1].to_numpy()
+    return chunk[profile['columns']]
+
+
+def generate(rows, output, seed=42, chunk_size=250_000, seed_csv=SEED_CSV):
+    """rows satırlık ham CSV'yi chunk chunk yaz (bellek chunk_size ile sınırlı)"""
+    rng = np.random.default_rng(seed)
+    profile = fit_profile(seed_csv)
+    vocabulary = customer_vocabulary(profile, rows, rng)
+
+    written = 0
+    while written < rows:
+        size = min(chunk_size, rows - written)
+        chunk = generate_chunk(profile, size, written, rows, vocabulary, rng)
+        chunk.to_csv(output, index=False, mode='w' if written == 0 else 'a', header=written == 0)
+        written += size
+    return {'rows': rows, 'customers': len(vocabulary[0]), 'seed': seed, 'output': output}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Sentetik cylinder bands verisi üret')
+    parser.add_argument('--rows', type=int, default=100_000, help='Üretilecek run sayısı')
+    parser.add_argument('--output', default='cylinder_synthetic.csv', help='Ham CSV çıktı yolu')
+    parser.add_argument('--seed', type=int, default=42, help='Rastgelelik tohumu (aynı tohum -> aynı dosya)')
+    parser.add_argument('--chunk-size', type=int, default=250_000, help='Bellekte tutulan satır sayısı')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    info = generate(args.rows, args.output, seed=args.seed, chunk_size=args.chunk_size)
+    print(f"✅ {info['rows']:,} run, {info['customers']} müşteri -> {info['output']} "
+          f"({time.perf_counter() - start:.1f} sn)")
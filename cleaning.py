@@ -1,12 +1,297 @@
 import pandas as pd
 import numpy as np
+import bisect
 import difflib
+import heapq
+import json
+import math
+import os
+import time
+from collections import Counter, defaultdict
 
-def execute_senior_db_cleaning(input_file, output_csv, report_file):
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow snapshot opsiyonel; yoksa sadece CSV yazılır
+    pa = None
+
+
+BINARY_MAP = {'yes': True, 'no': False, 'true': True, 'false': False}
+
+
+class PhaseClock:
+    """Phase süreleri: lap(name) bir önceki lap'ten beri geçen süreyi timings'e ekler
+
+    timings=None -> ölçüm kapalı (benchmarks/bench_suite.py dict verir)
+    """
+
+    def __init__(self, timings=None):
+        self.timings = timings
+        self.last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        if self.timings is not None:
+            self.timings[name] = self.timings.get(name, 0.0) + now - self.last
+        self.last = now
+
+
+# ============================================================================
+# FUZZY DEDUP MOTORU (blocking + SequenceMatcher)
+# ============================================================================
+
+def _char_tokens(text):
+    """Karakter multiset'ini token'lara çevir: 'aba' -> ('a',0), ('b',0), ('a',1)"""
+    seen = {}
+    tokens = []
+    for ch in text:
+        k = seen.get(ch, 0)
+        seen[ch] = k + 1
+        tokens.append((ch, k))
+    return tokens
+
+
+def _length_window(length, cutoff):
+    """ratio >= cutoff olabilecek eş uzunluk aralığı (real_quick_ratio sınırı)
+
+    2 * min(la, lb) / (la + lb) >= cutoff  ->  la * c / (2 - c) <= lb <= la * (2 - c) / c
+    Kayan nokta payı için aralık bir miktar geniş tutulur (kayıpsız).
+    """
+    low = math.floor(length * cutoff / (2 - cutoff) + 1e-9)
+    high = math.ceil(length * (2 - cutoff) / cutoff - 1e-9) if cutoff > 0 else float('inf')
+    return low, high
+
+
+def _prefix_length(length, cutoff):
+    """Prefix filtering: ortak karakter sayısı >= t ise ilk (length - t + 1) token'dan biri ortaktır
+
+    t, bu uzunluktaki bir ismin olası en kısa eşiyle gereken en az ortak karakter
+    sayısıdır (quick_ratio sınırı: 2 * M / (la + lb) >= cutoff).
+    """
+    low, _ = _length_window(length, cutoff)
+    t = math.ceil(cutoff / 2 * (length + low) - 1e-9)
+    return min(length, max(1, length - t + 1))
+
+
+def find_fuzzy_replacements(counts, cutoff=0.85, n=5):
+    """Phase 5 typo düzeltmesi: difflib.get_close_matches ile aynı sonuç, tüm çiftler yerine adaylar
+
+    counts: value_counts() (sık kullanılandan aza sıralı)
+    Dönüş: (replacements, rapor satırları)
+
+    1. Blocking: her isim, karakter token'larının en nadir ilk birkaçıyla
+       (prefix filtering) ters index'e girer; ratio >= cutoff olabilecek her
+       çift en az bir token paylaşır, yani hiçbir eşleşme kaçmaz.
+    2. Uzunluk penceresi + pozisyon filtresi + quick_ratio ile adaylar elenir.
+    3. Kalan adaylar SequenceMatcher.ratio ile (get_close_matches'in aynı
+       yönü ve sıralamasıyla) puanlanır.
+    """
+    names = counts.index.tolist()
+    lengths = np.array([len(str(name)) for name in names], dtype=np.int64)
+
+    # Global token sırası: en nadir token önce
+    token_lists = [_char_tokens(str(name)) for name in names]
+    frequency = Counter(token for tokens in token_lists for token in tokens)
+
+    # Karakter sayım matrisi: quick_ratio'nun (multiset kesişimi) vektörel karşılığı
+    alphabet = {ch: k for k, ch in enumerate(sorted({ch for ch, _ in frequency}))}
+    char_counts = np.zeros((len(names), max(len(alphabet), 1)), dtype=np.uint16)
+    for i, tokens in enumerate(token_lists):
+        for ch, _ in tokens:
+            char_counts[i, alphabet[ch]] += 1
+
+    # token -> (uzunluk, token pozisyonu) -> [isim sırası] (artan)
+    index = defaultdict(lambda: defaultdict(list))
+    prefixes = []
+    for i, tokens in enumerate(token_lists):
+        ordered = sorted(tokens, key=lambda token: (frequency[token], token))
+        prefix = ordered[:_prefix_length(len(tokens), cutoff)] if tokens else []
+        prefixes.append(prefix)
+        for position, token in enumerate(prefix):
+            index[token][(len(tokens), position)].append(i)
+
+    replacements = {}
+    targets = set()  # replacements.values() için O(1) kontrol
+    report = []
+    matcher = difflib.SequenceMatcher()
+
+    for i, val in enumerate(names):
+        if val in targets or pd.isna(val):
+            continue
+
+        # Adaylar: sonraki isimlerden prefix token'ı paylaşanlar. İlk ortak token
+        # a'da `position`, b'de `other` pozisyonundaysa öncekiler ortak olamaz
+        # (global sıra) -> en fazla min(la - position, lb - other) ortak karakter;
+        # bu yüzden sadece o sınırı geçebilecek (uzunluk, pozisyon) grupları gezilir.
+        la = len(val)
+        low, high = _length_window(la, cutoff)
+        found = []
+        for position, token in enumerate(prefixes[i]):
+            groups = index[token]
+            for lb in range(max(low, 1), high + 1):
+                needed = math.ceil(cutoff / 2 * (la + lb) - 1e-9)
+                if la - position < needed:
+                    continue
+                for other in range(lb - needed + 1):
+                    members = groups.get((lb, other))
+                    if members:
+                        found.extend(members[bisect.bisect_right(members, i):])
+        if not found:
+            continue
+        candidates = np.unique(np.array(found, dtype=np.int64))
+
+        # quick_ratio filtresi tek seferde: 2 * ortak_karakter / (la + lb)
+        shared = np.minimum(char_counts[candidates], char_counts[i]).sum(axis=1)
+        quick = 2.0 * shared / (la + lengths[candidates])
+        candidates = candidates[quick >= cutoff]
+
+        # get_close_matches ile aynı: seq2 = aranan, seq1 = aday
+        matcher.set_seq2(val)
+        scored = []
+        for j in candidates:
+            matcher.set_seq1(names[j])
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                scored.append((ratio, names[j]))
+
+        for _, match in heapq.nlargest(n, scored):
+            if counts[val] > counts[match]:  # Sık kullanılan doğru kabul edilir
+                replacements[match] = val
+                targets.add(val)
+                report.append(f"  - Typo Düzeltildi: '{match}' -> '{val}'")
+
+    return replacements, report
+
+
+# ============================================================================
+# TİP OPTİMİZASYONU (vektörel şema çıkarımı, en dar tipler)
+# ============================================================================
+
+# Farklı değer sayısı bu sınırların altında kalan metin sütunları category olur
+CATEGORY_MAX_UNIQUE = 10000
+CATEGORY_MAX_RATIO = 0.5
+
+INT_DTYPES = ['int8', 'int16', 'int32', 'int64']
+NULLABLE_INT_DTYPES = ['Int8', 'Int16', 'Int32', 'Int64']
+
+
+def _all_integral(values):
+    """NaN olmayan float değerlerin hepsi tam sayı mı (x.is_integer() karşılığı)"""
+    values = values[~np.isnan(values)]
+    return bool(np.all(np.mod(values, 1) == 0))
+
+
+def _numeric_parse_count(values):
+    """pd.to_numeric(values, errors='coerce').notnull().sum() - sadece farklı değerler parse edilir"""
+    codes, uniques = pd.factorize(values)
+    if not len(uniques):
+        return 0
+    parsed = pd.to_numeric(pd.Series(uniques, dtype=object), errors='coerce').notna().to_numpy()
+    if not parsed.any():
+        return 0  # belli ki metin
+    return int(parsed[codes[codes >= 0]].sum())
+
+
+def _narrowest_int_dtype(low, high, nullable=False):
+    """[low, high] aralığını tutan en dar integer tipi"""
+    dtypes = NULLABLE_INT_DTYPES if nullable else INT_DTYPES
+    for dtype in dtypes:
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            return dtype
+    return dtypes[-1]
+
+
+def _float32_safe(values):
+    """float32'ye kayıpsız iner mi (hem değer hem CSV'ye yazılan metin aynı float64'e döner)"""
+    values = values[~np.isnan(values)]
+    with np.errstate(over='ignore'):
+        narrow = values.astype(np.float32)
+    return (np.array_equal(narrow.astype(np.float64), values)
+            and np.array_equal(narrow.astype(str).astype(np.float64), values))
+
+
+def _column_memory(series):
+    """Sütunun bellekteki boyutu (byte); category -> kodlar + kategori değerleri"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().nbytes + _column_memory(pd.Series(series.cat.categories))
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def _memory_report(columns, before, after):
+    """Phase 6 öncesi/sonrası sütun bazlı bellek satırları"""
+    lines = [f"[MEMORY] '{col}': {before[col] / 1024:.1f} KB -> {after[col] / 1024:.1f} KB"
+             for col in columns]
+    total_before = sum(before[col] for col in columns)
+    total_after = sum(after[col] for col in columns)
+    ratio = total_after / total_before * 100 if total_before else 0
+    lines.append(f"[MEMORY] Toplam: {total_before / 1024:.1f} KB -> {total_after / 1024:.1f} KB (%{ratio:.1f})")
+    return lines
+
+
+# ============================================================================
+# ARROW SNAPSHOT (load_data.py'nin tipli, memory-map'lenebilir girdisi)
+# ============================================================================
+
+# Sayı olarak gelen ama kod / etiket gibi (EAV'de string) saklanan sütunlar
+STRING_CODE_COLUMNS = ['job_number', 'press', 'unit_number', 'plating_tank']
+
+# Şema metadata'sındaki sınıflandırma anahtarı (load_data.py ile aynı)
+SNAPSHOT_METADATA_KEY = b'cylinder_bands'
+
+
+def classify_columns(df):
+    """EAV sınıflandırması -> (string_cols, numeric_cols); timestamp runs tablosunda"""
+    string_cols = []
+    numeric_cols = []
+    for col in df.columns:
+        if col == 'timestamp':
+            continue
+        dtype = df[col].dtype
+        if (col in STRING_CODE_COLUMNS or pd.api.types.is_bool_dtype(dtype)
+                or not pd.api.types.is_numeric_dtype(dtype)):
+            string_cols.append(col)
+        else:
+            numeric_cols.append(col)
+    return string_cols, numeric_cols
+
+
+def snapshot_path(output_csv):
+    """cleaned_cylinder.csv -> cleaned_cylinder.arrow"""
+    return os.path.splitext(output_csv)[0] + '.arrow'
+
+
+def snapshot_schema(df, input_file):
+    """DataFrame'in Arrow şeması + gömülü sınıflandırma (metin sütunları her zaman string)"""
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    for col in df.select_dtypes(include=['object']).columns:
+        schema = schema.set(schema.get_field_index(col), pa.field(col, pa.string()))
+
+    string_cols, numeric_cols = classify_columns(df)
+    metadata = dict(schema.metadata or {})
+    metadata[SNAPSHOT_METADATA_KEY] = json.dumps({
+        'source': str(input_file),
+        'string_cols': string_cols,
+        'numeric_cols': numeric_cols,
+    }).encode('utf-8')
+    return schema.with_metadata(metadata)
+
+
+def write_snapshot_batch(writer, schema, df):
+    """Sıkıştırmasız Arrow IPC -> okuyucu memory-map ile zero-copy açar"""
+    writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+
+
+def execute_senior_db_cleaning(input_file, output_csv, report_file, chunksize=None, timings=None):
     """
     Veritabanı yöneticisi perspektifiyle 1NF hazırlık ve veri temizleme süreci.
+    chunksize verilirse dosya belleğe alınmadan iki geçişte temizlenir (aynı çıktı).
+    timings dict'i verilirse phase başına süreler (sn) yazılır.
     """
+    if chunksize:
+        return execute_streaming_cleaning(input_file, output_csv, report_file, chunksize, timings)
+
     # Veriyi Yükle
+    clock = PhaseClock(timings)
     df = pd.read_csv(input_file)
     report = [
         "SENIOR DATABASE MANAGER - VERI TEMIZLEME VE ŞEMA OPTIMIZASYON RAPORU",
@@ -17,23 +302,27 @@ def execute_senior_db_cleaning(input_file, output_csv, report_file):
         "-"*70,
         ""
     ]
+    clock.lap('read_csv')
 
     # PHASE 1: STANDART NULL YÖNETIMI
     initial_null_placeholders = (df == '?').sum().sum()
     df.replace('?', np.nan, inplace=True)
     report.append(f"[NULL_MGT] {initial_null_placeholders} adet '?' karakteri NaN yapıldı.")
+    clock.lap('phase1_nulls')
 
     # PHASE 2: ZAMANSAL VERI DÖNÜŞÜMÜ
     if 'timestamp' in df.columns:
         # YYYYMMDD formatından Date formatına
         df['timestamp'] = pd.to_datetime(df['timestamp'], format='%Y%m%d', errors='coerce')
         report.append("[SCHEMA] 'timestamp' sütunu Integer -> Date (YYYY-MM-DD) formatına çevrildi.")
+    clock.lap('phase2_timestamp')
 
     # PHASE 3: SABİT (CONSTANT) SÜTUNLARIN ELENMESİ
     constant_cols = [col for col in df.columns if df[col].nunique(dropna=True) <= 1]
     if constant_cols:
         df.drop(columns=constant_cols, inplace=True)
         report.append(f"[SCHEMA] Varyasyon içermeyen sabit sütunlar silindi: {constant_cols}")
+    clock.lap('phase3_constants')
 
     # PHASE 4: METİN NORMALİZASYONU
     object_cols = df.select_dtypes(include=['object']).columns
@@ -41,68 +330,519 @@ def execute_senior_db_cleaning(input_file, output_csv, report_file):
         df[col] = df[col].astype(str).str.lower().str.strip()
     df.replace('nan', np.nan, inplace=True) # string dönüşümü sonrası oluşan 'nan'ları düzelt
     report.append("[TEXT_NORM] Tüm metinler küçük harfe çevrildi ve boşluklar temizlendi.")
+    clock.lap('phase4_text')
 
     # PHASE 5: ODAKLANMIŞ TYPO DÜZELTME (Sadece Customer)
     if 'customer' in df.columns:
         report.append("[TYPO_CLEAN] 'customer' sütunu üzerinde Fuzzy Matching çalıştırılıyor...")
         counts = df['customer'].value_counts()
-        unique_customers = counts.index.tolist()
-        replacements = {}
         
-        for i, val in enumerate(unique_customers):
-            if val in replacements.values() or pd.isna(val): continue
-            
-            # %85 benzerlik eşiği ile hataları yakala
-            matches = difflib.get_close_matches(val, unique_customers[i+1:], n=5, cutoff=0.85)
-            for match in matches:
-                if counts[val] > counts[match]: # Sık kullanılan doğru kabul edilir
-                    replacements[match] = val
-                    report.append(f"  - Typo Düzeltildi: '{match}' -> '{val}'")
+        # %85 benzerlik eşiği ile hataları yakala (blocking ile, tüm çiftler değil)
+        replacements, typo_report = find_fuzzy_replacements(counts, cutoff=0.85, n=5)
+        report.extend(typo_report)
         
         if replacements:
             df['customer'] = df['customer'].replace(replacements)
+    clock.lap('phase5_typos')
 
-    # PHASE 6: VERİ TİPİ OPTİMİZASYONU (Schema Management)
+    # PHASE 6: VERİ TİPİ OPTİMİZASYONU (Schema Management) - vektörel, en dar tipler
+    memory_before = {col: _column_memory(df[col]) for col in df.columns}
     for col in df.columns:
-        # A. Metin olarak kalmış sayısal sütunları zorla
+        # A. Metin olarak kalmış sayısal sütunları zorla (sadece farklı değerler parse edilir)
         if df[col].dtype == 'object':
-            converted = pd.to_numeric(df[col], errors='coerce')
-            if converted.notnull().sum() / len(df) > 0.5:
-                df[col] = converted
+            if _numeric_parse_count(df[col]) / len(df) > 0.5:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
                 report.append(f"[SCHEMA] '{col}' sütunu sayısal tipe (Float) zorlandı.")
 
-        # B. Ondalıksız Floatları Integer'a Çevir (Bellek ve SQL Uyumu)
+        # B. Ondalıksız Floatları en dar Nullable Integer'a, diğerlerini kayıpsızsa float32'ye
         if df[col].dtype == 'float64':
-            non_null = df[col].dropna()
-            if len(non_null) > 0 and all(x.is_integer() for x in non_null):
-                df[col] = df[col].astype('Int64')
-                report.append(f"[OPTIMIZE] '{col}' sütunu Float -> Nullable Integer (Int64) yapıldı.")
+            values = df[col].to_numpy()
+            non_null = values[~np.isnan(values)]
+            if len(non_null) > 0 and _all_integral(non_null):
+                dtype = _narrowest_int_dtype(non_null.min(), non_null.max(), nullable=True)
+                df[col] = df[col].astype(dtype)
+                report.append(f"[OPTIMIZE] '{col}' sütunu Float -> Nullable Integer ({dtype}) yapıldı.")
+            elif len(non_null) > 0 and _float32_safe(non_null):
+                df[col] = df[col].astype('float32')
+                report.append(f"[OPTIMIZE] '{col}' sütunu float64 -> float32 yapıldı.")
+
+        # Integer sütunları daralt
+        elif df[col].dtype == 'int64' and len(df) > 0:
+            values = df[col].to_numpy()
+            dtype = _narrowest_int_dtype(values.min(), values.max())
+            if dtype != 'int64':
+                df[col] = df[col].astype(dtype)
+                report.append(f"[OPTIMIZE] '{col}' sütunu int64 -> {dtype} yapıldı.")
 
     # C. Binary Standardizasyonu (yes/no -> Boolean)
-    binary_map = {'yes': True, 'no': False, 'true': True, 'false': False}
     for col in df.select_dtypes(include=['object']).columns:
         unique_vals = set(df[col].dropna().unique())
-        if unique_vals.issubset(set(binary_map.keys())) and len(unique_vals) > 0:
-            df[col] = df[col].map(binary_map).astype('boolean')
+        if unique_vals.issubset(set(BINARY_MAP.keys())) and len(unique_vals) > 0:
+            df[col] = df[col].map(BINARY_MAP).astype('boolean')
             report.append(f"[SCHEMA] '{col}' sütunu Boolean tipine sabitlendi.")
 
+    # D. Düşük kardinaliteli metin sütunları -> category
+    for col in df.select_dtypes(include=['object']).columns:
+        unique_count = df[col].nunique(dropna=True)
+        if 0 < unique_count <= CATEGORY_MAX_UNIQUE and unique_count / len(df) <= CATEGORY_MAX_RATIO:
+            df[col] = df[col].astype('category')
+            report.append(f"[OPTIMIZE] '{col}' sütunu object -> category ({unique_count} değer) yapıldı.")
+
+    memory_after = {col: _column_memory(df[col]) for col in df.columns}
+    report.extend(_memory_report(df.columns, memory_before, memory_after))
+    clock.lap('phase6_types')
+
     # PHASE 7: MÜKERRER KAYIT TEMİZLİĞİ (Deduplication)
     initial_count = len(df)
     df.drop_duplicates(inplace=True)
     if len(df) != initial_count:
         report.append(f"[CLEANUP] {initial_count - len(df)} adet mükerrer satır silindi.")
+    clock.lap('phase7_dedup')
 
     # PHASE 8: ÇIKTI VE RAPORLAMA
     df.to_csv(output_csv, index=False)
+    if pa is not None:
+        arrow_path = snapshot_path(output_csv)
+        schema = snapshot_schema(df, input_file)
+        with pa.ipc.new_file(arrow_path, schema) as writer:
+            write_snapshot_batch(writer, schema, df)
+        report.append(f"[SNAPSHOT] Tipli Arrow snapshot yazıldı: {arrow_path}")
     report.append("\n" + "="*70)
     report.append(f"FINAL ÖZET:")
     report.append(f"Son Satır Sayısı: {len(df)}")
     report.append(f"Son Sütun Sayısı: {len(df.columns)}")
     
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write("\n".join(report))
+    clock.lap('phase8_output')
+
+    return "İşlem başarıyla tamamlandı. Dosyalar: cleaned_cylinder.csv, cleaning_report.txt"
+
+# ============================================================================
+# STREAMING MOD: İKİ GEÇİŞ (çok GB'lık press log'ları, sınırlı bellek)
+# ============================================================================
+# 1. geçiş: chunk chunk sütun istatistikleri (read_csv'nin çıkaracağı tip,
+#    sabit sütun sketch'i, sayıya çevrilebilme oranı, tam sayılık, customer
+#    sözlüğü). 2. geçiş: kararlar chunk chunk uygulanır, satır hash'i ile
+#    chunk'lar arası mükerrer temizliği yapılıp çıktı parça parça yazılır.
+
+DEFAULT_CHUNKSIZE = 100000
+
+# read_csv'nin bool olarak çıkardığı değerler
+BOOL_STRINGS = {'True': True, 'TRUE': True, 'true': True,
+                'False': False, 'FALSE': False, 'false': False}
+
+READ_DTYPES = {'int': 'int64', 'float': 'float64', 'bool': 'bool', 'object': object}
+
+
+def _add_distinct(distinct, values, limit=2):
+    """nunique(dropna=True) <= 1 kararı için en fazla `limit` farklı değer tut"""
+    if len(distinct) >= limit:
+        return
+    for value in pd.unique(values.dropna()):
+        distinct.add(value)
+        if len(distinct) >= limit:
+            return
+
+
+def _normalize_text(values):
+    """Phase 4: küçük harf + strip, string dönüşümünden gelen 'nan' -> NaN"""
+    return values.astype(str).str.lower().str.strip().replace('nan', np.nan)
+
+
+def _new_column_stats():
+    return {
+        'question': 0,           # '?' sayısı
+        'non_null': 0,           # ham NaN olmayan değer sayısı
+        'parsed': 0,             # ham değerlerden sayıya çevrilebilen
+        'all_int': True,         # read_csv -> int64 olur mu
+        'all_bool': True,        # read_csv -> bool olur mu
+        'raw_distinct': set(),   # Phase 3 sketch'leri (yoruma göre)
+        'num_distinct': set(),
+        'bool_distinct': set(),
+        'num_integral': True,    # sayısal yorum: tam sayılık, aralık, float32'ye inebilirlik
+        'num_min': None,
+        'num_max': None,
+        'num_f32': True,
+        'norm_parsed': 0,        # Phase 4 sonrası sayıya çevrilebilen
+        'norm_all_int': True,
+        'norm_integral': True,
+        'norm_min': None,
+        'norm_max': None,
+        'norm_f32': True,
+        'norm_values': set(),    # binary kontrolü için (binary olmayan görülünce durur)
+        'norm_binary': True,
+        'norm_distinct': set(),  # category kararı için (en fazla CATEGORY_MAX_UNIQUE + 1)
+    }
+
+
+def _update_numeric_stats(col_stats, prefix, converted):
+    """Sayıya çevrilmiş değerlerin tam sayılık / aralık / float32 istatistiklerini güncelle"""
+    values = converted.to_numpy()
+    if values.dtype.kind == 'f':
+        values = values[~np.isnan(values)]
+        if col_stats[f'{prefix}_integral']:
+            col_stats[f'{prefix}_integral'] = _all_integral(values)
+        if col_stats[f'{prefix}_f32'] and not col_stats[f'{prefix}_integral']:
+            col_stats[f'{prefix}_f32'] = _float32_safe(values)
+    if len(values):
+        low, high = values.min(), values.max()
+        if col_stats[f'{prefix}_min'] is None or low < col_stats[f'{prefix}_min']:
+            col_stats[f'{prefix}_min'] = low
+        if col_stats[f'{prefix}_max'] is None or high > col_stats[f'{prefix}_max']:
+            col_stats[f'{prefix}_max'] = high
+
+
+def scan_column_statistics(input_file, chunksize=DEFAULT_CHUNKSIZE):
+    """1. geçiş: tüm dosyayı string olarak chunk chunk oku, sütun istatistiklerini topla"""
+    stats = {}
+    vocabulary = {}  # normalize customer -> sayı (ilk görülme sırasıyla)
+    time_distinct = {'str': set(), 'num': set()}
+    total_rows = 0
+    columns = None
+
+    for chunk in pd.read_csv(input_file, dtype=str, chunksize=chunksize):
+        if columns is None:
+            columns = chunk.columns.tolist()
+            stats = {col: _new_column_stats() for col in columns}
+        total_rows += len(chunk)
+
+        for col in columns:
+            raw = chunk[col]
+            col_stats = stats[col]
+            non_null = int(raw.notna().sum())
+
+            col_stats['non_null'] += non_null
+            col_stats['question'] += int((raw == '?').sum())
+            if non_null < len(raw) or not raw.isin(BOOL_STRINGS.keys()).all():
+                col_stats['all_bool'] = False
+            else:
+                _add_distinct(col_stats['bool_distinct'], raw.map(BOOL_STRINGS))
+
+            # Sayısal yorum (read_csv int64 / float64 çıkarırsa)
+            converted = pd.to_numeric(raw, errors='coerce')
+            col_stats['parsed'] += int(converted.notna().sum())
+            if converted.dtype.kind not in 'iu':
+                col_stats['all_int'] = False
+            _add_distinct(col_stats['num_distinct'], converted)
+            _update_numeric_stats(col_stats, 'num', converted)
+
+            # Object yorumu: Phase 1 ('?' -> NaN) sonrası
+            values = raw.where(raw != '?')
+            _add_distinct(col_stats['raw_distinct'], values)
+
+            if col == 'timestamp':
+                _add_distinct(time_distinct['str'], pd.to_datetime(values, format='%Y%m%d', errors='coerce'))
+                _add_distinct(time_distinct['num'], pd.to_datetime(converted, format='%Y%m%d', errors='coerce'))
+                continue
+
+            # Phase 4 sonrası değerler
+            normalized = _normalize_text(values)
+            if col == 'customer':
+                for value, count in normalized.value_counts(sort=False).items():
+                    vocabulary[value] = vocabulary.get(value, 0) + int(count)
+                continue
+
+            norm_converted = pd.to_numeric(normalized, errors='coerce')
+            col_stats['norm_parsed'] += int(norm_converted.notna().sum())
+            if norm_converted.dtype.kind not in 'iu':
+                col_stats['norm_all_int'] = False
+            _update_numeric_stats(col_stats, 'norm', norm_converted)
+            _add_distinct(col_stats['norm_distinct'], normalized, limit=CATEGORY_MAX_UNIQUE + 1)
+            if col_stats['norm_binary']:
+                uniques = set(normalized.dropna().unique())
+                if uniques.issubset(BINARY_MAP.keys()):
+                    col_stats['norm_values'] |= uniques
+                else:
+                    col_stats['norm_binary'] = False
+
+    return {
+        'columns': columns or [],
+        'total_rows': total_rows,
+        'stats': stats,
+        'vocabulary': vocabulary,
+        'time_distinct': time_distinct,
+    }
+
+
+def _column_kind(col_stats, total_rows):
+    """read_csv'nin tüm dosyada bu sütun için çıkaracağı tip"""
+    if col_stats['all_bool'] and col_stats['non_null'] == total_rows and total_rows > 0:
+        return 'bool'
+    if col_stats['all_int'] and total_rows > 0:
+        return 'int'
+    if col_stats['parsed'] == col_stats['non_null']:
+        return 'float'
+    return 'object'
+
+
+def _customer_statistics(vocabulary, replacements, total_rows):
+    """customer sütununun Phase 5 (typo düzeltme) sonrası Phase 6 istatistikleri"""
+    mapped = pd.Series([replacements.get(value, value) for value in vocabulary], dtype=object)
+    weights = np.array(list(vocabulary.values()), dtype=np.int64)
+    converted = pd.to_numeric(mapped, errors='coerce')
+    parsed = converted.notna().to_numpy()
+    has_null = total_rows > int(weights.sum())
+    uniques = set(mapped.dropna())
+    customer_stats = {
+        'norm_parsed': int(weights[parsed].sum()),
+        'norm_all_int': converted.dtype.kind in 'iu' and not has_null,
+        'norm_integral': True,
+        'norm_min': None,
+        'norm_max': None,
+        'norm_f32': True,
+        'norm_values': uniques,
+        'norm_binary': uniques.issubset(BINARY_MAP.keys()),
+        'norm_distinct': uniques,
+    }
+    _update_numeric_stats(customer_stats, 'norm', converted)
+    return customer_stats
+
+
+def plan_cleaning(scan):
+    """1. geçiş istatistiklerinden in-memory yolun alacağı kararları ve rapor satırlarını çıkar"""
+    columns = scan['columns']
+    total_rows = scan['total_rows']
+    stats = scan['stats']
+    kinds = {col: _column_kind(stats[col], total_rows) for col in columns}
+    report = []
+
+    # PHASE 1
+    question_marks = sum(col_stats['question'] for col_stats in stats.values())
+    report.append(f"[NULL_MGT] {question_marks} adet '?' karakteri NaN yapıldı.")
+
+    # PHASE 2
+    if 'timestamp' in columns:
+        report.append("[SCHEMA] 'timestamp' sütunu Integer -> Date (YYYY-MM-DD) formatına çevrildi.")
+
+    # PHASE 3
+    def distinct_count(col):
+        if col == 'timestamp':
+            return len(scan['time_distinct']['str' if kinds[col] == 'object' else 'num'])
+        sketch = {'object': 'raw_distinct', 'bool': 'bool_distinct'}.get(kinds[col], 'num_distinct')
+        return len(stats[col][sketch])
+
+    constant_cols = [col for col in columns if distinct_count(col) <= 1]
+    if constant_cols:
+        report.append(f"[SCHEMA] Varyasyon içermeyen sabit sütunlar silindi: {constant_cols}")
+    kept = [col for col in columns if col not in constant_cols]
+
+    # PHASE 4
+    text_cols = [col for col in kept if kinds[col] == 'object' and col != 'timestamp']
+    report.append("[TEXT_NORM] Tüm metinler küçük harfe çevrildi ve boşluklar temizlendi.")
+
+    # PHASE 5
+    replacements = {}
+    if 'customer' in kept:
+        report.append("[TYPO_CLEAN] 'customer' sütunu üzerinde Fuzzy Matching çalıştırılıyor...")
+        counts = pd.Series(scan['vocabulary'], dtype=np.int64).sort_values(ascending=False)
+        replacements, typo_report = find_fuzzy_replacements(counts, cutoff=0.85, n=5)
+        report.extend(typo_report)
+        stats['customer'].update(_customer_statistics(scan['vocabulary'], replacements, total_rows))
+
+    # PHASE 6
+    numeric_cols = {}   # sütun -> 'int64' | 'float64' (A)
+    casts = {}          # sütun -> en dar tip (B / integer daraltma)
+    for col in kept:
+        if col == 'timestamp':
+            continue
+        col_stats = stats[col]
+        if col in text_cols and total_rows and col_stats['norm_parsed'] / total_rows > 0.5:
+            numeric_cols[col] = 'int64' if col_stats['norm_all_int'] else 'float64'
+            report.append(f"[SCHEMA] '{col}' sütunu sayısal tipe (Float) zorlandı.")
+            dtype, prefix, non_null = numeric_cols[col], 'norm', col_stats['norm_parsed']
+        elif kinds[col] in ('int', 'float'):
+            dtype, prefix, non_null = READ_DTYPES[kinds[col]], 'num', col_stats['non_null']
+        else:
+            continue
+
+        low, high = col_stats[f'{prefix}_min'], col_stats[f'{prefix}_max']
+        if dtype == 'float64' and non_null > 0:
+            if col_stats[f'{prefix}_integral']:
+                casts[col] = _narrowest_int_dtype(low, high, nullable=True)
+                report.append(f"[OPTIMIZE] '{col}' sütunu Float -> Nullable Integer ({casts[col]}) yapıldı.")
+            elif col_stats[f'{prefix}_f32']:
+                casts[col] = 'float32'
+                report.append(f"[OPTIMIZE] '{col}' sütunu float64 -> float32 yapıldı.")
+        elif dtype == 'int64' and total_rows > 0:
+            narrow = _narrowest_int_dtype(low, high)
+            if narrow != 'int64':
+                casts[col] = narrow
+                report.append(f"[OPTIMIZE] '{col}' sütunu int64 -> {narrow} yapıldı.")
+
+    boolean_cols = []
+    for col in text_cols:
+        col_stats = stats[col]
+        if col not in numeric_cols and col_stats['norm_binary'] and col_stats['norm_values']:
+            boolean_cols.append(col)
+            report.append(f"[SCHEMA] '{col}' sütunu Boolean tipine sabitlendi.")
+
+    category_cols = {}  # sütun -> CategoricalDtype (in-memory astype('category') ile aynı sıralı kategoriler)
+    for col in text_cols:
+        if col in numeric_cols or col in boolean_cols:
+            continue
+        unique_count = len(stats[col]['norm_distinct'])
+        if 0 < unique_count <= CATEGORY_MAX_UNIQUE and unique_count / total_rows <= CATEGORY_MAX_RATIO:
+            category_cols[col] = pd.CategoricalDtype(sorted(stats[col]['norm_distinct']))
+            report.append(f"[OPTIMIZE] '{col}' sütunu object -> category ({unique_count} değer) yapıldı.")
+
+    return {
+        'columns': columns,
+        'total_rows': total_rows,
+        'dtypes': {col: READ_DTYPES[kinds[col]] for col in columns},
+        'constant_cols': constant_cols,
+        'output_columns': kept,
+        'text_cols': text_cols,
+        'replacements': replacements,
+        'numeric_cols': numeric_cols,
+        'casts': casts,
+        'boolean_cols': boolean_cols,
+        'category_cols': category_cols,
+        'report': report,
+    }
+
+
+def apply_cleaning_plan(chunk, plan, memory=None):
+    """2. geçiş: tek chunk'a Phase 1-6 kararlarını uygula
+
+    memory verilirse Phase 6 öncesi/sonrası sütun bellekleri ('before' / 'after') biriktirilir;
+    category sütunlarında sadece kodlar sayılır (kategori değerleri bir kez eklenir).
+    """
+    chunk = chunk.replace('?', np.nan)
+    if 'timestamp' in chunk.columns:
+        chunk['timestamp'] = pd.to_datetime(chunk['timestamp'], format='%Y%m%d', errors='coerce')
+    chunk = chunk.drop(columns=plan['constant_cols'])
+
+    for col in plan['text_cols']:
+        chunk[col] = chunk[col].astype(str).str.lower().str.strip()
+    chunk = chunk.replace('nan', np.nan)
+    # Tamamı NaN olan chunk'ta replace sütunu float'a indirebilir; hash'ler tutarlı kalsın
+    chunk[plan['text_cols']] = chunk[plan['text_cols']].astype(object)
+
+    if plan['replacements']:
+        chunk['customer'] = chunk['customer'].replace(plan['replacements'])
+
+    if memory is not None:
+        for col in chunk.columns:
+            memory['before'][col] += _column_memory(chunk[col])
+
+    for col, dtype in plan['numeric_cols'].items():
+        chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype(dtype)
+    for col, dtype in plan['casts'].items():
+        chunk[col] = chunk[col].astype(dtype)
+    for col in plan['boolean_cols']:
+        chunk[col] = chunk[col].map(BINARY_MAP).astype('boolean')
+    for col, dtype in plan['category_cols'].items():
+        chunk[col] = chunk[col].astype(dtype)
+
+    if memory is not None:
+        for col in chunk.columns:
+            if col in plan['category_cols']:
+                memory['after'][col] += chunk[col].cat.codes.to_numpy().nbytes
+            else:
+                memory['after'][col] += _column_memory(chunk[col])
+    return chunk
+
+
+def _row_hashes(chunk):
+    """Satır hash'i (chunk'lar arası tutarlı; -0.0 ve 0.0 drop_duplicates'teki gibi eşit)"""
+    float_cols = chunk.select_dtypes(include=['float']).columns
+    if len(float_cols):
+        chunk = chunk.copy()
+        chunk[float_cols] = chunk[float_cols] + 0.0
+    return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+
+def execute_streaming_cleaning(input_file, output_csv, report_file, chunksize=DEFAULT_CHUNKSIZE,
+                               timings=None):
+    """execute_senior_db_cleaning'in iki geçişli, sınırlı bellekli karşılığı
+
+    Bellekte aynı anda bir chunk + satır başına 8 byte'lık hash kümesi tutulur.
+    """
+    clock = PhaseClock(timings)
+    print(f"📊 1. geçiş: sütun istatistikleri toplanıyor ({chunksize} satırlık chunk'lar)...")
+    scan = scan_column_statistics(input_file, chunksize)
+    clock.lap('scan')
+    plan = plan_cleaning(scan)
+    clock.lap('plan')
+
+    report = [
+        "SENIOR DATABASE MANAGER - VERI TEMIZLEME VE ŞEMA OPTIMIZASYON RAPORU",
+        "="*70,
+        f"Girdi Dosyası: {input_file}",
+        f"Başlangıç Satır Sayısı: {scan['total_rows']}",
+        f"Başlangıç Sütun Sayısı: {len(scan['columns'])}",
+        "-"*70,
+        ""
+    ]
+    report.extend(plan['report'])
+
+    # PHASE 7-8: chunk chunk uygula, hash ile mükerrer temizle, parça parça yaz
+    print("📝 2. geçiş: dönüşümler uygulanıyor ve çıktı yazılıyor...")
+    seen = set()
+    memory = {'before': dict.fromkeys(plan['output_columns'], 0),
+              'after': dict.fromkeys(plan['output_columns'], 0)}
+    written = 0
+    header = True
+    writer = schema = None
+    reader = pd.read_csv(input_file, dtype=plan['dtypes'], chunksize=chunksize) if scan['total_rows'] else []
+    for chunk in reader:
+        clock.lap('read_csv')
+        chunk = apply_cleaning_plan(chunk, plan, memory)
+        clock.lap('apply_plan')
+
+        keep = np.zeros(len(chunk), dtype=bool)
+        for position, row_hash in enumerate(_row_hashes(chunk).tolist()):
+            if row_hash not in seen:
+                seen.add(row_hash)
+                keep[position] = True
+        chunk = chunk[keep]
+        clock.lap('phase7_dedup')
+
+        chunk.to_csv(output_csv, index=False, mode='w' if header else 'a', header=header)
+        if pa is not None:
+            if writer is None:
+                schema = snapshot_schema(chunk, input_file)
+                writer = pa.ipc.new_file(snapshot_path(output_csv), schema)
+            write_snapshot_batch(writer, schema, chunk)
+        header = False
+        written += len(chunk)
+        clock.lap('phase8_output')
+
+    if header:
+        pd.DataFrame(columns=plan['output_columns']).to_csv(output_csv, index=False)
+    if writer is not None:
+        writer.close()
+
+    for col, dtype in plan['category_cols'].items():
+        memory['after'][col] += _column_memory(pd.Series(dtype.categories))
+    report.extend(_memory_report(plan['output_columns'], memory['before'], memory['after']))
+
+    duplicates = scan['total_rows'] - written
+    if duplicates:
+        report.append(f"[CLEANUP] {duplicates} adet mükerrer satır silindi.")
+
+    if writer is not None:
+        report.append(f"[SNAPSHOT] Tipli Arrow snapshot yazıldı: {snapshot_path(output_csv)}")
+
+    report.append("\n" + "="*70)
+    report.append(f"FINAL ÖZET:")
+    report.append(f"Son Satır Sayısı: {written}")
+    report.append(f"Son Sütun Sayısı: {len(plan['output_columns'])}")
+
     with open(report_file, 'w', encoding='utf-8') as f:
         f.write("\n".join(report))
 
     return "İşlem başarıyla tamamlandı. Dosyalar: cleaned_cylinder.csv, cleaning_report.txt"
 
+
 # Kodu Çalıştır
-print(execute_senior_db_cleaning('cylinder.csv', 'cleaned_cylinder.csv', 'cleaning_report.txt'))
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Cylinder Bands veri temizleme')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Verilirse dosya belleğe alınmadan bu boyutta chunk\'larla (iki geçiş) temizlenir')
+    args = parser.parse_args()
+    print(execute_senior_db_cleaning('cylinder.csv', 'cleaned_cylinder.csv', 'cleaning_report.txt',
+                                     chunksize=args.chunksize))
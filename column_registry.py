@@ -0,0 +1,66 @@
+"""
+CYLINDER BANDS DATABASE - COLUMN METADATA REGISTRY
+column_name -> stringcol_id / numericcol_id çözümlemesi Python tarafında;
+sorgular stringcols / numericcols tablolarına join yerine id bağlar
+"""
+
+from versioned_cache import VersionedCache
+
+
+class ColumnRegistry(VersionedCache):
+    """Process genelinde tek metadata önbelleği
+
+    İlk kullanımda yüklenir; load_state.schema_version değiştiyse (loader yeni sütun
+    eklediyse) yeniden yüklenir.
+    """
+
+    version_key = 'schema_version'
+
+    def __init__(self, check_interval=30.0, poll=None):
+        super().__init__(check_interval, poll)
+        self._string_ids = {}
+        self._numeric_ids = {}
+        self._string_names = {}
+        self._numeric_names = {}
+
+    def load(self, connection, schema_version=None):
+        """Metadata tablolarını oku"""
+        self.reload(connection, schema_version)
+
+    def refresh(self, connection, schema_version):
+        cursor = connection.cursor()
+        cursor.execute("SELECT stringcol_id, column_name FROM stringcols")
+        string_ids = {name: col_id for col_id, name in cursor.fetchall()}
+        cursor.execute("SELECT numericcol_id, column_name FROM numericcols")
+        numeric_ids = {name: col_id for col_id, name in cursor.fetchall()}
+        cursor.close()
+
+        with self._lock:
+            self._string_ids = string_ids
+            self._numeric_ids = numeric_ids
+            self._string_names = {col_id: name for name, col_id in string_ids.items()}
+            self._numeric_names = {col_id: name for name, col_id in numeric_ids.items()}
+
+    @property
+    def schema_version(self):
+        return self._version
+
+    def string_id(self, column_name):
+        """String sütun id'si (bilinmiyorsa None)"""
+        return self._string_ids.get(column_name)
+
+    def numeric_id(self, column_name):
+        """Numeric sütun id'si (bilinmiyorsa None)"""
+        return self._numeric_ids.get(column_name)
+
+    def string_name(self, col_id):
+        return self._string_names.get(col_id)
+
+    def numeric_name(self, col_id):
+        return self._numeric_names.get(col_id)
+
+    def string_columns(self):
+        return sorted(self._string_ids)
+
+    def numeric_columns(self):
+        return sorted(self._numeric_ids)
@@ -0,0 +1,180 @@
+"""
+CYLINDER BANDS DATABASE - CONNECTION POOL
+Her istekte yeni TCP + auth handshake yerine tekrar kullanılan MySQL bağlantıları
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+
+
+class PoolTimeoutError(Exception):
+    """Havuzda timeout süresi içinde boş bağlantı bulunamadı"""
+
+
+class ConnectionPool:
+    """Boyut, bekleme süresi ve sağlık kontrolü ayarlanabilen bağlantı havuzu
+
+    - Bağlantılar ihtiyaç oldukça açılır (en fazla `size` adet)
+    - Havuz doluysa `timeout` saniye beklenir, sonra PoolTimeoutError
+    - `health_check_interval` saniyeden uzun boşta kalan bağlantı ping'lenir
+    """
+
+    # Sürücünün hata tipleri (alt sınıflar kendi sürücüsününkileri verir):
+    # errors -> ping / rollback / close'ta yakalanıp bağlantı atılır
+    # connection_errors -> istek içinde görülürse bağlantı havuza geri konmaz
+    errors = (mysql.connector.errors.Error,)
+    connection_errors = (mysql.connector.errors.OperationalError,
+                         mysql.connector.errors.InterfaceError)
+
+    def __init__(self, db_config, size=10, timeout=5.0, health_check_interval=30.0):
+        self.db_config = db_config
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = queue.LifoQueue(maxsize=size)  # (connection, son kullanım)
+        self._lock = threading.Lock()
+        self._created = 0
+
+        # Metrikler
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._health_check_failures = 0
+        self._discarded = 0
+
+    def _open(self):
+        return mysql.connector.connect(**self.db_config)
+
+    def _acquire(self):
+        """Boş bağlantı al; yoksa yeni aç; limit dolduysa bekle"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return self._open(), time.monotonic()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        # Havuz dolu -> bekle
+        wait_start = time.perf_counter()
+        try:
+            item = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._waits += 1
+                self._timeouts += 1
+            raise PoolTimeoutError(
+                f"{self.timeout} sn içinde boş bağlantı bulunamadı (size={self.size})"
+            )
+        waited = time.perf_counter() - wait_start
+        with self._lock:
+            self._waits += 1
+            self._wait_time += waited
+            self._max_wait = max(self._max_wait, waited)
+        return item
+
+    def _health_check(self, connection, last_used):
+        """Uzun süre boşta kalan bağlantıyı kontrol et, kopmuşsa yeniden bağlan"""
+        if time.monotonic() - last_used < self.health_check_interval:
+            return connection
+        try:
+            connection.ping(reconnect=True, attempts=2, delay=0)
+            return connection
+        except self.errors:
+            with self._lock:
+                self._health_check_failures += 1
+            self._discard(connection)
+            with self._lock:
+                self._created += 1
+            return self._open()
+
+    def _discard(self, connection):
+        with self._lock:
+            self._created -= 1
+            self._discarded += 1
+        try:
+            connection.close()
+        except self.errors:
+            pass
+
+    def _release(self, connection, broken=False):
+        if broken:
+            self._discard(connection)
+            return
+        try:
+            # Açık transaction başka isteğe taşınmasın
+            connection.rollback()
+        except self.errors:
+            self._discard(connection)
+            return
+        self._idle.put((connection, time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        """with pool.connection() as connection: ... -> çıkışta havuza geri döner"""
+        connection, last_used = self._acquire()
+        try:
+            connection = self._health_check(connection, last_used)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+        broken = False
+        try:
+            yield connection
+        except self.connection_errors:
+            # Bağlantı seviyesinde hata -> bağlantıyı havuza geri koyma
+            broken = True
+            raise
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._release(connection, broken=broken)
+
+    def metrics(self):
+        """Havuz metrikleri (in-use, bekleme sayısı, bekleme süresi...)"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': self._created,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time_total_ms': round(self._wait_time * 1000, 3),
+                'wait_time_avg_ms': round(self._wait_time / self._waits * 1000, 3) if self._waits else 0.0,
+                'wait_time_max_ms': round(self._max_wait * 1000, 3),
+                'timeouts': self._timeouts,
+                'health_check_failures': self._health_check_failures,
+                'discarded': self._discarded,
+            }
+
+    def close_all(self):
+        """Boştaki tüm bağlantıları kapat"""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
@@ -0,0 +1,623 @@
+"""
+CYLINDER BANDS DATABASE - BITMAP FACET INDEX
+/runs filtreleri için bellek içi index: her (string nitelik, değer) çifti = string_code
+için sıkıştırılmış run_id bitmap'i, numeric nitelikler ve timestamp için sıralı diziler.
+Çok nitelikli filtre = bitmap kesişimi; facet sayıları = kesişim kardinalitesi.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from string_dictionary import fetch_dictionary
+from versioned_cache import VersionedCache
+
+
+# Roaring düzeni: run_id'nin üst bitleri kap (chunk) seçer, alt 16 biti kap içinde saklanır
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+LOW_MASK = CHUNK_SIZE - 1
+ARRAY_LIMIT = 4096  # bu kadar elemana kadar sıralı uint16 dizi, üstünde 1024 x uint64 bitmap (8 KB)
+
+LOOKUP_BATCH_SIZE = 1000   # WHERE run_id IN (...) başına anahtar sayısı
+REBUILD_FRACTION = 0.25    # değişen run oranı bunu geçerse incremental yerine tam kurulum
+HISTOGRAM_BUCKETS = 20     # numeric nitelik başına eşit derinlikli histogram kovası
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+# ============================================================================
+# KAP (CONTAINER) İŞLEMLERİ - uint16 dizi veya uint64 bitmap
+# ============================================================================
+
+def _is_bitmap(container):
+    return container.dtype == np.uint64
+
+
+def _popcount(words):
+    return int(_POPCOUNT[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def _to_bitmap(low):
+    bits = np.zeros(CHUNK_SIZE, dtype=bool)
+    bits[low] = True
+    return np.packbits(bits, bitorder='little').view(np.uint64)
+
+
+def _to_array(words):
+    return np.flatnonzero(np.unpackbits(words.view(np.uint8), bitorder='little')).astype(np.uint16)
+
+
+def _container(low):
+    """Sıralı, tekil alt bitler -> küçükse dizi, büyükse bitmap"""
+    return low if len(low) <= ARRAY_LIMIT else _to_bitmap(low)
+
+
+def _shrink(words):
+    """Bitmap seyrekleştiyse diziye çevir; boşsa None"""
+    count = _popcount(words)
+    if count == 0:
+        return None
+    return _to_array(words) if count <= ARRAY_LIMIT else words
+
+
+def _contains(words, low):
+    return ((words[low >> 6] >> (low & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+
+def _cardinality(container):
+    return _popcount(container) if _is_bitmap(container) else len(container)
+
+
+def _and(a, b):
+    if _is_bitmap(a) and _is_bitmap(b):
+        return _shrink(a & b)
+    if _is_bitmap(a):
+        a, b = b, a
+    low = a[_contains(b, a)] if _is_bitmap(b) else np.intersect1d(a, b, assume_unique=True)
+    return low if len(low) else None
+
+
+def _or(a, b):
+    if _is_bitmap(a) or _is_bitmap(b):
+        a = a if _is_bitmap(a) else _to_bitmap(a)
+        b = b if _is_bitmap(b) else _to_bitmap(b)
+        return a | b
+    return _container(np.union1d(a, b))
+
+
+def _andnot(a, b):
+    if _is_bitmap(a):
+        return _shrink(a & ~(b if _is_bitmap(b) else _to_bitmap(b)))
+    low = a[~_contains(b, a)] if _is_bitmap(b) else np.setdiff1d(a, b, assume_unique=True)
+    return low if len(low) else None
+
+
+# ============================================================================
+# SIKIŞTIRILMIŞ RUN_ID KÜMESİ
+# ============================================================================
+
+class RunBitmap:
+    """Roaring tarzı run_id kümesi: üst bit -> kap (değiştirilemez; işlemler yeni küme döner)"""
+
+    __slots__ = ('_chunks', '_len')
+
+    def __init__(self, chunks=None):
+        self._chunks = chunks or {}
+        self._len = None
+
+    @classmethod
+    def from_ids(cls, run_ids):
+        return cls.from_sorted(np.unique(np.asarray(run_ids, dtype=np.int64)))
+
+    @classmethod
+    def from_sorted(cls, ids):
+        """Sıralı, tekil int64 run_id'ler (çoğu değer tek kaba düşer -> bölme yok)"""
+        if not len(ids):
+            return cls()
+        if ids[0] >> CHUNK_BITS == ids[-1] >> CHUNK_BITS:
+            return cls({int(ids[0] >> CHUNK_BITS): _container((ids & LOW_MASK).astype(np.uint16))})
+        bounds = np.flatnonzero(np.diff(ids >> CHUNK_BITS)) + 1
+        return cls({int(part[0] >> CHUNK_BITS): _container((part & LOW_MASK).astype(np.uint16))
+                    for part in np.split(ids, bounds)})
+
+    def __len__(self):
+        if self._len is None:
+            self._len = sum(_cardinality(c) for c in self._chunks.values())
+        return self._len
+
+    def _combine(self, other, op, keys):
+        chunks = {}
+        for high in keys:
+            mine, theirs = self._chunks.get(high), other._chunks.get(high)
+            if theirs is None:
+                result = mine
+            elif mine is None:
+                result = theirs if op is _or else None
+            else:
+                result = op(mine, theirs)
+            if result is not None:
+                chunks[high] = result
+        return RunBitmap(chunks)
+
+    def __and__(self, other):
+        return self._combine(other, _and, self._chunks.keys() & other._chunks.keys())
+
+    def __or__(self, other):
+        return self._combine(other, _or, self._chunks.keys() | other._chunks.keys())
+
+    def __sub__(self, other):
+        if self._chunks.keys().isdisjoint(other._chunks.keys()):
+            return self
+        return self._combine(other, _andnot, self._chunks.keys())
+
+    def ids(self):
+        """Sıralı run_id dizisi (int64)"""
+        parts = []
+        for high in sorted(self._chunks):
+            container = self._chunks[high]
+            low = _to_array(container) if _is_bitmap(container) else container
+            parts.append((high << CHUNK_BITS) + low.astype(np.int64))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def to_mask(self, size):
+        """run_id ile indekslenen yoğun bool dizi (size = en büyük run_id + 1)"""
+        mask = np.zeros(size, dtype=bool)
+        for high, container in self._chunks.items():
+            start = high << CHUNK_BITS
+            if start >= size:
+                continue
+            if _is_bitmap(container):
+                bits = np.unpackbits(container.view(np.uint8), bitorder='little').astype(bool)
+                end = min(start + CHUNK_SIZE, size)
+                mask[start:end] |= bits[:end - start]
+            else:
+                low = start + container.astype(np.int64)
+                mask[low[low < size]] = True
+        return mask
+
+    @property
+    def nbytes(self):
+        return sum(c.nbytes for c in self._chunks.values())
+
+
+EMPTY = RunBitmap()
+
+
+def union(bitmaps):
+    result = EMPTY
+    for bitmap in bitmaps:
+        result = result | bitmap
+    return result
+
+
+# ============================================================================
+# FACET INDEX
+# ============================================================================
+
+class BitmapIndex:
+    """run_id kümeleri üzerinde facet index'i
+
+    - bitmaps: string_code -> RunBitmap ; values: col_id -> {string_code: değer}
+    - numerics: col_id -> ((değer, run_id) sıralı değerler float64, aynı sırada run_id'ler)
+      + eşit derinlikli histogramlar (ilk kullanımda, güncellemeye kadar)
+    - run_ids (sıralı) + timestamps + row_hashes (incremental güncelleme için)
+    İşlemler yeni kopya üzerinde yapılır; okuyan istekler eski nesneyi görmeye devam eder.
+    """
+
+    def __init__(self):
+        self.runs = EMPTY
+        self.run_ids = np.empty(0, dtype=np.int64)
+        self.timestamps = np.empty(0, dtype='datetime64[D]')
+        self.row_hashes = np.empty(0, dtype=np.uint64)
+        self.max_code = 0
+        self._bitmaps = {}
+        self._values = {}
+        self._numerics = {}
+        self._time_rank = None
+        self._postings = {}
+        self._histograms = {}
+
+    def copy(self):
+        index = BitmapIndex()
+        index.runs = self.runs
+        index.run_ids, index.timestamps, index.row_hashes = self.run_ids, self.timestamps, self.row_hashes
+        index.max_code = self.max_code
+        index._bitmaps = dict(self._bitmaps)
+        index._values = {col_id: dict(values) for col_id, values in self._values.items()}
+        index._numerics = dict(self._numerics)
+        return index
+
+    # ------------------------------------------------------------------------
+    # GÜNCELLEME
+    # ------------------------------------------------------------------------
+
+    def add_dictionary(self, dictionary):
+        """DataFrame(code, col_id, value) -> kod -> değer"""
+        for code, col_id, value in dictionary.itertuples(index=False):
+            self._values.setdefault(int(col_id), {})[int(code)] = value
+        if len(dictionary):
+            self.max_code = max(self.max_code, int(dictionary['code'].max()))
+
+    def add_rows(self, runs, string_rows, numeric_rows):
+        """Yeni (veya silinip yeniden eklenen) run'ların satırlarını ekle
+
+        runs: DataFrame(run_id, timestamp, row_hash)
+        string_rows: DataFrame(run_id, col_id, code) ; numeric_rows: DataFrame(run_id, col_id, value)
+        """
+        run_ids = np.concatenate([self.run_ids, runs['run_id'].to_numpy(dtype=np.int64)])
+        order = np.argsort(run_ids, kind='stable')
+        self.run_ids = run_ids[order]
+        self.timestamps = np.concatenate([
+            self.timestamps, pd.to_datetime(runs['timestamp']).to_numpy().astype('datetime64[D]')])[order]
+        self.row_hashes = np.concatenate([self.row_hashes, runs['row_hash'].to_numpy(dtype=np.uint64)])[order]
+        self.runs = self.runs | RunBitmap.from_ids(runs['run_id'])
+
+        # (kod, run_id) sıralı -> her kodun run_id'leri ardışık dilim
+        codes = string_rows['code'].to_numpy(dtype=np.int64)
+        ids = string_rows['run_id'].to_numpy(dtype=np.int64)
+        order = np.lexsort((ids, codes))
+        codes, ids = codes[order], ids[order]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        for start, end in zip(np.concatenate([[0], bounds]).tolist(),
+                              np.concatenate([bounds, [len(codes)]]).tolist()):
+            if start == end:
+                continue
+            code = int(codes[start])
+            added = RunBitmap.from_sorted(ids[start:end])
+            previous = self._bitmaps.get(code)
+            self._bitmaps[code] = added if previous is None else previous | added
+
+        numeric_rows = numeric_rows.dropna(subset=['value'])
+        for col_id, group in numeric_rows.groupby('col_id', sort=False):
+            values, ids = self._numerics.get(int(col_id), (np.empty(0), np.empty(0, dtype=np.int64)))
+            values = np.concatenate([values, group['value'].astype(float).to_numpy()])
+            ids = np.concatenate([ids, group['run_id'].to_numpy(dtype=np.int64)])
+            order = np.lexsort((ids, values))
+            self._numerics[int(col_id)] = (values[order], ids[order])
+
+        self._time_rank = None
+        self._postings = {}
+        self._histograms = {}
+
+    def remove_runs(self, run_ids):
+        """Run'ları tüm bitmap'lerden ve dizilerden çıkar"""
+        run_ids = np.asarray(run_ids, dtype=np.int64)
+        removed = RunBitmap.from_ids(run_ids)
+        self.runs = self.runs - removed
+
+        keep = ~np.isin(self.run_ids, run_ids)
+        self.run_ids, self.timestamps, self.row_hashes = (
+            self.run_ids[keep], self.timestamps[keep], self.row_hashes[keep])
+
+        for code, bitmap in list(self._bitmaps.items()):
+            remaining = bitmap - removed
+            if len(remaining):
+                self._bitmaps[code] = remaining
+            else:
+                del self._bitmaps[code]
+
+        for col_id, (values, ids) in list(self._numerics.items()):
+            keep = ~np.isin(ids, run_ids)
+            self._numerics[col_id] = (values[keep], ids[keep])
+
+        self._time_rank = None
+        self._postings = {}
+        self._histograms = {}
+
+    # ------------------------------------------------------------------------
+    # FİLTRELER
+    # ------------------------------------------------------------------------
+
+    def _codes(self, col_id, predicate):
+        return [code for code, value in self._values.get(col_id, {}).items()
+                if code in self._bitmaps and predicate(value)]
+
+    def equals(self, col_id, values):
+        """Sütun değeri values'tan biri olan run'lar (birebir eşitlik)"""
+        values = set(values)
+        return union(self._bitmaps[code] for code in self._codes(col_id, values.__contains__))
+
+    def prefix(self, col_id, prefix):
+        """LOWER(değer) LIKE 'prefix%' karşılığı"""
+        prefix = prefix.lower()
+        return union(self._bitmaps[code]
+                     for code in self._codes(col_id, lambda value: value.lower().startswith(prefix)))
+
+    def _numeric(self, col_id):
+        return self._numerics.get(col_id, (np.empty(0), np.empty(0, dtype=np.int64)))
+
+    def numeric_range(self, col_id, low=None, high=None):
+        """low <= değer <= high olan satırların sıralı dizideki [başlangıç, bitiş) konumları"""
+        values, _ = self._numeric(col_id)
+        start = 0 if low is None else int(np.searchsorted(values, low, side='left'))
+        end = len(values) if high is None else int(np.searchsorted(values, high, side='right'))
+        return start, max(start, end)
+
+    def between(self, col_id, low=None, high=None):
+        """low <= numeric değer <= high (uçlardan biri None olabilir)"""
+        start, end = self.numeric_range(col_id, low, high)
+        return RunBitmap.from_ids(self._numeric(col_id)[1][start:end])
+
+    def numeric_page(self, col_id, low=None, high=None, after_value=None, after_run_id=None, limit=100):
+        """Aralıktaki satırlar (value, run_id) sırasında -> ([(run_id, value)], aralıktaki toplam)
+
+        after_value + after_run_id: önceki sayfanın son satırı (keyset imleci)
+        """
+        values, ids = self._numeric(col_id)
+        start, end = self.numeric_range(col_id, low, high)
+        total = end - start
+        if after_run_id is not None:
+            # Eşit değerler run_id'ye göre sıralı: imleçten sonraki ilk (value, run_id)
+            first = int(np.searchsorted(values, after_value, side='left'))
+            last = int(np.searchsorted(values, after_value, side='right'))
+            start = max(start, first + int(np.searchsorted(ids[first:last], after_run_id, side='right')))
+        end = min(end, start + limit)
+        return list(zip(ids[start:end].tolist(), values[start:end].tolist())), total
+
+    def histogram(self, col_id, buckets=HISTOGRAM_BUCKETS):
+        """Eşit derinlikli histogram -> [(alt, üst, sayı)]; kova (alt, üst], ilk kova [alt, üst]
+
+        Sınırlar sıralı dizinin eşit aralıklı konumlarındaki değerler; tekrar eden
+        sınırlar birleşir (çok tekrarlı değer tek kovada kalır).
+        """
+        key = (col_id, buckets)
+        if key not in self._histograms:
+            values, _ = self._numeric(col_id)
+            if not len(values):
+                self._histograms[key] = []
+            else:
+                edges = np.unique(values[np.linspace(0, len(values) - 1, buckets + 1).round().astype(np.int64)])
+                if len(edges) == 1:
+                    self._histograms[key] = [(float(edges[0]), float(edges[0]), len(values))]
+                else:
+                    ends = np.searchsorted(values, edges[1:], side='right')
+                    counts = np.diff(np.concatenate([[0], ends]))
+                    self._histograms[key] = [(float(low), float(high), int(count))
+                                             for low, high, count in zip(edges[:-1], edges[1:], counts)]
+        return self._histograms[key]
+
+    def date_range(self, date_from=None, date_to=None):
+        """date_from <= timestamp <= date_to ('YYYY-MM-DD')"""
+        selected = np.ones(len(self.run_ids), dtype=bool)
+        if date_from:
+            selected &= self.timestamps >= np.datetime64(date_from, 'D')
+        if date_to:
+            selected &= self.timestamps <= np.datetime64(date_to, 'D')
+        return RunBitmap.from_ids(self.run_ids[selected])
+
+    def intersect(self, bitmaps):
+        """Filtrelerin kesişimi, en seçici olandan başlayarak (filtre yoksa tüm run'lar)"""
+        result = None
+        for bitmap in sorted(bitmaps, key=len):
+            result = bitmap if result is None else result & bitmap
+            if not len(result):
+                break
+        return self.runs if result is None else result
+
+    # ------------------------------------------------------------------------
+    # FACET SAYILARI + SAYFALAMA
+    # ------------------------------------------------------------------------
+
+    def _posting_lists(self, col_id):
+        """Sütunun tüm değerleri için ardışık run_id listeleri (CSR) - sayım için, tembel"""
+        if col_id not in self._postings:
+            codes = sorted(self._codes(col_id, lambda value: True),
+                           key=lambda code: self._values[col_id][code])
+            lists = [self._bitmaps[code].ids() for code in codes]
+            offsets = np.cumsum([0] + [len(ids) for ids in lists])
+            ids = np.concatenate(lists) if lists else np.empty(0, dtype=np.int64)
+            self._postings[col_id] = (codes, ids, offsets)
+        return self._postings[col_id]
+
+    def counts(self, col_id, within=None):
+        """[(değer, run sayısı)] değere göre sıralı; within verilirse o kümeyle kesişim sayısı"""
+        codes, ids, offsets = self._posting_lists(col_id)
+        values = self._values.get(col_id, {})
+        if within is None:
+            counts = np.diff(offsets)
+        elif not len(codes):
+            counts = np.empty(0, dtype=np.int64)
+        else:
+            size = int(self.run_ids[-1]) + 1 if len(self.run_ids) else 0
+            hits = within.to_mask(size)[ids]
+            counts = np.add.reduceat(hits.astype(np.int64), offsets[:-1])
+        return [(values[code], int(count)) for code, count in zip(codes, counts) if count]
+
+    def _time_ranks(self):
+        """run_ids sırasında her run'ın (timestamp, run_id) sırasındaki yeri"""
+        if self._time_rank is None:
+            order = np.lexsort((self.run_ids, self.timestamps))
+            ranks = np.empty(len(order), dtype=np.int64)
+            ranks[order] = np.arange(len(order))
+            self._time_rank = ranks
+        return self._time_rank
+
+    def page(self, result, sort_by='run_id', descending=True, after_run_id=None, limit=50):
+        """Sonuç kümesinden keyset sayfası: en fazla limit + 1 run_id (build_runs_query ile aynı sıra)"""
+        ids = result.ids()
+        if sort_by == 'timestamp':
+            ranks = self._time_ranks()[np.searchsorted(self.run_ids, ids)]
+            order = np.argsort(ranks)
+            ids, ranks = ids[order], ranks[order]
+            if after_run_id is not None:
+                position = np.searchsorted(self.run_ids, after_run_id)
+                if position == len(self.run_ids) or self.run_ids[position] != after_run_id:
+                    return []  # imleç run'ı silinmiş (SQL'de alt sorgu NULL -> boş sayfa)
+                cursor_rank = self._time_ranks()[position]
+                ids = ids[ranks < cursor_rank] if descending else ids[ranks > cursor_rank]
+        elif after_run_id is not None:
+            ids = ids[:np.searchsorted(ids, after_run_id, side='left')] if descending \
+                else ids[np.searchsorted(ids, after_run_id, side='right'):]
+        if descending:
+            ids = ids[::-1]
+        return ids[:limit + 1].tolist()
+
+    @property
+    def nbytes(self):
+        return (sum(bitmap.nbytes for bitmap in self._bitmaps.values())
+                + sum(values.nbytes + ids.nbytes for values, ids in self._numerics.values())
+                + self.run_ids.nbytes + self.timestamps.nbytes + self.row_hashes.nbytes)
+
+
+# ============================================================================
+# VERİTABANINDAN OKUMA
+# ============================================================================
+
+def _row_hashes(values):
+    """BIGINT UNSIGNED (MySQL) / işaretli INTEGER (SQLite) -> aynı bitler uint64"""
+    if not len(values):
+        return np.empty(0, dtype=np.uint64)
+    series = pd.Series(values)
+    if series.dtype == np.uint64:
+        return series.to_numpy()
+    return series.to_numpy(dtype=np.int64).view(np.uint64)
+
+
+def _fetch_frame(cursor, sql, columns, run_ids=None):
+    """Sorgu -> DataFrame; run_ids verilirse 'WHERE run_id IN (...)' gruplar halinde"""
+    if run_ids is None:
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+    else:
+        rows = []
+        keyword = ' AND ' if ' WHERE ' in sql else ' WHERE '
+        for offset in range(0, len(run_ids), LOOKUP_BATCH_SIZE):
+            batch = [int(run_id) for run_id in run_ids[offset:offset + LOOKUP_BATCH_SIZE]]
+            cursor.execute(f"{sql}{keyword}run_id IN ({', '.join(['%s'] * len(batch))})", tuple(batch))
+            rows.extend(cursor.fetchall())
+    return pd.DataFrame(rows, columns=columns)
+
+
+def fetch_fingerprints(cursor):
+    """run_fingerprints -> (sıralı run_id'ler, row_hash'ler)"""
+    frame = _fetch_frame(cursor, "SELECT run_id, row_hash FROM run_fingerprints", ['run_id', 'row_hash'])
+    frame = frame.sort_values('run_id')
+    return frame['run_id'].to_numpy(dtype=np.int64), _row_hashes(frame['row_hash'].tolist())
+
+
+def fetch_runs(cursor, run_ids=None):
+    """runs + row_hash; parmak izi olmayan run'ın hash'i 0 (incremental güncelleme yapılamaz)"""
+    runs = _fetch_frame(cursor, "SELECT run_id, timestamp FROM runs", ['run_id', 'timestamp'], run_ids)
+    fingerprints = _fetch_frame(cursor, "SELECT run_id, row_hash FROM run_fingerprints",
+                                ['run_id', 'row_hash'], run_ids)
+    hashes = dict(zip(fingerprints['run_id'].tolist(), _row_hashes(fingerprints['row_hash'].tolist())))
+    runs['row_hash'] = np.array([hashes.get(run_id, 0) for run_id in runs['run_id'].tolist()],
+                                dtype=np.uint64)
+    return runs
+
+
+def load_index(cursor, index=None, run_ids=None):
+    """index=None -> tüm tablolardan yeni index; aksi halde run_ids'in satırları index'e eklenir"""
+    index = BitmapIndex() if index is None else index
+    index.add_dictionary(fetch_dictionary(cursor, after_code=index.max_code or None))
+    runs = fetch_runs(cursor, run_ids)
+    string_rows = _fetch_frame(cursor, "SELECT run_id, stringcol_id, string_code FROM runid_stringvalues",
+                               ['run_id', 'col_id', 'code'], run_ids)
+    numeric_rows = _fetch_frame(cursor, "SELECT run_id, numericcol_id, numeric_value FROM runid_numericvalues",
+                                ['run_id', 'col_id', 'value'], run_ids)
+    index.add_rows(runs, string_rows, numeric_rows)
+    return index
+
+
+# ============================================================================
+# UYGULAMA GENELİ INDEX (data_version değişince incremental güncellenir)
+# ============================================================================
+
+class FacetIndex(VersionedCache):
+    """Uygulama genelinde BitmapIndex
+
+    data_version değiştiyse run_fingerprints okunur: sadece row_hash'i değişen / yeni /
+    silinen run'ların satırları yeniden okunup bitmap'ler güncellenir. Değişiklik çok
+    büyükse (REBUILD_FRACTION) veya parmak izi olmayan run varsa baştan kurulur.
+    """
+
+    def __init__(self, check_interval=30.0, rebuild_fraction=REBUILD_FRACTION, poll=None):
+        super().__init__(check_interval, poll)
+        self.rebuild_fraction = rebuild_fraction
+        self._index = None
+        self.build_seconds = None
+        self.update_seconds = None
+        self.updated_runs = None
+
+    def build(self, connection, data_version=None):
+        """Tüm değer tablolarından yeni index kur ve atomik olarak değiştir"""
+        self.reload(connection, data_version, self._build)
+        return self._index
+
+    def update(self, connection, data_version=None):
+        """Parmak izlerine göre değişen run'ları yeniden oku (gerekirse tam kurulum)"""
+        self.reload(connection, data_version, self._update)
+        return self._index
+
+    def refresh(self, connection, data_version):
+        if self._index is None:
+            self._build(connection, data_version)
+        else:
+            self._update(connection, data_version)
+
+    def _build(self, connection, data_version):
+        start = time.perf_counter()
+        cursor = connection.cursor()
+        index = load_index(cursor)
+        cursor.close()
+
+        self._swap(index)
+        self.build_seconds = time.perf_counter() - start
+
+    def _update(self, connection, data_version):
+        start = time.perf_counter()
+        current = self._index
+        if current is None:
+            return self._build(connection, data_version)
+        cursor = connection.cursor()
+        run_ids, row_hashes = fetch_fingerprints(cursor)
+        cursor.execute("SELECT COUNT(*) FROM runs")
+        run_count = cursor.fetchone()[0]
+
+        positions = np.minimum(np.searchsorted(current.run_ids, run_ids), max(len(current.run_ids) - 1, 0))
+        unchanged = np.zeros(len(run_ids), dtype=bool)
+        if len(current.run_ids):
+            unchanged = ((current.run_ids[positions] == run_ids)
+                         & (current.row_hashes[positions] == row_hashes))
+        changed = run_ids[~unchanged]
+        removed = np.setdiff1d(current.run_ids, run_ids, assume_unique=True)
+
+        complete = run_count == len(run_ids) and not (current.row_hashes == 0).any()
+        if not complete or len(changed) + len(removed) > self.rebuild_fraction * max(len(run_ids), 1):
+            cursor.close()
+            return self._build(connection, data_version)
+
+        index = current
+        if len(changed) or len(removed):
+            index = current.copy()
+            index.remove_runs(np.concatenate([changed, removed]))
+            load_index(cursor, index, changed)
+        cursor.close()
+
+        self._swap(index)
+        self.update_seconds = time.perf_counter() - start
+        self.updated_runs = len(changed) + len(removed)
+
+    def _swap(self, index):
+        with self._lock:
+            self._index = index
+
+    def ensure_fresh(self, connection):
+        """data_version değiştiyse güncelle; güncel index'i döndür"""
+        super().ensure_fresh(connection)
+        return self._index
+
+    @property
+    def index(self):
+        return self._index
+
+    def metrics(self):
+        index = self._index
+        return {'runs': len(index.run_ids) if index else 0,
+                'bytes': index.nbytes if index else 0,
+                'data_version': self._version,
+                'build_seconds': self.build_seconds,
+                'update_seconds': self.update_seconds,
+                'updated_runs': self.updated_runs}
@@ -0,0 +1,391 @@
+"""
+CYLINDER BANDS DATABASE - INSTRUMENTATION
+Route, SQL ve procedure süreleri: Prometheus histogramları + slow-query log.
+Ölçüm başına birkaç perf_counter + kilitli sayaç artışı; production'da açık kalabilir.
+"""
+
+import bisect
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Prometheus varsayılanlarına yakın gecikme kovaları (saniye)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# StorageBackend'in procedure karşılıkları (MySQL: CALL, SQLite: Python) -> procedure histogramı
+PROCEDURE_METHODS = ('get_run_details', 'get_runs_details', 'quick_search',
+                     'search_string_attribute', 'search_numeric_attribute')
+
+STATEMENT_LABEL_LENGTH = 120
+STATEMENT_LABEL_CACHE_SIZE = 1024
+
+METRIC_HELP = {
+    'cylinder_http_request_duration_seconds': ('histogram', 'Flask route süresi (yanıt gövdesi dahil)'),
+    'cylinder_http_requests_total': ('counter', 'Route / status başına istek sayısı'),
+    'cylinder_template_render_duration_seconds': ('histogram', 'Jinja şablon render süresi'),
+    'cylinder_db_connection_acquire_seconds': ('histogram', 'Havuzdan bağlantı alma (bekleme + handshake + ping)'),
+    'cylinder_db_procedure_duration_seconds': ('histogram', 'Stored procedure / taşınabilir karşılığı'),
+    'cylinder_db_query_duration_seconds': ('histogram', 'execute / executemany / callproc süresi'),
+    'cylinder_db_fetch_duration_seconds': ('histogram', 'fetch* / stored_results okuma süresi'),
+    'cylinder_db_rows_total': ('counter', 'Sorgu başına okunan / yazılan satır'),
+    'cylinder_db_slow_queries_total': ('counter', 'Slow-query eşiğini aşan sorgular'),
+}
+
+slow_query_logger = logging.getLogger('cylinder_bands.slow_query')
+
+
+# ============================================================================
+# METRİKLER
+# ============================================================================
+
+class Histogram:
+    """Sabit kovalı histogram (kova başına sayaç + toplam); kilit Metrics'te"""
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self, size):
+        self.counts = [0] * (size + 1)  # son kova: +Inf
+        self.total = 0.0
+        self.count = 0
+
+
+class Metrics:
+    """Process içi metrik deposu -> Prometheus text formatı
+
+    slow_query_seconds: execute + fetch toplamı bu süreyi aşan sorgular
+    slow_query_logger'a yazılır (None -> kapalı)
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, slow_query_seconds=0.25):
+        self.buckets = tuple(buckets)
+        self.slow_query_seconds = slow_query_seconds
+        self._lock = threading.Lock()
+        self._histograms = {}  # (metrik, label tuple'ı) -> Histogram
+        self._counters = {}    # (metrik, label tuple'ı) -> sayı
+        self._labels = {}      # SQL -> statement label önbelleği
+
+    def observe(self, metric, labels, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        key = (metric, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(len(self.buckets))
+            histogram.counts[index] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    def increment(self, metric, labels, amount=1):
+        key = (metric, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def statement_label(self, sql):
+        """SQL -> düşük kardinaliteli label (literal'ler ?, IN listeleri tek ?)"""
+        label = self._labels.get(sql)
+        if label is None:
+            label = normalize_statement(sql)
+            if len(self._labels) < STATEMENT_LABEL_CACHE_SIZE:
+                self._labels[sql] = label
+        return label
+
+    def record_statement(self, statement):
+        """Biten sorgu: execute / fetch histogramları, satır sayacı, gerekirse slow-query log"""
+        labels = (('statement', statement.label),)
+        self.observe('cylinder_db_query_duration_seconds', labels, statement.execute_seconds)
+        if statement.fetched:
+            self.observe('cylinder_db_fetch_duration_seconds', labels, statement.fetch_seconds)
+        if statement.rows:
+            self.increment('cylinder_db_rows_total', labels, statement.rows)
+
+        total = statement.execute_seconds + statement.fetch_seconds
+        if self.slow_query_seconds is not None and total >= self.slow_query_seconds:
+            self.increment('cylinder_db_slow_queries_total', labels)
+            slow_query_logger.warning(
+                "slow query %.1f ms (execute %.1f ms, fetch %.1f ms, %d rows): %s | params=%r",
+                total * 1000, statement.execute_seconds * 1000, statement.fetch_seconds * 1000,
+                statement.rows, statement.sql, statement.params
+            )
+
+    def render(self, gauges=None):
+        """Prometheus text exposition (0.0.4); gauges: {isim: değer} anlık değerler"""
+        with self._lock:
+            histograms = [(key, list(h.counts), h.total, h.count) for key, h in self._histograms.items()]
+            counters = list(self._counters.items())
+
+        lines = []
+        families = {}
+        for (metric, labels), counts, total, count in histograms:
+            families.setdefault(metric, []).append(('histogram', labels, (counts, total, count)))
+        for (metric, labels), value in counters:
+            families.setdefault(metric, []).append(('counter', labels, value))
+
+        for metric in sorted(families):
+            kind, help_text = METRIC_HELP.get(metric, (families[metric][0][0], metric))
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for sample_kind, labels, value in sorted(families[metric], key=lambda item: item[1]):
+                if sample_kind == 'counter':
+                    lines.append(f"{metric}{format_labels(labels)} {value}")
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{metric}_bucket{format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{metric}_sum{format_labels(labels)} {total!r}")
+                lines.append(f"{metric}_count{format_labels(labels)} {count}")
+
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(sql):
+    """'SELECT ... WHERE run_id IN (%s, %s, ...) LIMIT 50' -> 'SELECT ... WHERE run_id IN (?) LIMIT ?'"""
+    label = _WHITESPACE.sub(' ', sql).strip()
+    label = _LITERALS.sub('?', label).replace('%s', '?')
+    label = _IN_LISTS.sub('IN (?)', label)
+    if len(label) > STATEMENT_LABEL_LENGTH:
+        label = label[:STATEMENT_LABEL_LENGTH - 3] + '...'
+    return label
+
+
+def format_labels(labels):
+    """(('route', '/runs'),) -> '{route="/runs"}' (\\, " ve satır sonu kaçışlı)"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in labels) + '}'
+
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def configure_slow_query_log(path=None):
+    """Slow-query log'u dosyaya (path) veya stderr'e yönlendir"""
+    handler = logging.FileHandler(path, encoding='utf-8') if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    slow_query_logger.addHandler(handler)
+    slow_query_logger.setLevel(logging.WARNING)
+    slow_query_logger.propagate = False
+
+
+# ============================================================================
+# CURSOR / CONNECTION / BACKEND SARMALAYICILARI
+# ============================================================================
+
+class Statement:
+    """Cursor'da çalışan son sorgu; bir sonraki execute veya close'da kaydedilir"""
+
+    __slots__ = ('label', 'sql', 'params', 'execute_seconds', 'fetch_seconds', 'rows', 'fetched')
+
+    def __init__(self, label, sql, params, execute_seconds, rows=0):
+        self.label = label
+        self.sql = sql
+        self.params = params
+        self.execute_seconds = execute_seconds
+        self.fetch_seconds = 0.0
+        self.rows = rows
+        self.fetched = False
+
+
+class InstrumentedCursor:
+    """mysql.connector / SQLiteCursor sarmalayıcı: sorgu, fetch süresi ve satır sayısı"""
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self._metrics = metrics
+        self._statement = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _finish(self):
+        if self._statement is not None:
+            self._metrics.record_statement(self._statement)
+            self._statement = None
+
+    def _run(self, label, sql, params, method, *args):
+        self._finish()
+        start = time.perf_counter()
+        result = method(*args)
+        self._statement = Statement(label, sql, params, time.perf_counter() - start)
+        return result
+
+    def execute(self, sql, params=(), *args, **kwargs):
+        return self._run(self._metrics.statement_label(sql), sql, params,
+                         lambda: self._cursor.execute(sql, params, *args, **kwargs))
+
+    def executemany(self, sql, seq_params):
+        result = self._run(self._metrics.statement_label(sql), sql, f'<{len(seq_params)} satır>',
+                           self._cursor.executemany, sql, seq_params)
+        self._statement.rows = max(self._cursor.rowcount or 0, 0)
+        return result
+
+    def callproc(self, name, args=()):
+        return self._run(f'CALL {name}', f'CALL {name}', args, self._cursor.callproc, name, args)
+
+    def _fetched(self, start, rows):
+        if self._statement is not None:
+            self._statement.fetch_seconds += time.perf_counter() - start
+            self._statement.rows += rows
+            self._statement.fetched = True
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(start, row is not None)
+        return row
+
+    def fetchmany(self, size=1):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def stored_results(self):
+        """callproc sonuç kümeleri: okumaları CALL'un fetch süresine eklenir"""
+        for result in self._cursor.stored_results():
+            yield _StoredResult(result, self)
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+
+class _StoredResult:
+    """stored_results() elemanı: fetch'leri sahibi cursor'ın son sorgusuna yazar"""
+
+    def __init__(self, result, owner):
+        self._result = result
+        self._owner = owner
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._result.fetchone()
+        self._owner._fetched(start, row is not None)
+        return row
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._result.fetchall()
+        self._owner._fetched(start, len(rows))
+        return rows
+
+
+class InstrumentedConnection:
+    """cursor() çağrılarını InstrumentedCursor ile saran bağlantı"""
+
+    def __init__(self, connection, metrics):
+        self._connection = connection
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._metrics)
+
+
+class InstrumentedBackend:
+    """StorageBackend sarmalayıcı: havuzdan alma süresi, procedure histogramı, ölçülen bağlantılar"""
+
+    def __init__(self, backend, metrics):
+        self._backend = backend
+        self.instrumentation = metrics
+        for name in PROCEDURE_METHODS:
+            setattr(self, name, self._timed_procedure(name, getattr(backend, name)))
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+    def _timed_procedure(self, name, method):
+        labels = (('procedure', name),)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.instrumentation.observe('cylinder_db_procedure_duration_seconds', labels,
+                                             time.perf_counter() - start)
+        return timed
+
+    @contextmanager
+    def connection(self):
+        start = time.perf_counter()
+        with self._backend.connection() as connection:
+            self.instrumentation.observe('cylinder_db_connection_acquire_seconds', (),
+                                         time.perf_counter() - start)
+            yield InstrumentedConnection(connection, self.instrumentation)
+
+
+# ============================================================================
+# FLASK
+# ============================================================================
+
+def instrument_flask(app, metrics):
+    """Her route için süre histogramı + status sayacı, şablon render süreleri
+
+    Süre, yanıt gövdesi gönderilip kapatılınca ölçülür (streaming export'lar dahil).
+    """
+    from flask import before_render_template, g, request, template_rendered
+
+    @app.before_request
+    def start_request_timer():
+        g.instrumentation_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        start = g.pop('instrumentation_start', None)
+        if start is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        labels = (('method', request.method), ('route', route))
+        status = response.status_code
+
+        def finished():
+            metrics.observe('cylinder_http_request_duration_seconds', labels, time.perf_counter() - start)
+            metrics.increment('cylinder_http_requests_total', labels + (('status', str(status)),))
+        response.call_on_close(finished)
+        return response
+
+    def start_render(sender, template, context, **extra):
+        g.instrumentation_render_start = time.perf_counter()
+
+    def record_render(sender, template, context, **extra):
+        start = g.pop('instrumentation_render_start', None)
+        if start is not None:
+            metrics.observe('cylinder_template_render_duration_seconds',
+                            (('template', template.name),), time.perf_counter() - start)
+
+    # weak=False: alıcılar bu fonksiyonun yerel fonksiyonları
+    before_render_template.connect(start_render, app, weak=False)
+    template_rendered.connect(record_render, app, weak=False)
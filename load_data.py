@@ -1,19 +1,82 @@
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+import numpy as np
 import pandas as pd
 import mysql.connector
 from datetime import datetime
 
+from rollup_cube import CUBE_COLUMNS, CUBE_TABLE, combine_deltas, cube_contributions
+from stats_snapshot import refresh_statistics_snapshot
+from storage import (SQLiteBackend, dialect_of, lock_clause, table_columns,
+                     upsert_clause)
+from string_dictionary import DICTIONARY_COLUMNS, DICTIONARY_TABLE, decode_frame, fetch_dictionary
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow snapshot opsiyonel; yoksa CSV yolu kullanılır
+    pa = None
+
+
+# Loader'ın ve app.py'nin MySQL veritabanı (CYLINDER_MYSQL_DATABASE ile değişir)
+DEFAULT_MYSQL_DATABASE = 'cylinder_bands_db'
+MYSQL_DATABASE = os.environ.get('CYLINDER_MYSQL_DATABASE', DEFAULT_MYSQL_DATABASE)
+
+# Toplu yükleme ayarları
+BATCH_SIZE = 5000  # executemany başına satır sayısı
+LOOKUP_BATCH_SIZE = 1000  # WHERE ... IN (...) başına anahtar sayısı
+
+# Paralel yükleme ayarları (--workers)
+PARTITIONS_PER_WORKER = 4  # tablo başına run_id aralığı sayısı = workers * bu
+DEADLOCK_RETRIES = 5  # bölüm başına yeniden deneme
+RETRY_BACKOFF = 0.2  # sn, her denemede iki katına çıkar
+RETRYABLE_MYSQL_ERRORS = {1205, 1213}  # lock wait timeout, deadlock
+
+# Değer tabloları: tip -> (tablo, sütunlar); string hücreler string_dictionary kodu saklar
+VALUE_TABLES = {
+    'string': ('runid_stringvalues', ['run_id', 'stringcol_id', 'string_code']),
+    'numeric': ('runid_numericvalues', ['run_id', 'numericcol_id', 'numeric_value']),
+}
+
+# Bir run'ı doğal olarak tanımlayan sütunlar (incremental yükleme anahtarı)
+NATURAL_KEY_COLS = ['timestamp', 'job_number', 'cylinder_number']
 
-# MYSQL Connection
-def connect_to_db():
+# Loader'ın senkron tuttuğu materialized geniş tablo
+MV_TABLE = 'production_runs'
+
+# cleaning.py'nin Arrow snapshot'ında sınıflandırmanın tutulduğu metadata anahtarı
+SNAPSHOT_METADATA_KEY = b'cylinder_bands'
+
+# Loader'ın düzelttiği sütun adları
+COLUMN_RENAMES = {'humifity': 'humidity'}
+
+
+# MYSQL / SQLite Connection
+def connect_to_db(allow_local_infile=False, sqlite_path=None, database=None):
+    """sqlite_path verilirse gömülü SQLite dosyası (yoksa şemayla oluşturulur)
+
+    database: MySQL veritabanı (varsayılan MYSQL_DATABASE)
+    """
     try:
+        if sqlite_path:
+            connection = SQLiteBackend(sqlite_path).connect()
+            print(f"✓ SQLite veritabanı açıldı: {sqlite_path}")
+            return connection
         connection = mysql.connector.connect(
             host='localhost',
             port=3306,
             user='root',
             password='***CHANGE_THIS***',
-            database='cylinder_bands_db'
+            database=database or MYSQL_DATABASE,
+            allow_local_infile=allow_local_infile
         )
-        print("✓ Veritabanına bağlanıldı")
+        print(f"✓ Veritabanına bağlanıldı: {database or MYSQL_DATABASE}")
         return connection
     except Exception as e:
         print(f"✗ Bağlantı hatası: {e}")
@@ -21,17 +84,13 @@ def connect_to_db():
 
 
 
-def load_and_clean_csv(filepath):
-    """CSV'yi oku ve temizle"""
-    print("\n📂 CSV yükleniyor...")
-    df = pd.read_csv("/home/ebru/Desktop/database_project/data/cylinder_band.csv")
-    
-    # Veri temizleme
-    print("🧹 Veri temizleniyor...")
-    
-    if 'humifity' in df.columns:
-        df.rename(columns={'humifity': 'humidity'}, inplace=True)
-        print("✓ 'humifity' → 'humidity' düzeltildi")
+def apply_loader_fixes(df):
+    """Loader'a özgü düzeltmeler: sütun adları + customer / paper_mill_location typo'ları"""
+    renames = {old: new for old, new in COLUMN_RENAMES.items() if old in df.columns}
+    if renames:
+        df.rename(columns=renames, inplace=True)
+        for old, new in renames.items():
+            print(f"✓ '{old}' → '{new}' düzeltildi")
 
     # Customer typo'larını düzelt
     customer_mapping = {
@@ -59,7 +118,18 @@ def load_and_clean_csv(filepath):
     df['paper_mill_location'] = df['paper_mill_location'].replace({
         'scandanavian': 'scandinavian'
     })
+    return df
+
+
+
+def load_and_clean_csv(filepath):
+    """CSV'yi oku ve temizle"""
+    print("\n📂 CSV yükleniyor...")
+    df = pd.read_csv("/home/ebru/Desktop/database_project/data/cylinder_band.csv")
     
+    # Veri temizleme
+    print("🧹 Veri temizleniyor...")
+    apply_loader_fixes(df)
     
     print(f"✓ Temizleme tamamlandı. Toplam kayıt: {len(df)}")
 
@@ -71,6 +141,50 @@ def load_and_clean_csv(filepath):
 
 
 
+def to_loader_frame(df):
+    """Snapshot tiplerini CSV yolunun veritabanına yazdığı değerlerle eşle
+
+    NULL içeren nullable integer -> float64 (read_csv'nin çıkardığı tip;
+    string sütunlarda '1911.0' biçimi ve parmak izleri aynı kalır)
+    """
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_extension_array_dtype(dtype) and pd.api.types.is_integer_dtype(dtype) and df[col].hasnans:
+            df[col] = df[col].astype('float64')
+    return df
+
+
+def load_snapshot(path):
+    """cleaning.py'nin Arrow snapshot'ını memory-map ile oku -> (df, string_cols, numeric_cols)
+
+    Sınıflandırma şema metadata'sından gelir (categorize_columns çalışmaz);
+    sadece yüklenecek sütunlar seçilir, sayısal buffer'lar kopyalanmadan okunur.
+    """
+    print(f"\n📦 Arrow snapshot yükleniyor: {path}")
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        meta = json.loads(table.schema.metadata[SNAPSHOT_METADATA_KEY])
+        string_cols, numeric_cols = meta['string_cols'], meta['numeric_cols']
+        columns = [col for col in ['timestamp'] if col in table.schema.names]
+        table = table.select(columns + string_cols + numeric_cols)
+
+        # timestamp -> 'YYYY-MM-DD' Arrow içinde (connector pandas Timestamp kabul etmez)
+        if columns and pa.types.is_timestamp(table.schema.field('timestamp').type):
+            dates = table['timestamp'].cast(pa.date32(), safe=False).cast(pa.string())
+            table = table.set_column(0, 'timestamp', dates)
+        df = table.to_pandas(split_blocks=True)
+
+    df = apply_loader_fixes(to_loader_frame(df))
+    string_cols = [COLUMN_RENAMES.get(col, col) for col in string_cols]
+    numeric_cols = [COLUMN_RENAMES.get(col, col) for col in numeric_cols]
+
+    print(f"✓ {len(df)} kayıt, kaynak: {meta['source']}")
+    print(f"\n📋 String sütunlar: {len(string_cols)}")
+    print(f"📋 Numeric sütunlar: {len(numeric_cols)}")
+    return df, string_cols, numeric_cols
+
+
+
 def categorize_columns(df):
     """Sütunları string ve numeric olarak ayır"""
     string_cols = []
@@ -106,6 +220,8 @@ def populate_metadata_tables(connection, string_cols, numeric_cols):
     
     print("\n📝 Metadata tabloları dolduruluyor...")
     
+    added = 0
+    
     # stringcols tablosunu doldur
     for col in string_cols:
         try:
@@ -113,7 +229,8 @@ def populate_metadata_tables(connection, string_cols, numeric_cols):
                 "INSERT INTO stringcols (column_name) VALUES (%s)",
                 (col,)
             )
-        except mysql.connector.IntegrityError:
+            added += 1
+        except (mysql.connector.IntegrityError, sqlite3.IntegrityError):
             pass  # Zaten varsa devam et
     
     # numericcols tablosunu doldur
@@ -123,9 +240,15 @@ def populate_metadata_tables(connection, string_cols, numeric_cols):
                 "INSERT INTO numericcols (column_name) VALUES (%s)",
                 (col,)
             )
-        except mysql.connector.IntegrityError:
+            added += 1
+        except (mysql.connector.IntegrityError, sqlite3.IntegrityError):
             pass  # Zaten varsa devam et
     
+    # Yeni sütun eklendiyse app'in metadata önbelleği yeniden yüklensin
+    if added:
+        cursor.execute("UPDATE load_state SET schema_version = schema_version + 1 WHERE id = 1")
+        print(f"✓ {added} yeni sütun eklendi, schema_version artırıldı")
+    
     connection.commit()
     print("✓ Metadata tabloları dolduruldu")
     
@@ -141,33 +264,61 @@ def populate_metadata_tables(connection, string_cols, numeric_cols):
 
 
 
-def populate_runs_table(connection, df):
-    """runs tablosunu doldur"""
+def populate_runs_table(connection, df, batch_size=BATCH_SIZE, commit=True):
+    """runs tablosunu toplu doldur, satır başına gerçek run_id dizisini döndür"""
     cursor = connection.cursor()
     
     print("\n🏃 Runs tablosu dolduruluyor...")
     
-    for idx, row in df.iterrows():
-        cursor.execute(
+    timestamps = df['timestamp'].tolist()
+    run_ids = np.empty(len(df), dtype=np.int64)
+    
+    for offset in range(0, len(timestamps), batch_size):
+        batch = timestamps[offset:offset + batch_size]
+        # Tek çok-satırlı INSERT -> AUTO_INCREMENT ardışık bir aralık ayırır,
+        # lastrowid bu aralığın ilk değeridir
+        cursor.executemany(
             "INSERT INTO runs (timestamp) VALUES (%s)",
-            (row['timestamp'],)
+            [(ts,) for ts in batch]
+        )
+        first_id = cursor.lastrowid
+        last_id = first_id + len(batch) - 1
+        
+        # Aralık gerçekten bize mi ait? (eşzamanlı yükleme kontrolü)
+        cursor.execute(
+            "SELECT COUNT(*) FROM runs WHERE run_id BETWEEN %s AND %s",
+            (first_id, last_id)
         )
+        if cursor.fetchone()[0] != len(batch):
+            raise RuntimeError(
+                f"runs id aralığı ardışık değil ({first_id}-{last_id}), "
+                "innodb_autoinc_lock_mode ayarını kontrol edin"
+            )
+        run_ids[offset:offset + len(batch)] = np.arange(first_id, last_id + 1)
     
-    connection.commit()
-    print(f"✓ {len(df)} kayıt runs tablosuna eklendi")
+    if commit:
+        connection.commit()
+    print(f"✓ {len(df)} kayıt runs tablosuna eklendi "
+          f"(run_id {run_ids.min() if len(run_ids) else '-'} - {run_ids.max() if len(run_ids) else '-'})")
+    return run_ids
 
 # ============================================================================
 # 6. ADIM: String Değerlerini Yükle
 # ============================================================================
 
-def populate_string_values(connection, df, string_cols, string_col_ids):
+def populate_string_values(connection, df, string_cols, string_col_ids, run_ids):
     """runid_stringvalues tablosunu doldur"""
+    # Sözlük kodları toplu atanır, hücreler satır satır eklenir
+    encoded = encode_string_values(
+        connection, melt_values(df, string_cols, string_col_ids, run_ids, 'string'))
+    codes = dict(zip(zip(encoded['col_id'].tolist(), encoded['value'].tolist()),
+                     encoded['code'].tolist()))
     cursor = connection.cursor()
     
     print("\n📝 String değerler yükleniyor...")
     
     total = 0
-    for run_id, (idx, row) in enumerate(df.iterrows(), start=1):
+    for run_id, (idx, row) in zip(run_ids.tolist(), df.iterrows()):
         for col in string_cols:
             value = row[col]
             
@@ -179,8 +330,8 @@ def populate_string_values(connection, df, string_cols, string_col_ids):
             stringcol_id = string_col_ids[col]
             
             cursor.execute(
-                "INSERT INTO runid_stringvalues (run_id, stringcol_id, string_value) VALUES (%s, %s, %s)",
-                (run_id, stringcol_id, value)
+                "INSERT INTO runid_stringvalues (run_id, stringcol_id, string_code) VALUES (%s, %s, %s)",
+                (run_id, stringcol_id, codes[(stringcol_id, value)])
             )
             total += 1
             
@@ -195,14 +346,14 @@ def populate_string_values(connection, df, string_cols, string_col_ids):
 # 7. ADIM: Numeric Değerlerini Yükle
 # ============================================================================
 
-def populate_numeric_values(connection, df, numeric_cols, numeric_col_ids):
+def populate_numeric_values(connection, df, numeric_cols, numeric_col_ids, run_ids):
     """runid_numericvalues tablosunu doldur"""
     cursor = connection.cursor()
     
     print("\n🔢 Numeric değerler yükleniyor...")
     
     total = 0
-    for run_id, (idx, row) in enumerate(df.iterrows(), start=1):
+    for run_id, (idx, row) in zip(run_ids.tolist(), df.iterrows()):
         for col in numeric_cols:
             value = row[col]
             
@@ -226,12 +377,734 @@ def populate_numeric_values(connection, df, numeric_cols, numeric_col_ids):
     connection.commit()
     print(f"✓ Toplam {total} numeric değer yüklendi (NULL'lar atlandı)")
 
+# ============================================================================
+# 6-7. ADIM (BULK): Değerleri Toplu Yükle
+# ============================================================================
+
+def melt_values(df, cols, col_ids, run_ids, value_type):
+    """Geniş DataFrame'i uzun (run_id, col_id, value) formatına çevir - vektörel"""
+    wide = df[cols].copy()
+    wide.insert(0, 'run_id', run_ids)
+
+    long_df = wide.melt(id_vars='run_id', var_name='column_name', value_name='value')
+    long_df = long_df.dropna(subset=['value'])  # NULL'lar saklanmaz
+
+    long_df['col_id'] = long_df['column_name'].map(col_ids)
+    if value_type == 'string':
+        long_df['value'] = long_df['value'].astype(str)
+    else:
+        long_df['value'] = long_df['value'].astype(float)
+
+    # PK sırasında ekle (run_id, col_id) - InnoDB için sıralı insert
+    long_df = long_df.sort_values(['run_id', 'col_id'], kind='stable')
+    return long_df[['run_id', 'col_id', 'value']]
+
+
+def encode_string_values(connection, long_df, batch_size=BATCH_SIZE):
+    """Uzun string tablosuna string_dictionary kodlarını ekle ('code' sütunu) - toplu
+
+    Sözlükte olmayan (sütun, değer) çiftleri tek seferde eklenir (var olan çiftlere
+    dokunulmaz: eşzamanlı yükleyiciler aynı değeri ekleyebilir), sonra kodlar geri okunur.
+    """
+    cursor = connection.cursor()
+    pairs = long_df[['col_id', 'value']].drop_duplicates()
+    col_ids = sorted(pairs['col_id'].unique().tolist())
+    dictionary = fetch_dictionary(cursor, col_ids)
+
+    known = pairs.merge(dictionary, on=['col_id', 'value'], how='left')
+    new_pairs = known.loc[known['code'].isna(), ['col_id', 'value']]
+    if len(new_pairs):
+        bulk_insert_values(connection, DICTIONARY_TABLE, DICTIONARY_COLUMNS, new_pairs,
+                           batch_size, upsert=True, update_columns=['string_value'], commit=False)
+        dictionary = fetch_dictionary(cursor, col_ids)
+
+    codes = long_df[['col_id', 'value']].merge(dictionary, on=['col_id', 'value'], how='left')['code']
+    if codes.isna().any():
+        # utf8mb4_bin PAD SPACE: sonda boşluk farkı olan değerler aynı sözlük satırına düşer
+        missing = long_df.loc[codes.isna().to_numpy(), 'value'].unique()[:5].tolist()
+        raise RuntimeError(f"string_dictionary kodu bulunamadı: {missing}")
+    return long_df.assign(code=codes.to_numpy(dtype=np.int64))
+
+
+def bulk_insert_values(connection, table, columns, long_df,
+                       batch_size=BATCH_SIZE, use_infile=False,
+                       upsert=False, commit=True, update_columns=None, increment=False,
+                       quiet=False):
+    """Uzun formattaki satırları executemany veya LOAD DATA ile toplu ekle
+
+    upsert=True -> INSERT ... ON DUPLICATE KEY UPDATE
+    (update_columns verilmezse sadece son sütun güncellenir;
+    increment=True -> mevcut değerin üstüne eklenir)
+    quiet=True -> ilerleme satırları basılmaz (paralel bölümler kendi satırını basar)
+    """
+    cursor = connection.cursor()
+    total = len(long_df)
+    start = time.perf_counter()
+
+    if use_infile and not upsert and dialect_of(connection) == 'sqlite':
+        print("ℹ SQLite'ta LOAD DATA yok, executemany kullanılıyor")
+        use_infile = False
+
+    if use_infile and not upsert:
+        # Geçici CSV -> LOAD DATA LOCAL INFILE (tek round trip)
+        fd, tmp_path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        try:
+            long_df.to_csv(tmp_path, header=False, index=False, lineterminator='\n')
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+                "LINES TERMINATED BY '\\n' "
+                f"({', '.join(columns)})",
+                (tmp_path,)
+            )
+        finally:
+            os.remove(tmp_path)
+    else:
+        # executemany -> mysql.connector tek bir çok-satırlı INSERT'e çevirir
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        )
+        if upsert:
+            sql += upsert_clause(dialect_of(connection), update_columns or [columns[-1]],
+                                 increment=increment)
+        rows = list(zip(*(long_df[c].tolist() for c in long_df.columns)))
+        for offset in range(0, total, batch_size):
+            cursor.executemany(sql, rows[offset:offset + batch_size])
+            if not quiet:
+                print(f"  {min(offset + batch_size, total)}/{total} satır yüklendi...")
+
+    if commit:
+        connection.commit()
+    if quiet:
+        return total
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else float('inf')
+    print(f"✓ {table}: {total} satır, {elapsed:.2f} sn ({rate:,.0f} satır/sn)")
+    return total
+
+
+def bulk_populate_values(connection, df, string_cols, numeric_cols,
+                         string_col_ids, numeric_col_ids, run_ids,
+                         batch_size=BATCH_SIZE, use_infile=False, commit=True):
+    """String ve numeric değerleri toplu yükle (iterrows yerine melt)
+
+    run_ids: populate_runs_table'ın döndürdüğü, df satırlarıyla hizalı gerçek id'ler
+    """
+    print("\n📦 Değerler toplu yükleniyor...")
+
+    long_frames = {}
+    for value_type, cols, col_ids in (('string', string_cols, string_col_ids),
+                                      ('numeric', numeric_cols, numeric_col_ids)):
+        table, columns = VALUE_TABLES[value_type]
+        long_df = melt_values(df, cols, col_ids, run_ids, value_type)
+        stored = 'value'
+        if value_type == 'string':
+            long_df = encode_string_values(connection, long_df, batch_size)
+            stored = 'code'
+        bulk_insert_values(connection, table, columns, long_df[['run_id', 'col_id', stored]],
+                           batch_size, use_infile, commit=commit)
+        long_frames[value_type] = long_df
+    return long_frames
+
+# ============================================================================
+# 6-7. ADIM (PARALEL): Değerleri Bölümler Halinde Eşzamanlı Yükle
+# ============================================================================
+
+def partition_values(long_frames, run_ids, partitions):
+    """Uzun tabloları run_id aralığı x tablo bölümlerine ayır
+
+    Aralıklar iki tablo için aynıdır; liste tablolar dönüşümlü sıralanır
+    (string ve numeric bölümleri aynı anda işlenir).
+    """
+    unique_ids = np.unique(np.asarray(run_ids, dtype=np.int64))
+    ranges = [(int(chunk[0]), int(chunk[-1]))
+              for chunk in np.array_split(unique_ids, max(1, min(partitions, len(unique_ids))))
+              if len(chunk)]
+
+    by_table = []
+    for value_type, long_df in long_frames.items():
+        table, columns = VALUE_TABLES[value_type]
+        stored = 'code' if value_type == 'string' else 'value'
+        long_df = long_df[['run_id', 'col_id', stored]]
+        # melt_values run_id'ye göre sıralı döndürür -> aralıklar searchsorted ile kesilir
+        ids = long_df['run_id'].to_numpy()
+        parts = []
+        for low, high in ranges:
+            start, stop = np.searchsorted(ids, [low, high + 1])
+            parts.append({'table': table, 'columns': columns, 'low': low, 'high': high,
+                          'rows': long_df.iloc[start:stop]})
+        by_table.append(parts)
+    return [part for group in zip(*by_table) for part in group]
+
+
+def is_retryable(error):
+    """Deadlock / kilit bekleme hatası mı? (bölüm geri alınıp yeniden denenir)"""
+    if isinstance(error, mysql.connector.Error):
+        return error.errno in RETRYABLE_MYSQL_ERRORS
+    if isinstance(error, sqlite3.OperationalError):
+        message = str(error).lower()
+        return 'locked' in message or 'busy' in message
+    return False
+
+
+def load_partition(connections, partition, batch_size=BATCH_SIZE, retries=DEADLOCK_RETRIES):
+    """Bir bölümü havuzdaki bir bağlantıyla tek transaction'da upsert et
+
+    Upsert sayesinde yeniden deneme (veya aynı bölümün tekrar yüklenmesi) hücreyi çoğaltmaz.
+    (satır sayısı, deneme sayısı, süre) döndürür.
+    """
+    connection = connections.get()
+    try:
+        start = time.perf_counter()
+        for attempt in range(retries + 1):
+            try:
+                bulk_insert_values(connection, partition['table'], partition['columns'],
+                                   partition['rows'], batch_size, upsert=True, quiet=True)
+                return len(partition['rows']), attempt, time.perf_counter() - start
+            except Exception as e:
+                connection.rollback()
+                if attempt == retries or not is_retryable(e):
+                    raise
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+    finally:
+        connections.put(connection)
+
+
+def parallel_populate_values(connection, df, string_cols, numeric_cols,
+                             string_col_ids, numeric_col_ids, run_ids, connect,
+                             workers=4, partitions=None, batch_size=BATCH_SIZE):
+    """String ve numeric değerleri worker bağlantılarıyla eşzamanlı yükle
+
+    connect: yeni bağlantı açan fonksiyon (worker başına bir tane)
+    partitions: tablo başına run_id aralığı sayısı (varsayılan workers * PARTITIONS_PER_WORKER)
+    Sözlük kodları önce ana bağlantıda atanıp commit edilir (worker'lar FK ile görür).
+    Her bölüm kendi transaction'ıdır; sonunda bölüm bazlı tutarlılık kontrolü yapılır.
+    """
+    print(f"\n📦 Değerler paralel yükleniyor ({workers} worker)...")
+    start = time.perf_counter()
+
+    long_frames = {
+        'string': melt_values(df, string_cols, string_col_ids, run_ids, 'string'),
+        'numeric': melt_values(df, numeric_cols, numeric_col_ids, run_ids, 'numeric'),
+    }
+    long_frames['string'] = encode_string_values(connection, long_frames['string'], batch_size)
+    connection.commit()
+
+    parts = partition_values(long_frames, run_ids, partitions or workers * PARTITIONS_PER_WORKER)
+    total_rows = sum(len(part['rows']) for part in parts)
+
+    connections = queue.Queue()
+    opened = []
+    try:
+        for _ in range(workers):
+            worker_connection = connect()
+            if worker_connection is None:
+                raise RuntimeError("Worker bağlantısı açılamadı")
+            opened.append(worker_connection)
+            connections.put(worker_connection)
+
+        done_parts = done_rows = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(load_partition, connections, part, batch_size): part
+                       for part in parts}
+            pending = set(futures)
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_EXCEPTION)
+                for future in finished:
+                    part = futures[future]
+                    if future.exception() is not None:
+                        for other in pending:
+                            other.cancel()
+                        raise RuntimeError(
+                            f"{part['table']} run_id {part['low']}-{part['high']} yüklenemedi: "
+                            f"{future.exception()}") from future.exception()
+                    rows, retries, elapsed = future.result()
+                    done_parts += 1
+                    done_rows += rows
+                    print(f"  [{done_parts}/{len(parts)}] {part['table']} run_id "
+                          f"{part['low']}-{part['high']}: {rows} satır, {elapsed:.2f} sn"
+                          + (f" ({retries} yeniden deneme)" if retries else "")
+                          + f" | toplam {done_rows}/{total_rows}")
+    finally:
+        for worker_connection in opened:
+            worker_connection.close()
+
+    problems = check_consistency(connection, parts)
+    if problems:
+        raise RuntimeError("Paralel yükleme tutarsız: " + "; ".join(problems))
+
+    elapsed = time.perf_counter() - start
+    rate = total_rows / elapsed if elapsed > 0 else float('inf')
+    print(f"✓ {len(parts)} bölüm, {total_rows} satır, {elapsed:.2f} sn ({rate:,.0f} satır/sn)")
+    return long_frames
+
+def discard_runs(connection, run_ids):
+    """Yarıda kalan tam yüklemenin run'larını ve commit edilmiş değerlerini sil
+
+    Paralel bölümler / seri tablo yüklemeleri kendi commit'lerini yapar; hata sonrası
+    bunlar silinmezse tekrar çalıştırma aynı run'ları yeni id'lerle ekler
+    (parmak izi yazılmadığı için --incremental da göremez). Sözlük satırları kalır:
+    sonraki yükleme aynı kodları kullanır.
+    """
+    ids = np.sort(np.asarray(run_ids, dtype=np.int64))
+    if not len(ids):
+        return
+    # Ardışık aralıklar (eşzamanlı yükleyicinin run'larına dokunulmaz)
+    ranges = [(int(chunk[0]), int(chunk[-1]))
+              for chunk in np.split(ids, np.flatnonzero(np.diff(ids) != 1) + 1)]
+    cursor = connection.cursor()
+    for table in [table for table, _ in VALUE_TABLES.values()] + ['run_fingerprints', MV_TABLE, 'runs']:
+        cursor.executemany(f"DELETE FROM {table} WHERE run_id BETWEEN %s AND %s", ranges)
+    connection.commit()
+    print(f"↩ Yarım kalan yükleme geri alındı: {len(ids)} run silindi")
+
+# ============================================================================
+# INCREMENTAL YÜKLEME: Run Parmak İzleri
+# ============================================================================
+
+def normalize_frame(df, string_cols, numeric_cols):
+    """Değerleri veritabanında saklandıkları biçime getir (str / 5 haneli float)"""
+    normalized = pd.DataFrame(index=df.index)
+    normalized['timestamp'] = df['timestamp'].astype(str)
+    for col in string_cols:
+        normalized[col] = df[col].map(str, na_action='ignore')
+    for col in numeric_cols:
+        normalized[col] = df[col].astype(float).round(5)
+    return normalized
+
+
+def compute_fingerprints(df, string_cols, numeric_cols):
+    """Her satır için (natural_key, row_hash) uint64 dizileri - vektörel
+
+    natural_key: timestamp + job_number + cylinder_number (run kimliği)
+    row_hash: tüm nitelikler (değişiklik tespiti)
+    """
+    normalized = normalize_frame(df, string_cols, numeric_cols)
+    natural_key = pd.util.hash_pandas_object(normalized[NATURAL_KEY_COLS], index=False)
+    row_hash = pd.util.hash_pandas_object(normalized, index=False)
+    return natural_key.to_numpy(dtype=np.uint64), row_hash.to_numpy(dtype=np.uint64)
+
+
+def drop_duplicate_runs(df, string_cols, numeric_cols):
+    """Aynı doğal anahtarlı satırlardan sadece sonuncusu kalır (besleme sırasında son hali geçerli)
+
+    run_fingerprints.natural_key UNIQUE: tam ve incremental yükleme aynı run kümesini
+    yazmalı, yoksa ikinci run'ın parmak izi birincininkinin üstüne yazılır.
+    """
+    keys = normalize_frame(df, [col for col in string_cols if col in NATURAL_KEY_COLS],
+                           [col for col in numeric_cols if col in NATURAL_KEY_COLS])
+    duplicated = keys[NATURAL_KEY_COLS].duplicated(keep='last').to_numpy()
+    if duplicated.any():
+        print(f"⚠️  Aynı doğal anahtarlı {int(duplicated.sum())} satır atlandı "
+              f"({', '.join(NATURAL_KEY_COLS)}; son hali yüklenir)")
+        df = df[~duplicated].reset_index(drop=True)
+    return df
+
+
+def fetch_in_batches(cursor, sql, keys, batch_size=LOOKUP_BATCH_SIZE):
+    """'... IN ({})' sorgusunu anahtar grupları halinde çalıştır, tüm satırları döndür"""
+    rows = []
+    for offset in range(0, len(keys), batch_size):
+        batch = keys[offset:offset + batch_size]
+        cursor.execute(sql.format(', '.join(['%s'] * len(batch))), batch)
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def fingerprint_dtype(connection):
+    """Parmak izlerinin veritabanına yazıldığı tip
+
+    MySQL BIGINT UNSIGNED -> uint64; SQLite INTEGER işaretli -> aynı bitler int64
+    (okurken .astype(np.uint64) geri çevirir)
+    """
+    return np.int64 if dialect_of(connection) == 'sqlite' else np.uint64
+
+
+def save_fingerprints(connection, run_ids, natural_keys, row_hashes,
+                      batch_size=BATCH_SIZE, commit=True):
+    """run_fingerprints tablosuna ekle / güncelle"""
+    key_dtype = fingerprint_dtype(connection)
+    fingerprints = pd.DataFrame({
+        'run_id': np.asarray(run_ids, dtype=np.int64),
+        'natural_key': np.asarray(natural_keys, dtype=np.uint64).view(key_dtype),
+        'row_hash': np.asarray(row_hashes, dtype=np.uint64).view(key_dtype),
+    })
+    bulk_insert_values(
+        connection, 'run_fingerprints', ['run_id', 'natural_key', 'row_hash'],
+        fingerprints, batch_size, upsert=True, commit=commit
+    )
+
+
+def diff_values(cursor, value_type, long_df, run_ids):
+    """Değişen run'ların hücrelerini veritabanıyla karşılaştır
+
+    (upsert edilecek satırlar, silinecek (run_id, col_id) çiftleri,
+    mevcut (run_id, col_id, value) satırları) döndürür.
+    String hücreler koduyla karşılaştırılır (long_df: encode_string_values çıktısı).
+    """
+    table, (_, col_id_col, value_col) = VALUE_TABLES[value_type]
+    key = 'code' if value_type == 'string' else 'value'
+    existing = pd.DataFrame(
+        fetch_in_batches(
+            cursor,
+            f"SELECT run_id, {col_id_col}, {value_col} FROM {table} WHERE run_id IN ({{}})",
+            run_ids
+        ),
+        columns=['run_id', 'col_id', 'old_value']
+    ).astype({'run_id': 'int64', 'col_id': 'int64'})
+    if value_type == 'numeric':
+        existing['old_value'] = existing['old_value'].astype(float)
+        long_df = long_df.assign(value=long_df['value'].round(5))
+
+    merged = long_df.merge(existing, on=['run_id', 'col_id'], how='outer', indicator=True)
+
+    # Yeni veya değeri değişen hücreler -> upsert
+    changed = merged[
+        (merged['_merge'] == 'left_only')
+        | ((merged['_merge'] == 'both') & (merged[key] != merged['old_value']))
+    ]
+    # Artık NULL olan hücreler -> sil
+    removed = merged[merged['_merge'] == 'right_only']
+
+    upserts = changed[['run_id', 'col_id', key]].astype({'run_id': 'int64', 'col_id': 'int64'})
+    deletes = list(removed[['run_id', 'col_id']].astype('int64').itertuples(index=False, name=None))
+    existing = existing.rename(columns={'old_value': key})
+    if value_type == 'string':
+        # Küp eski katkıyı değer üzerinden çıkarır
+        dictionary = fetch_dictionary(cursor, existing['col_id'].unique().tolist())
+        existing = decode_frame(existing, dict(zip(dictionary['code'], dictionary['value'])))
+    return upserts, deletes, existing
+
+
+def incremental_load(connection, df, string_cols, numeric_cols,
+                     string_col_ids, numeric_col_ids, batch_size=BATCH_SIZE):
+    """Sadece yeni run'ları ekle, değişen run'ların sadece değişen hücrelerini güncelle"""
+    cursor = connection.cursor()
+    
+    print("\n🔁 Incremental yükleme başlıyor...")
+    start = time.perf_counter()
+    
+    natural_keys, row_hashes = compute_fingerprints(df, string_cols, numeric_cols)
+    feed = pd.DataFrame({'natural_key': natural_keys, 'row_hash': row_hashes})
+    # Aynı run beslemede birden fazla kez geçiyorsa son hali geçerli (drop_duplicate_runs)
+    feed = feed[~feed['natural_key'].duplicated(keep='last')]
+    
+    # Sadece beslemedeki anahtarlar için mevcut parmak izlerini çek (indexli arama)
+    existing = pd.DataFrame(
+        fetch_in_batches(
+            cursor,
+            "SELECT natural_key, run_id, row_hash FROM run_fingerprints WHERE natural_key IN ({})",
+            feed['natural_key'].to_numpy(dtype=np.uint64).view(fingerprint_dtype(connection)).tolist()
+        ),
+        columns=['natural_key', 'run_id', 'old_hash']
+    ).astype({'natural_key': np.uint64, 'run_id': np.int64, 'old_hash': np.uint64})
+    
+    feed = feed.reset_index()
+    known = feed.merge(existing, on='natural_key', how='inner')
+    
+    new_rows = feed[~feed['natural_key'].isin(existing['natural_key'])]
+    changed_rows = known[known['row_hash'] != known['old_hash']]
+    print(f"  Besleme: {len(feed)} run | yeni: {len(new_rows)} | "
+          f"değişen: {len(changed_rows)} | aynı: {len(feed) - len(new_rows) - len(changed_rows)}")
+    
+    # 1. Yeni run'lar -> runs + değerler + parmak izleri
+    cube_deltas = []
+    if len(new_rows):
+        new_df = df.loc[new_rows['index']]
+        run_ids = populate_runs_table(connection, new_df, batch_size, commit=False)
+        long_frames = bulk_populate_values(connection, new_df, string_cols, numeric_cols,
+                                           string_col_ids, numeric_col_ids, run_ids,
+                                           batch_size=batch_size, commit=False)
+        cube_deltas.append(cube_contributions(long_frames['string'], long_frames['numeric']))
+        save_fingerprints(connection, run_ids, new_rows['natural_key'],
+                          new_rows['row_hash'], batch_size, commit=False)
+        sync_production_runs(connection, new_df, run_ids, string_cols, numeric_cols,
+                             batch_size, commit=False)
+    
+    # 2. Değişen run'lar -> sadece değişen hücreler
+    upserted = deleted = 0
+    if len(changed_rows):
+        changed_df = df.loc[changed_rows['index']]
+        run_ids = changed_rows['run_id'].to_numpy(dtype=np.int64)
+        old_state, new_state = {}, {}
+        
+        for value_type, cols, col_ids in (('string', string_cols, string_col_ids),
+                                          ('numeric', numeric_cols, numeric_col_ids)):
+            table, columns = VALUE_TABLES[value_type]
+            long_df = melt_values(changed_df, cols, col_ids, run_ids, value_type)
+            if value_type == 'string':
+                long_df = encode_string_values(connection, long_df, batch_size)
+            upserts, deletes, existing = diff_values(cursor, value_type, long_df, run_ids.tolist())
+            
+            # Sadece yüklenen sütunlara ait hücreler silinir
+            known_ids = set(col_ids.values())
+            deletes = [pair for pair in deletes if pair[1] in known_ids]
+            
+            # Küp: run'ların eski hali çıkar, yeni hali (yüklenmeyen sütunlar aynen) eklenir
+            old_state[value_type] = existing
+            new_state[value_type] = pd.concat(
+                [existing[~existing['col_id'].isin(known_ids)], long_df], ignore_index=True
+            )
+            
+            if len(upserts):
+                bulk_insert_values(connection, table, columns, upserts,
+                                   batch_size, upsert=True, commit=False)
+            if deletes:
+                cursor.executemany(
+                    f"DELETE FROM {table} WHERE run_id = %s AND {columns[1]} = %s",
+                    deletes
+                )
+            upserted += len(upserts)
+            deleted += len(deletes)
+        
+        save_fingerprints(connection, run_ids, changed_rows['natural_key'],
+                          changed_rows['row_hash'], batch_size, commit=False)
+        sync_production_runs(connection, changed_df, run_ids, string_cols, numeric_cols,
+                             batch_size, commit=False)
+        cube_deltas.append(cube_contributions(old_state['string'], old_state['numeric'], sign=-1))
+        cube_deltas.append(cube_contributions(new_state['string'], new_state['numeric']))
+    
+    if len(new_rows) or len(changed_rows):
+        update_rollup_cube(connection, combine_deltas(*cube_deltas), batch_size, commit=False)
+        bump_data_version(connection)
+    connection.commit()
+    elapsed = time.perf_counter() - start
+    print(f"✓ Incremental yükleme: {len(new_rows)} yeni run, {upserted} hücre upsert, "
+          f"{deleted} hücre silindi ({elapsed:.2f} sn)")
+    return {'new_runs': len(new_rows), 'changed_runs': len(changed_rows),
+            'upserted_cells': upserted, 'deleted_cells': deleted}
+
+# ============================================================================
+# MATERIALIZED production_runs + DATA VERSION
+# ============================================================================
+
+def get_materialized_version(cursor, name):
+    cursor.execute("SELECT data_version FROM materialized_state WHERE name = %s", (name,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def set_materialized_version(cursor, name, version):
+    cursor.execute(
+        "REPLACE INTO materialized_state (name, data_version) VALUES (%s, %s)",
+        (name, version)
+    )
+
+
+def bump_data_version(connection, synced=(MV_TABLE, CUBE_TABLE)):
+    """load_state.data_version'ı artır (yüklemeyle aynı transaction'da)
+
+    synced: bu yüklemede senkron tutulan materialized tablolar. Yükleme öncesi
+    güncel olanlar yeni versiyona taşınır; zaten bayat olanlar bayat kalır.
+    """
+    cursor = connection.cursor()
+    # FOR UPDATE -> eşzamanlı yükleyiciler sırayla versiyon alır
+    cursor.execute("SELECT data_version FROM load_state WHERE id = 1"
+                   + lock_clause(dialect_of(connection)))
+    old_version = cursor.fetchone()[0]
+    new_version = old_version + 1
+    cursor.execute("UPDATE load_state SET data_version = %s WHERE id = 1", (new_version,))
+
+    for name in synced:
+        if get_materialized_version(cursor, name) == old_version:
+            set_materialized_version(cursor, name, new_version)
+        else:
+            print(f"⚠ {name} zaten bayattı, yenileyin: python load_data.py --refresh-mv")
+    return new_version
+
+
+def sync_production_runs(connection, df, run_ids, string_cols, numeric_cols,
+                         batch_size=BATCH_SIZE, commit=True):
+    """Verilen run'ları production_runs tablosuna toplu upsert et"""
+    cursor = connection.cursor()
+    table_cols = set(table_columns(cursor, MV_TABLE))
+    
+    missing = [c for c in string_cols + numeric_cols if c not in table_cols]
+    if missing:
+        print(f"⚠ {MV_TABLE} tablosunda olmayan sütunlar atlandı: {missing}")
+    string_cols = [c for c in string_cols if c in table_cols]
+    numeric_cols = [c for c in numeric_cols if c in table_cols]
+    
+    wide = normalize_frame(df, string_cols, numeric_cols)
+    wide.insert(0, 'run_id', np.asarray(run_ids, dtype=np.int64))
+    wide = wide.astype(object).where(wide.notna(), None)  # NaN -> NULL
+    
+    columns = list(wide.columns)
+    bulk_insert_values(connection, MV_TABLE, columns, wide, batch_size,
+                       upsert=True, update_columns=columns[1:], commit=commit)
+
+
+def refresh_production_runs(connection):
+    """production_runs tablosunu EAV tablolarından baştan üret"""
+    cursor = connection.cursor()
+    
+    print(f"\n🔄 {MV_TABLE} yenileniyor...")
+    start = time.perf_counter()
+    
+    # Yenileme sırasında yükleme yapılmasın
+    cursor.execute("SELECT data_version FROM load_state WHERE id = 1"
+                   + lock_clause(dialect_of(connection)))
+    version = cursor.fetchone()[0]
+    
+    table_cols = set(table_columns(cursor, MV_TABLE))
+    cursor.execute("SELECT stringcol_id, column_name FROM stringcols")
+    string_pairs = [(cid, name) for cid, name in cursor.fetchall() if name in table_cols]
+    cursor.execute("SELECT numericcol_id, column_name FROM numericcols")
+    numeric_pairs = [(cid, name) for cid, name in cursor.fetchall() if name in table_cols]
+    
+    # Her değer tablosu kendi içinde run_id'ye göre pivot'lanır (çapraz çarpım yok)
+    string_pivot = ",\n".join(
+        f"MAX(CASE WHEN sv.stringcol_id = {cid} THEN d.string_value END) AS `{name}`"
+        for cid, name in string_pairs
+    )
+    numeric_pivot = ",\n".join(
+        f"MAX(CASE WHEN numericcol_id = {cid} THEN numeric_value END) AS `{name}`"
+        for cid, name in numeric_pairs
+    )
+    columns = [name for _, name in string_pairs + numeric_pairs]
+    select_cols = [f"s.`{name}`" for _, name in string_pairs] + [f"n.`{name}`" for _, name in numeric_pairs]
+    
+    cursor.execute(f"DELETE FROM {MV_TABLE}")
+    cursor.execute(f"""
+        INSERT INTO {MV_TABLE} (run_id, timestamp, {', '.join(f'`{c}`' for c in columns)})
+        SELECT r.run_id, r.timestamp, {', '.join(select_cols)}
+        FROM runs r
+        LEFT JOIN (
+            SELECT sv.run_id, {string_pivot}
+            FROM runid_stringvalues sv
+            JOIN string_dictionary d ON d.string_code = sv.string_code
+            GROUP BY sv.run_id
+        ) s ON s.run_id = r.run_id
+        LEFT JOIN (
+            SELECT run_id, {numeric_pivot}
+            FROM runid_numericvalues GROUP BY run_id
+        ) n ON n.run_id = r.run_id
+    """)
+    row_count = cursor.rowcount
+    set_materialized_version(cursor, MV_TABLE, version)
+    connection.commit()
+    print(f"✓ {MV_TABLE}: {row_count} run yazıldı, data_version={version} "
+          f"({time.perf_counter() - start:.2f} sn)")
+
+
+def update_rollup_cube(connection, delta, batch_size=BATCH_SIZE, commit=True):
+    """Küp delta'sını mevcut hücrelere ekle, boşalan hücreleri sil"""
+    if not len(delta):
+        return
+    bulk_insert_values(connection, CUBE_TABLE, CUBE_COLUMNS, delta, batch_size,
+                       upsert=True, update_columns=['n', 'total', 'total_sq'],
+                       increment=True, commit=False)
+    cursor = connection.cursor()
+    cursor.execute(f"DELETE FROM {CUBE_TABLE} WHERE n <= 0")
+    if commit:
+        connection.commit()
+
+
+def refresh_rollup_cube(connection):
+    """rollup_cube'u değer tablolarından baştan üret (kod üzerinde GROUP BY, taşınabilir SQL)"""
+    cursor = connection.cursor()
+    
+    print(f"\n🔄 {CUBE_TABLE} yenileniyor...")
+    start = time.perf_counter()
+    
+    cursor.execute("SELECT data_version FROM load_state WHERE id = 1"
+                   + lock_clause(dialect_of(connection)))
+    version = cursor.fetchone()[0]
+    
+    cursor.execute(f"DELETE FROM {CUBE_TABLE}")
+    cursor.execute(f"""
+        INSERT INTO {CUBE_TABLE} ({', '.join(CUBE_COLUMNS)})
+        SELECT d.stringcol_id, 0, d.string_value, g.n, 0, 0
+        FROM (
+            SELECT string_code, COUNT(*) AS n
+            FROM runid_stringvalues
+            GROUP BY string_code
+        ) g
+        JOIN string_dictionary d ON d.string_code = g.string_code
+    """)
+    cursor.execute(f"""
+        INSERT INTO {CUBE_TABLE} ({', '.join(CUBE_COLUMNS)})
+        SELECT d.stringcol_id, g.numericcol_id, d.string_value, g.n, g.total, g.total_sq
+        FROM (
+            SELECT sv.string_code, nv.numericcol_id, COUNT(*) AS n,
+                   SUM(nv.numeric_value) AS total,
+                   SUM(nv.numeric_value * nv.numeric_value) AS total_sq
+            FROM runid_stringvalues sv
+            JOIN runid_numericvalues nv ON nv.run_id = sv.run_id
+            WHERE nv.numeric_value IS NOT NULL
+            GROUP BY sv.string_code, nv.numericcol_id
+        ) g
+        JOIN string_dictionary d ON d.string_code = g.string_code
+    """)
+    cursor.execute(f"SELECT COUNT(*) FROM {CUBE_TABLE}")
+    cell_count = cursor.fetchone()[0]
+    set_materialized_version(cursor, CUBE_TABLE, version)
+    connection.commit()
+    print(f"✓ {CUBE_TABLE}: {cell_count} hücre yazıldı, data_version={version} "
+          f"({time.perf_counter() - start:.2f} sn)")
+
+
+def check_staleness(connection, name=MV_TABLE):
+    """Materialized tablo mevcut data_version'ın gerisinde mi?"""
+    cursor = connection.cursor()
+    cursor.execute("SELECT data_version FROM load_state WHERE id = 1")
+    data_version = cursor.fetchone()[0]
+    materialized_version = get_materialized_version(cursor, name)
+    stale = materialized_version != data_version
+    
+    status = "BAYAT" if stale else "güncel"
+    print(f"  {name}: {status} (data_version={data_version}, "
+          f"materialized={materialized_version})")
+    return {'data_version': data_version,
+            'materialized_version': materialized_version,
+            'stale': stale}
+
 # ============================================================================
 # 8. ADIM: Doğrulama
 # ============================================================================
 
-def verify_data(connection):
-    """Yüklenen veriyi doğrula"""
+def check_consistency(connection, partitions=None):
+    """Değer tablolarının tutarlılığı -> bulunan sorunların listesi (boş: tutarlı)
+
+    - runs'ta olmayan run_id'ye ait hücre
+    - kodu başka bir sütunun sözlük satırını gösteren string hücre
+    - partitions verilirse: her (tablo, run_id aralığı) için beklenen hücre sayısı
+    """
+    cursor = connection.cursor()
+    problems = []
+    for table, _ in VALUE_TABLES.values():
+        cursor.execute(f"""
+            SELECT COUNT(*) FROM {table} v
+            LEFT JOIN runs r ON r.run_id = v.run_id
+            WHERE r.run_id IS NULL
+        """)
+        orphans = cursor.fetchone()[0]
+        if orphans:
+            problems.append(f"{table}: runs'ta olmayan {orphans} hücre")
+
+    cursor.execute(f"""
+        SELECT COUNT(*) FROM runid_stringvalues sv
+        JOIN {DICTIONARY_TABLE} d ON d.string_code = sv.string_code
+        WHERE d.stringcol_id <> sv.stringcol_id
+    """)
+    mismatched = cursor.fetchone()[0]
+    if mismatched:
+        problems.append(f"runid_stringvalues: başka sütunun sözlük kodunu taşıyan {mismatched} hücre")
+
+    for part in partitions or []:
+        cursor.execute(f"SELECT COUNT(*) FROM {part['table']} WHERE run_id BETWEEN %s AND %s",
+                       (part['low'], part['high']))
+        count = cursor.fetchone()[0]
+        if count != len(part['rows']):
+            problems.append(f"{part['table']} run_id {part['low']}-{part['high']}: "
+                            f"{count} hücre, beklenen {len(part['rows'])}")
+    return problems
+
+
+def verify_data(connection, partitions=None):
+    """Yüklenen veriyi doğrula (partitions: paralel yüklemenin bölümleri)"""
     cursor = connection.cursor()
     
     print("\n✅ Doğrulama yapılıyor...")
@@ -252,6 +1125,10 @@ def verify_data(connection):
     string_value_count = cursor.fetchone()[0]
     print(f"  String değerler: {string_value_count}")
     
+    cursor.execute(f"SELECT COUNT(*) FROM {DICTIONARY_TABLE}")
+    dictionary_count = cursor.fetchone()[0]
+    print(f"  String sözlüğü: {dictionary_count} farklı değer")
+    
     cursor.execute("SELECT COUNT(*) FROM runid_numericvalues")
     numeric_value_count = cursor.fetchone()[0]
     print(f"  Numeric değerler: {numeric_value_count}")
@@ -259,54 +1136,165 @@ def verify_data(connection):
     # Örnek sorgu
     print("\n📊 Örnek veri:")
     cursor.execute("""
-        SELECT r.run_id, r.timestamp, sc.column_name, sv.string_value
+        SELECT r.run_id, r.timestamp, sc.column_name, d.string_value
         FROM runs r
         JOIN runid_stringvalues sv ON r.run_id = sv.run_id
+        JOIN string_dictionary d ON d.string_code = sv.string_code
         JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
-        WHERE r.run_id = 1 AND sc.column_name = 'customer'
+        WHERE r.run_id = (SELECT MIN(run_id) FROM runs) AND sc.column_name = 'customer'
     """)
     result = cursor.fetchone()
     if result:
-        print(f"  Run 1 -> customer: {result[3]}")
+        print(f"  Run {result[0]} -> customer: {result[3]}")
+    
+    # Tutarlılık kontrolü
+    problems = check_consistency(connection, partitions)
+    for problem in problems:
+        print(f"  ✗ {problem}")
+    if not problems:
+        checked = f", {len(partitions)} bölüm" if partitions else ""
+        print(f"  ✓ Tutarlılık kontrolü geçti (yetim hücre yok{checked})")
+    return not problems
 
 # ============================================================================
 # ANA FONKSİYON
 # ============================================================================
 
-def main():
-    """Ana yükleme fonksiyonu"""
+def maintain_materialized(refresh=False, sqlite_path=None):
+    """production_runs staleness kontrolü, gerekirse / istenirse yenileme"""
+    connection = connect_to_db(sqlite_path=sqlite_path)
+    if not connection:
+        return
+    
+    try:
+        states = [check_staleness(connection, name) for name in (MV_TABLE, CUBE_TABLE)]
+        if refresh:
+            refresh_production_runs(connection)
+            refresh_rollup_cube(connection)
+            refresh_statistics_snapshot(connection)
+        elif any(state['stale'] for state in states):
+            print("  Yenilemek için: python load_data.py --refresh-mv")
+    except Exception as e:
+        print(f"\n❌ HATA: {e}")
+        connection.rollback()
+    finally:
+        connection.close()
+
+
+def main(mode='bulk', batch_size=BATCH_SIZE, use_infile=False, incremental=False,
+         snapshot=None, use_snapshot=True, sqlite_path=None, workers=1):
+    """Ana yükleme fonksiyonu
+
+    mode='bulk' -> melt + executemany / LOAD DATA (varsayılan)
+    mode='row'  -> hücre başına INSERT (eski yol, karşılaştırma için)
+    workers > 1 -> bulk değer yüklemesi run_id aralığı x tablo bölümleri halinde,
+                   worker başına ayrı bağlantıyla eşzamanlı (tam yükleme)
+    incremental=True -> sadece yeni run'lar ve değişen hücreler (run_fingerprints)
+    snapshot -> cleaning.py'nin Arrow snapshot'ı (varsayılan: CSV ile aynı isim, .arrow);
+                varsa CSV yerine o okunur
+    sqlite_path -> MySQL yerine gömülü SQLite dosyasına yükle
+    """
     print("="*80)
     print("CSV -> METADATA-DRIVEN ER DİYAGRAM VERİ YÜKLEME")
     print("="*80)
     
     # CSV dosya yolu
     csv_path = '/mnt/user-data/uploads/cleaned_cylinder.csv'
+    snapshot = snapshot or os.path.splitext(csv_path)[0] + '.arrow'
     
     # 1. MySQL'e bağlan
-    connection = connect_to_db()
+    connection = connect_to_db(allow_local_infile=use_infile, sqlite_path=sqlite_path)
     if not connection:
         return
     
+    pending_run_ids = None  # commit edilmiş ama yüklemesi tamamlanmamış run'lar
     try:
-        # 2. CSV'yi yükle ve temizle
-        df = load_and_clean_csv(csv_path)
-        
-        # 3. Sütunları kategorize et
-        string_cols, numeric_cols = categorize_columns(df)
+        input_start = time.perf_counter()
+        if use_snapshot and pa is not None and os.path.exists(snapshot):
+            # 2-3. Tipli snapshot: sınıflandırma gömülü
+            df, string_cols, numeric_cols = load_snapshot(snapshot)
+        else:
+            if use_snapshot and pa is None:
+                print("ℹ pyarrow kurulu değil, CSV yolu kullanılıyor")
+            # 2. CSV'yi yükle ve temizle
+            df = load_and_clean_csv(csv_path)
+            
+            # 3. Sütunları kategorize et
+            string_cols, numeric_cols = categorize_columns(df)
+        df = drop_duplicate_runs(df, string_cols, numeric_cols)
+        print(f"⏱  Girdi hazırlama: {time.perf_counter() - input_start:.3f} sn")
         
         # 4. Metadata tablolarını doldur
         string_col_ids, numeric_col_ids = populate_metadata_tables(
             connection, string_cols, numeric_cols
         )
         
-        # 5. Runs tablosunu doldur
-        populate_runs_table(connection, df)
-        
-        # 6. String değerlerini yükle
-        populate_string_values(connection, df, string_cols, string_col_ids)
+        load_start = time.perf_counter()
+        parallel = mode == 'bulk' and workers > 1 and not incremental
+        if workers > 1 and not parallel:
+            print("ℹ --workers sadece bulk tam yüklemede kullanılır, seri yükleniyor")
+        if parallel and sqlite_path:
+            print("ℹ SQLite tek yazıcılıdır: bölümler sırayla yazılır, hızlanma beklenmez")
+        if parallel and use_infile:
+            print("ℹ Paralel yükleme upsert kullanır, --infile yok sayıldı")
+        if incremental:
+            # 5-7. Sadece yeni / değişen run'lar
+            incremental_load(
+                connection, df, string_cols, numeric_cols,
+                string_col_ids, numeric_col_ids, batch_size=batch_size
+            )
+        else:
+            # 5. Runs tablosunu doldur (gerçek run_id'ler döner)
+            run_ids = populate_runs_table(connection, df, batch_size=batch_size)
+            pending_run_ids = run_ids
+            
+            if parallel:
+                # 6-7. Değerleri bölümler halinde eşzamanlı yükle
+                long_frames = parallel_populate_values(
+                    connection, df, string_cols, numeric_cols,
+                    string_col_ids, numeric_col_ids, run_ids,
+                    connect=lambda: connect_to_db(sqlite_path=sqlite_path),
+                    workers=workers, batch_size=batch_size
+                )
+            elif mode == 'bulk':
+                # 6-7. Değerleri toplu yükle
+                long_frames = bulk_populate_values(
+                    connection, df, string_cols, numeric_cols,
+                    string_col_ids, numeric_col_ids, run_ids,
+                    batch_size=batch_size, use_infile=use_infile
+                )
+            else:
+                # 6. String değerlerini yükle
+                populate_string_values(connection, df, string_cols, string_col_ids, run_ids)
+                
+                # 7. Numeric değerlerini yükle
+                populate_numeric_values(connection, df, numeric_cols, numeric_col_ids, run_ids)
+                long_frames = {
+                    'string': melt_values(df, string_cols, string_col_ids, run_ids, 'string'),
+                    'numeric': melt_values(df, numeric_cols, numeric_col_ids, run_ids, 'numeric'),
+                }
+            
+            # Sonraki incremental yüklemeler için parmak izleri
+            natural_keys, row_hashes = compute_fingerprints(df, string_cols, numeric_cols)
+            save_fingerprints(connection, run_ids, natural_keys, row_hashes, batch_size)
+            
+            # Materialized geniş tablo + data_version
+            sync_production_runs(connection, df, run_ids, string_cols, numeric_cols,
+                                 batch_size, commit=False)
+            
+            # Rollup küpü: yeni run'ların katkısı
+            update_rollup_cube(connection, cube_contributions(long_frames['string'],
+                                                              long_frames['numeric']),
+                               batch_size, commit=False)
+            bump_data_version(connection)
+            connection.commit()
+            pending_run_ids = None
+        print(f"\n⏱  Yükleme süresi ({'incremental' if incremental else mode}): "
+              f"{time.perf_counter() - load_start:.2f} sn")
         
-        # 7. Numeric değerlerini yükle
-        populate_numeric_values(connection, df, numeric_cols, numeric_col_ids)
+        # Dashboard istatistik snapshot'ını yeni data_version için hesapla
+        version, _ = refresh_statistics_snapshot(connection)
+        print(f"✓ İstatistik snapshot'ı güncellendi (data_version={version})")
         
         # 8. Doğrulama
         verify_data(connection)
@@ -318,13 +1306,45 @@ def main():
     except Exception as e:
         print(f"\n❌ HATA: {e}")
         connection.rollback()
+        if pending_run_ids is not None:
+            # Tekrar çalıştırma aynı run'ları bir kez daha eklemesin
+            discard_runs(connection, pending_run_ids)
     
     finally:
         connection.close()
         print("\n👋 Bağlantı kapatıldı")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Cylinder bands veri yükleyici")
+    parser.add_argument('--mode', choices=['bulk', 'row'], default='bulk',
+                        help="bulk: toplu yükleme, row: hücre başına INSERT")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help="executemany başına satır sayısı")
+    parser.add_argument('--infile', action='store_true',
+                        help="LOAD DATA LOCAL INFILE kullan (sunucuda local_infile=1 olmalı)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Sadece yeni run'ları ekle, değişen hücreleri güncelle")
+    parser.add_argument('--check-mv', action='store_true',
+                        help="production_runs / rollup_cube tablolarının güncel olup olmadığını kontrol et")
+    parser.add_argument('--refresh-mv', action='store_true',
+                        help="production_runs / rollup_cube tablolarını EAV tablolarından yeniden üret")
+    parser.add_argument('--snapshot', default=None,
+                        help="cleaning.py'nin Arrow snapshot yolu (varsayılan: CSV ile aynı isim, .arrow)")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help="Snapshot olsa bile CSV'den oku")
+    parser.add_argument('--sqlite', default=None, metavar='PATH',
+                        help="MySQL yerine gömülü SQLite dosyasına yükle (yoksa oluşturulur)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Değer tablolarını bu kadar bağlantıyla paralel yükle (bulk tam yükleme)")
+    args = parser.parse_args()
+    
+    if args.check_mv or args.refresh_mv:
+        maintain_materialized(refresh=args.refresh_mv, sqlite_path=args.sqlite)
+    else:
+        main(mode=args.mode, batch_size=args.batch_size, use_infile=args.infile,
+             incremental=args.incremental, snapshot=args.snapshot,
+             use_snapshot=not args.no_snapshot, sqlite_path=args.sqlite,
+             workers=args.workers)
 
 
 
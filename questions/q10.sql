@@ -7,13 +7,14 @@ USE cylinder_bands_db;
 --   - varnish_pct (numeric)
 
 SELECT 
-    sv.string_value AS solvent_type,
+    d.string_value AS solvent_type,
     SUM(nv.numeric_value) AS total_varnish_pct,
     AVG(nv.numeric_value) AS avg_varnish_pct,
     COUNT(DISTINCT r.run_id) AS run_count
 FROM runs r
 -- Solvent type için JOIN
 JOIN runid_stringvalues sv ON r.run_id = sv.run_id
+JOIN string_dictionary d ON d.string_code = sv.string_code
 JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     AND sc.column_name = 'solvent_type'
 -- Varnish percentage için JOIN
@@ -21,7 +22,7 @@ JOIN runid_numericvalues nv ON r.run_id = nv.run_id
 JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
     AND nc.column_name = 'varnish_pct'
 WHERE nv.numeric_value IS NOT NULL
-GROUP BY sv.string_value
+GROUP BY d.string_code
 ORDER BY total_varnish_pct DESC;
 
 
@@ -34,26 +35,28 @@ EAV modelinde tüm sorgular aşağıdaki pattern'i takip eder:
 1. runs tablosundan başla
 2. Her STRING kolon için:
    - runid_stringvalues'a JOIN
+   - string_dictionary'ye JOIN (hücrede kod var, değer sözlükte)
    - stringcols'a JOIN (column_name ile filtrele)
 3. Her NUMERIC kolon için:
    - runid_numericvalues'a JOIN
    - numericcols'a JOIN (column_name ile filtrele)
-4. GROUP BY, ORDER BY, WHERE ekle
+4. GROUP BY, ORDER BY, WHERE ekle (string gruplama kod üzerinde: GROUP BY d.string_code)
 
 TEMPLATE:
 --------
 SELECT 
-    sv.string_value AS kolon_adi,
+    d.string_value AS kolon_adi,
     AGG(nv.numeric_value) AS sonuc
 FROM runs r
 JOIN runid_stringvalues sv ON r.run_id = sv.run_id
+JOIN string_dictionary d ON d.string_code = sv.string_code
 JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     AND sc.column_name = 'KOLON_ADI'
 JOIN runid_numericvalues nv ON r.run_id = nv.run_id
 JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
     AND nc.column_name = 'NUMERIC_KOLON'
 WHERE nv.numeric_value IS NOT NULL
-GROUP BY sv.string_value
+GROUP BY d.string_code
 ORDER BY sonuc DESC;
 */
 
@@ -74,4 +77,11 @@ Eğer sorguların çok yavaş çalışıyorsa:
    CREATE INDEX idx_stringcol_customer 
    ON runid_stringvalues(stringcol_id, run_id) 
    WHERE stringcol_id = (SELECT stringcol_id FROM stringcols WHERE column_name = 'customer');
+
+4. EAV join'leri yerine materialized geniş tabloyu kullan (loader günceller):
+   SELECT solvent_type, SUM(varnish_pct) AS total_varnish_pct
+   FROM production_runs
+   WHERE varnish_pct IS NOT NULL AND solvent_type IS NOT NULL
+   GROUP BY solvent_type;
+   Güncel mi?  python load_data.py --check-mv
 */
\ No newline at end of file
@@ -8,13 +8,14 @@ USE cylinder_bands_db;
 -- NOT: Sadece count gerektiği için numeric JOIN'e gerek yok!
 
 SELECT 
-    sv.string_value AS customer,
+    d.string_value AS customer,
     COUNT(DISTINCT r.run_id) AS total_runs
 FROM runs r
 -- Customer için JOIN
 JOIN runid_stringvalues sv ON r.run_id = sv.run_id
+JOIN string_dictionary d ON d.string_code = sv.string_code
 JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     AND sc.column_name = 'customer'
-GROUP BY sv.string_value
+GROUP BY d.string_code
 ORDER BY total_runs DESC;
 
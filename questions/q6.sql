@@ -28,18 +28,19 @@ ORDER BY min_viscosity;
 -- ÇÖZÜM 2: Eğer job_number STRING kolonsa:
 /*
 SELECT 
-    sv.string_value AS job_id,
+    d.string_value AS job_id,
     MIN(nv.numeric_value) AS min_viscosity,
     COUNT(DISTINCT r.run_id) AS run_count
 FROM runs r
 JOIN runid_stringvalues sv ON r.run_id = sv.run_id
+JOIN string_dictionary d ON d.string_code = sv.string_code
 JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     AND sc.column_name = 'job_number'
 JOIN runid_numericvalues nv ON r.run_id = nv.run_id
 JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
     AND nc.column_name = 'viscosity'
 WHERE nv.numeric_value IS NOT NULL
-GROUP BY sv.string_value
+GROUP BY d.string_code
 ORDER BY min_viscosity;
 */
 
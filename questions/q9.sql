@@ -7,12 +7,13 @@ USE cylinder_bands_db;
 --   - chrome_content (numeric)
 
 SELECT 
-    sv.string_value AS press_type,
+    d.string_value AS press_type,
     AVG(nv.numeric_value) AS avg_chrome_content,
     COUNT(DISTINCT r.run_id) AS run_count
 FROM runs r
 -- Press type için JOIN
 JOIN runid_stringvalues sv ON r.run_id = sv.run_id
+JOIN string_dictionary d ON d.string_code = sv.string_code
 JOIN stringcols sc ON sv.stringcol_id = sc.stringcol_id
     AND sc.column_name = 'press_type'
 -- Chrome content için JOIN
@@ -20,6 +21,6 @@ JOIN runid_numericvalues nv ON r.run_id = nv.run_id
 JOIN numericcols nc ON nv.numericcol_id = nc.numericcol_id
     AND nc.column_name = 'chrome_content'
 WHERE nv.numeric_value IS NOT NULL
-GROUP BY sv.string_value
+GROUP BY d.string_code
 ORDER BY avg_chrome_content DESC;
 
@@ -0,0 +1,137 @@
+"""
+CYLINDER BANDS DATABASE - ROLLUP CUBE
+(string sütun, string değer, numeric sütun) başına n / sum / sum of squares.
+Loader her yüklemede delta'yı ekler; tek sütunlu "grupla + topla" soruları
+değer tablolarına dokunmadan buradan cevaplanır.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+CUBE_TABLE = 'rollup_cube'
+CUBE_COLUMNS = ['stringcol_id', 'numericcol_id', 'string_value', 'n', 'total', 'total_sq']
+RUN_COUNT_MEASURE = 0  # numericcol_id = 0 -> ölçü yok, sadece run sayısı
+
+# Küpten hesaplanabilen aggregate'ler
+CUBE_AGGREGATES = ('count', 'sum', 'avg', 'var', 'std')
+
+
+def cube_contributions(string_long, numeric_long, sign=1):
+    """Uzun (run_id, col_id, value) tablolarından küp satırları - vektörel
+
+    Her (string sütun, numeric sütun) çifti için string kodları üzerinde bincount;
+    sign=-1 -> silinen / değişen run'ların eski katkısı
+    """
+    string_long = string_long.dropna(subset=['value'])
+    numeric_long = numeric_long.dropna(subset=['value'])
+    runs = np.union1d(string_long['run_id'].to_numpy(dtype=np.int64),
+                      numeric_long['run_id'].to_numpy(dtype=np.int64))
+
+    # numeric sütunlar: run başına değer + NULL maskesi
+    numerics = {}
+    for col_id, group in numeric_long.groupby('col_id', sort=True):
+        rows = np.searchsorted(runs, group['run_id'].to_numpy(dtype=np.int64))
+        values = np.zeros(len(runs), dtype=np.float64)
+        valid = np.zeros(len(runs), dtype=bool)
+        # DECIMAL(10,5) ile aynı yuvarlama -> ekleme ve çıkarma aynı değerleri görür
+        values[rows] = group['value'].astype(float).round(5).to_numpy()
+        valid[rows] = True
+        numerics[int(col_id)] = (values, valid)
+
+    parts = []
+    for col_id, group in string_long.groupby('col_id', sort=True):
+        rows = np.searchsorted(runs, group['run_id'].to_numpy(dtype=np.int64))
+        codes, categories = pd.factorize(group['value'].astype(str))
+        size = len(categories)
+        categories = np.asarray(categories, dtype=object)
+
+        counts = np.bincount(codes, minlength=size)
+        parts.append(pd.DataFrame({
+            'stringcol_id': int(col_id), 'numericcol_id': RUN_COUNT_MEASURE,
+            'string_value': categories, 'n': counts, 'total': 0.0, 'total_sq': 0.0,
+        }))
+
+        for numeric_id, (values, valid) in numerics.items():
+            present = valid[rows]
+            group_codes = codes[present]
+            measure = values[rows][present]
+            n = np.bincount(group_codes, minlength=size)
+            keep = n > 0
+            parts.append(pd.DataFrame({
+                'stringcol_id': int(col_id), 'numericcol_id': numeric_id,
+                'string_value': categories[keep], 'n': n[keep],
+                'total': np.bincount(group_codes, weights=measure, minlength=size)[keep],
+                'total_sq': np.bincount(group_codes, weights=measure * measure, minlength=size)[keep],
+            }))
+
+    if not parts:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+    cube = pd.concat(parts, ignore_index=True)
+    if sign < 0:
+        cube[['n', 'total', 'total_sq']] *= -1
+    return cube[CUBE_COLUMNS]
+
+
+def combine_deltas(*deltas):
+    """Aynı küp hücresine düşen delta'ları topla, etkisizleri at"""
+    frames = [d for d in deltas if len(d)]
+    if not frames:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+    delta = (pd.concat(frames, ignore_index=True)
+             .groupby(['stringcol_id', 'numericcol_id', 'string_value'], as_index=False, sort=False)
+             [['n', 'total', 'total_sq']].sum())
+    delta = delta[(delta['n'] != 0) | (delta['total'] != 0) | (delta['total_sq'] != 0)]
+    return delta.astype({'stringcol_id': 'int64', 'numericcol_id': 'int64', 'n': 'int64'})[CUBE_COLUMNS]
+
+
+# ============================================================================
+# SORGU
+# ============================================================================
+
+def cube_version(cursor):
+    """(data_version, küpün data_version'ı) -> eşitse küp güncel"""
+    cursor.execute(f"""
+        SELECT l.data_version, m.data_version
+        FROM load_state l
+        LEFT JOIN materialized_state m ON m.name = '{CUBE_TABLE}'
+        WHERE l.id = 1
+    """)
+    row = cursor.fetchone()
+    return tuple(row.values()) if isinstance(row, dict) else tuple(row)
+
+
+def finish_aggregates(n, total, total_sq, aggs):
+    """Küp hücresinden istenen aggregate'ler (var / std: popülasyon, MySQL STDDEV gibi)"""
+    result = {}
+    mean = total / n if n else None
+    for agg in aggs:
+        if agg == 'count':
+            result[agg] = n
+        elif agg == 'sum':
+            result[agg] = total
+        elif agg == 'avg':
+            result[agg] = mean
+        else:
+            variance = max(total_sq / n - mean * mean, 0.0) if n else None
+            result[agg] = variance if agg == 'var' or variance is None else variance ** 0.5
+    return result
+
+
+def query_cube(cursor, group_name, stringcol_id, numericcol_id, aggs):
+    """Tek string sütunla grupla, bir numeric sütunu topla -> [{group_name: değer, agg: ...}]
+
+    numericcol_id=None -> sadece run sayısı
+    """
+    cursor.execute(
+        f"SELECT string_value, n, total, total_sq FROM {CUBE_TABLE} "
+        "WHERE stringcol_id = %s AND numericcol_id = %s AND n > 0 "
+        "ORDER BY string_value",
+        (stringcol_id, RUN_COUNT_MEASURE if numericcol_id is None else numericcol_id)
+    )
+    rows = []
+    for row in cursor.fetchall():
+        value, n, total, total_sq = row.values() if isinstance(row, dict) else row
+        rows.append({group_name: value,
+                     **finish_aggregates(int(n), float(total), float(total_sq), aggs)})
+    return rows
@@ -0,0 +1,85 @@
+"""
+CYLINDER BANDS DATABASE - RUN DETAIL CACHE
+/run/<run_id> sayfalarının render edilmiş hali için boyut + bellek sınırlı LRU;
+ETag = data_version + run_id, böylece If-None-Match veritabanına gitmeden cevaplanır
+"""
+
+from collections import OrderedDict
+
+from versioned_cache import VersionedCache
+
+
+class RunDetailCache(VersionedCache):
+    """run_id -> (render edilmiş HTML, ETag) LRU'su
+
+    Girdiler o anki data_version'a aittir; data_version değiştiyse önbellek boşaltılır.
+    Poll aralığı içinde etag() / get() veritabanına hiç gitmez.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=32 * 1024 * 1024, check_interval=30.0, poll=None):
+        super().__init__(check_interval, poll)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # run_id -> (body, etag)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def refresh(self, connection, data_version):
+        # Boşaltma ile sürüm değişimi atomik: eski sürümün put()'u araya giremez
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._version = data_version
+
+    def etag(self, run_id):
+        """Güncel ETag; data_version kontrolü gerekiyorsa None (önce ensure_fresh)"""
+        if not self.is_fresh():
+            return None
+        return f"{self._version}-{run_id}"
+
+    def get(self, run_id):
+        """-> (body, etag) veya None"""
+        with self._lock:
+            entry = self._entries.get(run_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(run_id)
+            self.hits += 1
+            return entry
+
+    def __contains__(self, run_id):
+        with self._lock:
+            return run_id in self._entries
+
+    def put(self, run_id, body, data_version):
+        """Render edilmiş sayfayı ekle; eski data_version'a aitse veya tek başına sınırı aşıyorsa eklenmez"""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        size = len(body)
+        with self._lock:
+            if data_version != self._version or size > self.max_bytes:
+                return None
+            previous = self._entries.pop(run_id, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            entry = (body, f"{data_version}-{run_id}")
+            self._entries[run_id] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+            return entry
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._version = None
+
+    def metrics(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes,
+                    'max_entries': self.max_entries, 'max_bytes': self.max_bytes,
+                    'data_version': self._version, 'hits': self.hits, 'misses': self.misses}
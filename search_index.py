@@ -0,0 +1,212 @@
+"""
+CYLINDER BANDS DATABASE - TRIGRAM SEARCH INDEX
+quick_search / string attribute aramaları için bellek içi n-gram index'i:
+LIKE '%q%' ile runid_stringvalues taraması yerine trigram -> değer -> run_id
+"""
+
+import time
+from collections import defaultdict
+
+from string_dictionary import fetch_dictionary
+from versioned_cache import VersionedCache
+
+
+def normalize(text):
+    """Küçük harf, baş/son boşluk yok, tek boşluk"""
+    return ' '.join(str(text).lower().split())
+
+
+def trigrams(text, padded=True):
+    """Metnin 3'lü parçaları; padded=True -> kelime başı/sonu da sayılır"""
+    if padded:
+        text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """(sütun, değer) çiftleri üzerinde trigram index'i
+
+    Farklı değer sayısı run sayısından çok küçük olduğundan (customer, ink_type...)
+    trigram'lar değerlere, değerler run_id posting list'lerine bağlanır.
+    """
+
+    def __init__(self):
+        self._values = []                 # value_id -> (col_id, value, normalized)
+        self._value_ids = {}              # (col_id, value) -> value_id
+        self._postings = []               # value_id -> [run_id, ...]
+        self._grams = defaultdict(set)    # trigram -> {value_id}
+        self._timestamps = {}             # run_id -> timestamp
+        self._string_values = {}          # (run_id, col_id) -> value
+
+    def add_run(self, run_id, timestamp):
+        self._timestamps[run_id] = timestamp
+
+    def add(self, col_id, value, run_id):
+        key = (col_id, value)
+        value_id = self._value_ids.get(key)
+        if value_id is None:
+            value_id = len(self._values)
+            normalized = normalize(value)
+            self._values.append((col_id, value, normalized))
+            self._value_ids[key] = value_id
+            self._postings.append([])
+            for gram in trigrams(normalized):
+                self._grams[gram].add(value_id)
+        self._postings[value_id].append(run_id)
+        self._string_values[(run_id, col_id)] = value
+
+    def finalize(self):
+        for posting in self._postings:
+            posting.sort()
+
+    def timestamp(self, run_id):
+        return self._timestamps.get(run_id)
+
+    def value(self, run_id, col_id):
+        return self._string_values.get((run_id, col_id))
+
+    def __len__(self):
+        return len(self._values)
+
+    def _candidates(self, query, col_id):
+        """Sorgunun tüm iç trigram'larını içeren değerler (substring adayları)"""
+        grams = trigrams(query, padded=False)
+        if not grams:
+            # 3 karakterden kısa sorgu -> sütunun tüm değerleri aday
+            return {vid for vid, (cid, _, _) in enumerate(self._values)
+                    if col_id is None or cid == col_id}
+
+        # En seçici trigram'dan başlayarak kesişim
+        postings = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        if col_id is not None:
+            candidates = {vid for vid in candidates if self._values[vid][0] == col_id}
+        return candidates
+
+    def _fuzzy_candidates(self, query, col_id, min_similarity):
+        """Trigram benzerliği (Jaccard) eşiği geçen değerler -> {value_id: skor}"""
+        query_grams = trigrams(query)
+        overlap = defaultdict(int)
+        for gram in query_grams:
+            for vid in self._grams.get(gram, ()):
+                overlap[vid] += 1
+
+        scores = {}
+        for vid, shared in overlap.items():
+            cid, _, normalized = self._values[vid]
+            if col_id is not None and cid != col_id:
+                continue
+            value_grams = len(normalized) + 1  # padded trigram sayısı (yaklaşık)
+            similarity = shared / (len(query_grams) + value_grams - shared)
+            if similarity >= min_similarity:
+                scores[vid] = similarity
+        return scores
+
+    def search(self, query, col_id=None, k=50, fuzzy=True, min_similarity=0.3):
+        """Sıralı eşleşen değerler: [{'col_id', 'value', 'score', 'match', 'run_ids'}]
+
+        Sıralama: tam eşleşme > önek > substring > fuzzy; eşitlikte run sayısı.
+        Substring eşleşmesi yoksa ve fuzzy=True ise trigram benzerliğine düşer.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        matches = []
+        for vid in self._candidates(query, col_id):
+            cid, value, normalized = self._values[vid]
+            if query not in normalized:
+                continue  # trigram'lar var ama sırası farklı
+            if normalized == query:
+                match, score = 'exact', 3.0
+            elif normalized.startswith(query):
+                match, score = 'prefix', 2.0 + len(query) / len(normalized)
+            else:
+                match, score = 'substring', 1.0 + len(query) / len(normalized)
+            matches.append((score, len(self._postings[vid]), vid, match))
+
+        if not matches and fuzzy:
+            for vid, similarity in self._fuzzy_candidates(query, col_id, min_similarity).items():
+                matches.append((similarity, len(self._postings[vid]), vid, 'fuzzy'))
+
+        matches.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [
+            {'col_id': self._values[vid][0],
+             'value': self._values[vid][1],
+             'score': round(score, 4),
+             'match': match,
+             'run_ids': self._postings[vid]}
+            for score, _, vid, match in matches[:k]
+        ]
+
+    def search_runs(self, query, col_id=None, limit=50, fuzzy=True):
+        """Eşleşen değerlerin run'ları, değer sırasına göre en fazla `limit` adet
+
+        -> ([(run_id, value), ...], fuzzy_kullanıldı_mı)
+        """
+        results = []
+        used_fuzzy = False
+        for match in self.search(query, col_id, k=limit, fuzzy=fuzzy):
+            used_fuzzy = used_fuzzy or match['match'] == 'fuzzy'
+            for run_id in match['run_ids']:
+                results.append((run_id, match['value']))
+                if len(results) >= limit:
+                    return results, used_fuzzy
+        return results, used_fuzzy
+
+
+class SearchIndex(VersionedCache):
+    """Uygulama genelinde TrigramIndex; data_version değişince yeniden kurulur"""
+
+    def __init__(self, check_interval=30.0, col_ids=None, poll=None):
+        super().__init__(check_interval, poll)
+        self.col_ids = col_ids  # None -> tüm string sütunlar
+        self._index = None
+        self.build_seconds = None
+
+    def build(self, connection, data_version=None):
+        """runs + runid_stringvalues (+ string_dictionary)'dan yeni index kur ve atomik olarak değiştir"""
+        self.reload(connection, data_version)
+        return self._index
+
+    def refresh(self, connection, data_version):
+        start = time.perf_counter()
+        cursor = connection.cursor()
+        index = TrigramIndex()
+        cursor.execute("SELECT run_id, timestamp FROM runs")
+        for run_id, timestamp in cursor.fetchall():
+            index.add_run(run_id, timestamp)
+
+        # Hücreler kod taşır; kod -> değer sözlükten (küçük) bir kez okunur
+        dictionary = fetch_dictionary(cursor, self.col_ids)
+        values = dict(zip(dictionary['code'].tolist(), dictionary['value'].tolist()))
+
+        sql = "SELECT stringcol_id, string_code, run_id FROM runid_stringvalues"
+        params = ()
+        if self.col_ids:
+            sql += f" WHERE stringcol_id IN ({', '.join(['%s'] * len(self.col_ids))})"
+            params = tuple(self.col_ids)
+        cursor.execute(sql, params)
+        for col_id, code, run_id in cursor:
+            value = values.get(code)
+            if value is not None:
+                index.add(col_id, value, run_id)
+        cursor.close()
+        index.finalize()
+
+        with self._lock:
+            self._index = index
+        self.build_seconds = time.perf_counter() - start
+
+    def ensure_fresh(self, connection):
+        """data_version değiştiyse yeniden kur; güncel index'i döndür"""
+        super().ensure_fresh(connection)
+        return self._index
+
+    @property
+    def index(self):
+        return self._index
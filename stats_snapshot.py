@@ -0,0 +1,324 @@
+"""
+CYLINDER BANDS DATABASE - STATISTICS SNAPSHOT
+/statistics dashboard'unun aggregate'leri: loader hesaplar, app tek fetch ile okur
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import nullcontext
+from datetime import date, datetime
+from decimal import Decimal
+
+
+# Dashboard sorguları: isim -> (SQL, 'one' | 'all')
+STATISTICS_QUERIES = {
+    # Toplam run sayısı
+    'total_runs': ("SELECT COUNT(*) as total_runs FROM runs", 'one'),
+
+    # Band type dağılımı
+    'band_distribution': ("""
+        SELECT band_type as string_value, COUNT(*) as count
+        FROM production_runs
+        WHERE band_type IS NOT NULL
+        GROUP BY band_type
+    """, 'all'),
+
+    # En çok kullanılan silindir
+    'top_cylinder': ("""
+        SELECT cylinder_number as cylinder, COUNT(*) as count
+        FROM production_runs
+        WHERE cylinder_number IS NOT NULL
+        GROUP BY cylinder_number
+        ORDER BY count DESC
+        LIMIT 1
+    """, 'one'),
+
+    # Top 10 Customers
+    'top_customers': ("""
+        SELECT customer, COUNT(*) as count
+        FROM production_runs
+        WHERE customer IS NOT NULL
+        GROUP BY customer
+        ORDER BY count DESC
+        LIMIT 10
+    """, 'all'),
+
+    # Ink Type dağılımı
+    'ink_distribution': ("""
+        SELECT ink_type, COUNT(*) as count
+        FROM production_runs
+        WHERE ink_type IS NOT NULL
+        GROUP BY ink_type
+        ORDER BY count DESC
+    """, 'all'),
+
+    # Press kullanımı
+    'press_distribution': ("""
+        SELECT press, COUNT(*) as count
+        FROM production_runs
+        WHERE press IS NOT NULL
+        GROUP BY press
+        ORDER BY count DESC
+    """, 'all'),
+
+    # Ortalama numeric değerler
+    'numeric_stats': ("""
+        SELECT
+            AVG(proof_cut) as avg_proof_cut,
+            AVG(viscosity) as avg_viscosity,
+            AVG(wax) as avg_wax,
+            AVG(hardener) as avg_hardener
+        FROM production_runs
+    """, 'one'),
+}
+
+# Paralel hesaplamada sorgu başına süre sınırı (saniye) ve başarısız sorgunun yerine geçen değer
+STATISTICS_QUERY_TIMEOUT = 5.0
+EMPTY_RESULTS = {'one': None, 'all': []}
+
+# Sunucu sorguyu kesmezse worker'ın sonucu bu kadar ek süre beklenir; kuyruktaki
+# sorgu da timeout + bu süre içinde başlamazsa iptal edilir
+STATISTICS_TIMEOUT_GRACE = 1.0
+
+# Bazı sorgular başarısızsa kısmi payload bu kadar saniye önbellekte kalır (kaydedilmez)
+PARTIAL_TTL = 5.0
+
+
+def json_default(value):
+    """json.dumps için Decimal / tarih dönüşümü"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(value)}")
+
+
+def build_payload(results, errors=None):
+    """Sorgu sonuçlarından template'in beklediği (JSON uyumlu) sözlüğü üret
+
+    errors: başarısız sorgular (isim -> hata); sonuçları EMPTY_RESULTS değerleridir
+    """
+    total_runs = (results['total_runs'] or {}).get('total_runs') or 0
+    band_distribution = results['band_distribution']
+
+    # Band yüzdesi hesapla
+    band_count = sum([item['count'] for item in band_distribution if item['string_value'] == 'band'])
+    band_percentage = round((band_count / total_runs) * 100, 1) if total_runs > 0 else 0
+
+    payload = {
+        'total_runs': total_runs,
+        'band_percentage': band_percentage,
+        'top_cylinder': results['top_cylinder'],
+        'band_distribution': band_distribution,
+        'top_customers': results['top_customers'],
+        'ink_distribution': results['ink_distribution'],
+        'press_distribution': results['press_distribution'],
+        'numeric_stats': results['numeric_stats'],
+        'errors': errors or {},
+    }
+    return json.loads(json.dumps(payload, default=json_default))
+
+
+def compute_statistics(connection):
+    """Tüm dashboard sorgularını çalıştır"""
+    cursor = connection.cursor(dictionary=True)
+    results = {}
+    for name, (sql, fetch) in STATISTICS_QUERIES.items():
+        cursor.execute(sql)
+        results[name] = cursor.fetchone() if fetch == 'one' else cursor.fetchall()
+    cursor.close()
+    return build_payload(results)
+
+
+def with_execution_limit(sql, timeout, dialect):
+    """MySQL: sunucu tarafı süre sınırı (SELECT optimizer hint'i); SQLite'ta değişmez"""
+    if dialect == 'mysql':
+        return sql.replace('SELECT', f'SELECT /*+ MAX_EXECUTION_TIME({int(timeout * 1000)}) */', 1)
+    return sql
+
+
+def run_statistics_query(backend, name, timeout=STATISTICS_QUERY_TIMEOUT, started=None):
+    """Tek dashboard sorgusu, havuzdan kendi bağlantısıyla (worker thread'de)
+
+    Süre sorgu çalışmaya başlayınca işler (started[name]'e yazılır) ve veritabanında
+    uygulanır: MySQL MAX_EXECUTION_TIME, SQLite bağlantının execution_limit'i.
+    Süresi dolan sorgu TimeoutError verir, bağlantı ve worker serbest kalır.
+    """
+    sql, fetch = STATISTICS_QUERIES[name]
+    with backend.connection() as connection:
+        limit = getattr(connection, 'execution_limit', None)
+        cursor = connection.cursor(dictionary=True)
+        start = time.monotonic()
+        if started is not None:
+            started[name] = start
+        try:
+            with limit(timeout) if limit else nullcontext():
+                cursor.execute(with_execution_limit(sql, timeout, backend.dialect))
+                return cursor.fetchone() if fetch == 'one' else cursor.fetchall()
+        except Exception as e:
+            if time.monotonic() - start >= timeout:
+                raise TimeoutError(f'{timeout} sn içinde tamamlanmadı') from e
+            raise
+        finally:
+            cursor.close()
+
+
+def compute_statistics_concurrent(backend, executor, timeout=STATISTICS_QUERY_TIMEOUT):
+    """Dashboard sorgularını havuzdaki bağlantılara dağıt, hepsini topla -> payload
+
+    Süre ≈ en yavaş sorgu. Süresi dolan / hata veren sorgunun yerine boş değer
+    konur ve payload['errors']'a yazılır; sayfa yine render edilir. Sorgu başına
+    süre kuyrukta beklerken değil, çalışmaya başlayınca işler; hiç başlayamayan
+    sorgu kuyruktan çıkarılır (sonraki yenileme tekrar dener).
+    """
+    started = {}
+    submitted_at = time.monotonic()
+    futures = {executor.submit(run_statistics_query, backend, name, timeout, started): name
+               for name in STATISTICS_QUERIES}
+    results, errors = {}, {}
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = str(e)
+
+        now = time.monotonic()
+        for future in list(pending):
+            name = futures[future]
+            start = started.get(name)
+            if (start is None and now - submitted_at >= timeout + STATISTICS_TIMEOUT_GRACE
+                    and future.cancel()):
+                errors[name] = f'{timeout} sn içinde başlatılamadı'
+            elif start is not None and now - start >= timeout + STATISTICS_TIMEOUT_GRACE:
+                # Sürücü kesemediyse sonuç beklenmez (worker sorgu bitince serbest kalır)
+                errors[name] = f'{timeout} sn içinde tamamlanmadı'
+            else:
+                continue
+            pending.discard(future)
+
+    for name in errors:
+        results[name] = EMPTY_RESULTS[STATISTICS_QUERIES[name][1]]
+    return build_payload(results, errors)
+
+
+def get_data_version(connection):
+    cursor = connection.cursor()
+    cursor.execute("SELECT data_version FROM load_state WHERE id = 1")
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return version
+
+
+def refresh_statistics_snapshot(connection):
+    """Snapshot'ı mevcut data_version için yeniden hesapla ve kaydet"""
+    version = get_data_version(connection)
+    payload = compute_statistics(connection)
+    save_statistics_snapshot(connection, version, payload)
+    return version, payload
+
+
+def save_statistics_snapshot(connection, version, payload):
+    cursor = connection.cursor()
+    cursor.execute(
+        # REPLACE: MySQL ve SQLite'ta aynı (tek satırlık tablo)
+        "REPLACE INTO statistics_snapshot (id, data_version, payload) VALUES (1, %s, %s)",
+        (version, json.dumps(payload))
+    )
+    connection.commit()
+    cursor.close()
+
+
+def load_snapshot(connection):
+    """Tek fetch: (mevcut data_version, snapshot data_version, payload)"""
+    cursor = connection.cursor()
+    cursor.execute("""
+        SELECT l.data_version, s.data_version, s.payload
+        FROM load_state l
+        LEFT JOIN statistics_snapshot s ON s.id = 1
+        WHERE l.id = 1
+    """)
+    current_version, snapshot_version, payload = cursor.fetchone()
+    cursor.close()
+
+    if isinstance(payload, (bytes, bytearray)):
+        payload = payload.decode('utf-8')
+    return current_version, snapshot_version, json.loads(payload) if payload else None
+
+
+class StatisticsCache:
+    """Snapshot'ın process içi kopyası (TTL)
+
+    TTL içinde veritabanına hiç gidilmez. TTL dolunca tek sorguyla data_version
+    kontrol edilir; snapshot bayatsa yeniden hesaplanıp kaydedilir. backend +
+    executor verilirse sorgular paralel çalışır; aynı anda tek thread yeniler.
+    """
+
+    def __init__(self, ttl=60.0, backend=None, executor=None, query_timeout=STATISTICS_QUERY_TIMEOUT):
+        self.ttl = ttl
+        self.backend = backend
+        self.executor = executor
+        self.query_timeout = query_timeout
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._payload = None
+        self._version = None
+        self._expires_at = 0.0
+
+    def _cached(self):
+        with self._lock:
+            if self._payload is not None and time.monotonic() < self._expires_at:
+                return self._payload
+        return None
+
+    def get(self, connection=None):
+        """connection verilmezse (backend ile) havuzdan yalnızca okuma / kaydetme için alınır"""
+        payload = self._cached()
+        if payload is not None:
+            return payload
+
+        with self._refresh_lock:
+            # Beklerken başka thread yenilemiş olabilir
+            payload = self._cached()
+            if payload is not None:
+                return payload
+
+            with self._connection(connection) as conn:
+                current_version, snapshot_version, payload = load_snapshot(conn)
+            if payload is None or snapshot_version != current_version:
+                current_version, payload = self._refresh(connection, current_version)
+            payload.setdefault('errors', {})  # eski snapshot'larda yok
+
+            # Kısmi sonuç kaydedilmez, kısa süre sonra tekrar denenir
+            ttl = PARTIAL_TTL if payload.get('errors') else self.ttl
+            with self._lock:
+                self._payload = payload
+                self._version = current_version
+                self._expires_at = time.monotonic() + ttl
+        return payload
+
+    def _connection(self, connection):
+        """Verilen bağlantı ya da havuzdan kısa süreli bir tane"""
+        return nullcontext(connection) if connection is not None else self.backend.connection()
+
+    def _refresh(self, connection, version):
+        if self.backend is None or self.executor is None:
+            with self._connection(connection) as conn:
+                return refresh_statistics_snapshot(conn)
+
+        # Paralel sorgular sürerken çağıranın bağlantısı tutulmaz (havuzda 7 + 1 yerine 7)
+        payload = compute_statistics_concurrent(self.backend, self.executor, self.query_timeout)
+        if not payload['errors']:
+            with self._connection(connection) as conn:
+                save_statistics_snapshot(conn, version, payload)
+        return version, payload
+
+    def invalidate(self):
+        with self._lock:
+            self._payload = None
+            self._expires_at = 0.0
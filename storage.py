@@ -0,0 +1,419 @@
+"""
+CYLINDER BANDS DATABASE - STORAGE BACKEND
+Aynı 5 tablolu EAV şeması üzerinde değiştirilebilir depolama katmanı:
+MySQL (stored procedure'ler) veya gömülü SQLite dosyası (Python karşılıkları)
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from db_pool import ConnectionPool
+
+
+SQLITE_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'SQL_queries', 'cylinder_bands_sqlite.sql')
+
+RUN_ID_PATTERN = re.compile(r'^[0-9]+$')
+
+
+# ============================================================================
+# DIALECT YARDIMCILARI (loader ve app ortak SQL'i)
+# ============================================================================
+
+def dialect_of(connection_or_cursor):
+    """'sqlite' veya 'mysql' (mysql.connector nesnelerinde dialect özniteliği yok)"""
+    return getattr(connection_or_cursor, 'dialect', 'mysql')
+
+
+def escape_like(value):
+    """LIKE joker karakterlerini (%, _) kullanıcı girdisinde etkisizleştir"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def like_clause(dialect):
+    """'LIKE %s' + kaçış karakteri (MySQL'de varsayılan \\, SQLite'ta açıkça verilir)"""
+    return "LIKE %s ESCAPE '\\'" if dialect == 'sqlite' else "LIKE %s"
+
+
+def lock_clause(dialect):
+    """Satır kilidi; SQLite yazıcıları zaten dosya seviyesinde sıralar"""
+    return "" if dialect == 'sqlite' else " FOR UPDATE"
+
+
+def upsert_clause(dialect, update_columns, increment=False):
+    """INSERT'e eklenecek çakışma durumunda güncelleme ifadesi
+
+    increment=True -> mevcut değere ekle (col = col + yeni)
+    """
+    if dialect == 'sqlite':
+        new_value = "excluded.{}"
+        prefix = " ON CONFLICT DO UPDATE SET "
+    else:
+        new_value = "VALUES({})"
+        prefix = " ON DUPLICATE KEY UPDATE "
+    return prefix + ", ".join(
+        f"{col} = {col + ' + ' if increment else ''}{new_value.format(col)}"
+        for col in update_columns
+    )
+
+
+def table_columns(cursor, table):
+    """Tablonun sütun isimleri, tanım sırasıyla"""
+    if dialect_of(cursor) == 'sqlite':
+        cursor.execute("SELECT name AS column_name FROM pragma_table_info(%s) ORDER BY cid",
+                       (table,))
+    else:
+        cursor.execute(
+            "SELECT column_name AS column_name FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = %s "
+            "ORDER BY ordinal_position",
+            (table,)
+        )
+    return [row['column_name'] if isinstance(row, dict) else row[0]
+            for row in cursor.fetchall()]
+
+
+# ============================================================================
+# SQLITE: mysql.connector benzeri bağlantı / cursor
+# ============================================================================
+
+class SQLiteCursor:
+    """sqlite3 cursor'ı mysql.connector arayüzüyle (%s, dictionary=True, column_names)"""
+
+    dialect = 'sqlite'
+
+    def __init__(self, connection, dictionary=False):
+        self._connection = connection
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+        self.lastrowid = None
+
+    @staticmethod
+    def _sql(sql):
+        return sql.replace('%s', '?')
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(self._sql(sql), tuple(params or ()))
+        self.lastrowid = self._cursor.lastrowid
+
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        self._cursor.executemany(self._sql(sql), rows)
+        if rows and sql.lstrip().upper().startswith('INSERT'):
+            # MySQL çok-satırlı INSERT gibi: lastrowid = eklenen ilk satırın id'si
+            # (tek yazıcı transaction'ında AUTOINCREMENT aralığı ardışıktır)
+            last_id = self._connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+            self.lastrowid = last_id - len(rows) + 1
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        for row in self._cursor:
+            yield self._row(row)
+
+    @property
+    def column_names(self):
+        return tuple(d[0] for d in self._cursor.description or ())
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """sqlite3 bağlantısı; ConnectionPool'un beklediği ping / rollback / close"""
+
+    dialect = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        # Havuzdaki bağlantı farklı thread'lerde (sırayla) kullanılabilir
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.execute("PRAGMA journal_mode = WAL")  # okuyucular yazıcıyı beklemez
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+
+    def cursor(self, dictionary=False, buffered=True):
+        return SQLiteCursor(self._connection, dictionary=dictionary)
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def ping(self, reconnect=True, attempts=1, delay=0):
+        self._connection.execute("SELECT 1")
+
+    @contextmanager
+    def execution_limit(self, timeout):
+        """MAX_EXECUTION_TIME karşılığı: süre dolunca çalışan sorgu 'interrupted' ile kesilir"""
+        deadline = time.monotonic() + timeout
+        self._connection.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        try:
+            yield
+        finally:
+            self._connection.set_progress_handler(None, 0)
+
+    def close(self):
+        self._connection.close()
+
+
+class SQLitePool(ConnectionPool):
+    """ConnectionPool'un SQLite dosyası açan hali (aynı metrikler, aynı arayüz)"""
+
+    errors = (sqlite3.Error,)
+    connection_errors = (sqlite3.OperationalError, sqlite3.InterfaceError)
+
+    def __init__(self, path, **kwargs):
+        super().__init__({'database': path}, **kwargs)
+        self.path = path
+
+    def _open(self):
+        return SQLiteConnection(self.path)
+
+
+# ============================================================================
+# BACKEND'LER
+# ============================================================================
+
+class StorageBackend:
+    """Depolama arayüzü + stored procedure'lerin taşınabilir SQL karşılıkları
+
+    Procedure karşılıkları açık bir cursor (dictionary=True) alır ve prosedürle
+    aynı satırları döndürür. get_runs_list'in karşılığı app.build_runs_query.
+    """
+
+    dialect = None
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def connection(self):
+        """with backend.connection() as connection: ... (havuzdan)"""
+        return self.pool.connection()
+
+    def connect(self):
+        """Havuz dışı tek bağlantı (loader)"""
+        return self.pool._open()
+
+    def metrics(self):
+        return {'backend': self.dialect, **self.pool.metrics()}
+
+    def close_all(self):
+        self.pool.close_all()
+
+    def get_run_details(self, cursor, run_id):
+        """-> (run satırı veya None, string değerler (kod), numeric değerler)"""
+        cursor.execute("SELECT run_id, timestamp FROM runs WHERE run_id = %s", (run_id,))
+        run = cursor.fetchone()
+        cursor.execute(
+            "SELECT stringcol_id, string_code FROM runid_stringvalues WHERE run_id = %s",
+            (run_id,)
+        )
+        string_rows = cursor.fetchall()
+        cursor.execute(
+            "SELECT numericcol_id, numeric_value FROM runid_numericvalues WHERE run_id = %s",
+            (run_id,)
+        )
+        numeric_rows = cursor.fetchall()
+        return run, string_rows, numeric_rows
+
+    def get_runs_details(self, cursor, run_ids):
+        """Birden çok run için get_run_details, tek sorguda (WHERE run_id IN ...)
+
+        -> {run_id: (run satırı, string değerler (kod), numeric değerler)}; olmayan run'lar yok
+        """
+        if not run_ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(run_ids))
+        cursor.execute(f"""
+            SELECT r.run_id, r.timestamp, 's' AS kind, sv.stringcol_id AS col_id,
+                   sv.string_code, NULL AS numeric_value
+            FROM runs r
+            LEFT JOIN runid_stringvalues sv ON sv.run_id = r.run_id
+            WHERE r.run_id IN ({placeholders})
+            UNION ALL
+            SELECT nv.run_id, NULL, 'n', nv.numericcol_id, NULL, nv.numeric_value
+            FROM runid_numericvalues nv
+            WHERE nv.run_id IN ({placeholders})
+            ORDER BY run_id, kind DESC, col_id""", tuple(run_ids) * 2)
+
+        details = {}
+        for row in cursor.fetchall():
+            if row['kind'] == 's':
+                if row['run_id'] not in details:
+                    details[row['run_id']] = ({'run_id': row['run_id'], 'timestamp': row['timestamp']}, [], [])
+                if row['col_id'] is not None:
+                    details[row['run_id']][1].append(
+                        {'stringcol_id': row['col_id'], 'string_code': row['string_code']})
+            elif row['run_id'] in details:
+                details[row['run_id']][2].append(
+                    {'numericcol_id': row['col_id'], 'numeric_value': row['numeric_value']})
+        return details
+
+    def quick_search(self, cursor, query, customer_col_id, limit=50):
+        """-> (search_type, satırlar): sayıysa run_id, değilse customer substring"""
+        if RUN_ID_PATTERN.match(query):
+            cursor.execute("SELECT run_id, timestamp FROM runs WHERE run_id = %s", (int(query),))
+            return 'Run ID', cursor.fetchall()
+
+        cursor.execute(f"""
+            SELECT DISTINCT r.run_id, r.timestamp, d.string_value AS customer
+            FROM string_dictionary d
+            JOIN runid_stringvalues sv ON sv.stringcol_id = d.stringcol_id AND sv.string_code = d.string_code
+            JOIN runs r ON r.run_id = sv.run_id
+            WHERE d.stringcol_id = %s
+            AND d.string_value {like_clause(self.dialect)}
+            ORDER BY r.run_id
+            LIMIT %s""", (customer_col_id, '%' + escape_like(query) + '%', limit))
+        return 'Customer Name', cursor.fetchall()
+
+    def search_string_attribute(self, cursor, stringcol_id, search_value, limit=100):
+        """String sütunda substring araması -> [{'run_id', 'timestamp', 'value'}]"""
+        cursor.execute(f"""
+            SELECT r.run_id, r.timestamp, d.string_value AS value
+            FROM string_dictionary d
+            JOIN runid_stringvalues sv ON sv.stringcol_id = d.stringcol_id AND sv.string_code = d.string_code
+            JOIN runs r ON r.run_id = sv.run_id
+            WHERE d.stringcol_id = %s
+            AND d.string_value {like_clause(self.dialect)}
+            ORDER BY r.run_id
+            LIMIT %s""", (stringcol_id, '%' + escape_like(search_value) + '%', limit))
+        return cursor.fetchall()
+
+    def search_numeric_attribute(self, cursor, numericcol_id, min_value=None, max_value=None,
+                                 after_value=None, after_run_id=None, limit=100):
+        """Numeric sütunda aralık araması (sınırlar opsiyonel) -> [{'run_id', 'timestamp', 'value'}]
+
+        Sıralama (value, run_id): idx_numericcol_value aralık taraması, ayrı sıralama yok.
+        after_value + after_run_id: önceki sayfanın son satırı (keyset imleci)
+        """
+        conditions = ["nv.numericcol_id = %s"]
+        params = [numericcol_id]
+        if min_value is not None:
+            conditions.append("nv.numeric_value >= %s")
+            params.append(min_value)
+        if max_value is not None:
+            conditions.append("nv.numeric_value <= %s")
+            params.append(max_value)
+        if after_run_id is not None:
+            conditions.append("nv.numeric_value >= %s AND (nv.numeric_value > %s OR nv.run_id > %s)")
+            params += [after_value, after_value, after_run_id]
+        cursor.execute(f"""
+            SELECT r.run_id, r.timestamp, nv.numeric_value AS value
+            FROM runid_numericvalues nv
+            JOIN runs r ON r.run_id = nv.run_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY nv.numeric_value, nv.run_id
+            LIMIT %s""", params + [limit])
+        return cursor.fetchall()
+
+
+class MySQLBackend(StorageBackend):
+    """MySQL sunucusu; procedure'ler sunucudaki stored procedure'lerle çalışır"""
+
+    dialect = 'mysql'
+
+    def __init__(self, db_config, size=10, timeout=5.0, health_check_interval=30.0):
+        super().__init__(ConnectionPool(db_config, size=size, timeout=timeout,
+                                        health_check_interval=health_check_interval))
+
+    def _call(self, cursor, name, args):
+        cursor.callproc(name, args)
+        return [result.fetchall() for result in cursor.stored_results()]
+
+    def get_run_details(self, cursor, run_id):
+        results = self._call(cursor, 'get_run_details', [run_id])
+        if len(results) < 3:
+            return None, [], []
+        return (results[0][0] if results[0] else None), results[1], results[2]
+
+    def quick_search(self, cursor, query, customer_col_id, limit=50):
+        results = self._call(cursor, 'quick_search', [query, customer_col_id, None])
+        search_type = 'Run ID' if RUN_ID_PATTERN.match(query) else 'Customer Name'
+        return search_type, (results[0] if results else [])[:limit]
+
+    def search_string_attribute(self, cursor, stringcol_id, search_value, limit=100):
+        results = self._call(cursor, 'search_string_attribute', [stringcol_id, search_value])
+        return (results[0] if results else [])[:limit]
+
+    def search_numeric_attribute(self, cursor, numericcol_id, min_value=None, max_value=None,
+                                 after_value=None, after_run_id=None, limit=100):
+        results = self._call(cursor, 'search_numeric_attribute',
+                             [numericcol_id, min_value, max_value, after_value, after_run_id, limit])
+        return results[0] if results else []
+
+
+class SQLiteBackend(StorageBackend):
+    """Gömülü SQLite dosyası; sunucu gerekmez (edge kutuları, CI)"""
+
+    dialect = 'sqlite'
+
+    def __init__(self, path, size=10, timeout=5.0, health_check_interval=30.0,
+                 schema_file=SQLITE_SCHEMA):
+        self.path = path
+        self.schema_file = schema_file
+        self._init_lock = threading.Lock()
+        self.initialize()
+        super().__init__(SQLitePool(path, size=size, timeout=timeout,
+                                    health_check_interval=health_check_interval))
+
+    def initialize(self):
+        """Dosyada şema yoksa cylinder_bands_sqlite.sql'i çalıştır"""
+        with self._init_lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+            try:
+                exists = connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'runs'"
+                ).fetchone()
+                if not exists:
+                    with open(self.schema_file, encoding='utf-8') as f:
+                        connection.executescript(f.read())
+                    connection.commit()
+                    print(f"✓ SQLite şeması oluşturuldu: {self.path}")
+            finally:
+                connection.close()
+
+    def connect(self):
+        return SQLiteConnection(self.path)
+
+
+BACKENDS = {
+    'mysql': MySQLBackend,
+    'sqlite': SQLiteBackend,
+}
+
+
+def create_backend(name, **kwargs):
+    """'mysql' (db_config=...) veya 'sqlite' (path=...) backend'i oluştur"""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen backend: {name} (seçenekler: {', '.join(BACKENDS)})")
+    return backend_class(**kwargs)
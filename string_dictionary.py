@@ -0,0 +1,94 @@
+"""
+CYLINDER BANDS DATABASE - STRING VALUE DICTIONARY
+runid_stringvalues hücreleri string_dictionary kodunu saklar; bu modül
+kod -> değer çözümünü (ve loader için değer -> kod eşlemesini) Python tarafında yapar
+"""
+
+import pandas as pd
+
+from versioned_cache import VersionedCache
+
+
+DICTIONARY_TABLE = 'string_dictionary'
+DICTIONARY_COLUMNS = ['stringcol_id', 'string_value']
+
+
+def fetch_dictionary(cursor, col_ids=None, after_code=None):
+    """string_dictionary satırları -> DataFrame(code, col_id, value)
+
+    after_code: sadece bu koddan sonra eklenenler (kodlar artan, satırlar silinmez)
+    """
+    sql = f"SELECT string_code, stringcol_id, string_value FROM {DICTIONARY_TABLE}"
+    conditions = []
+    params = []
+    if col_ids:
+        conditions.append(f"stringcol_id IN ({', '.join(['%s'] * len(col_ids))})")
+        params += [int(col_id) for col_id in col_ids]
+    if after_code is not None:
+        conditions.append("string_code > %s")
+        params.append(int(after_code))
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    cursor.execute(sql, tuple(params))
+    rows = [tuple(row.values()) if isinstance(row, dict) else row for row in cursor.fetchall()]
+    return pd.DataFrame(rows, columns=['code', 'col_id', 'value']).astype(
+        {'code': 'int64', 'col_id': 'int64'})
+
+
+def decode_frame(long_df, decode):
+    """Uzun (run_id, col_id, code) tablosuna 'value' sütunu ekle (kod -> değer)"""
+    return long_df.assign(value=long_df['code'].map(decode))
+
+
+class StringDictionary(VersionedCache):
+    """Process genelinde kod -> değer haritası
+
+    Sözlük yalnızca yüklemelerde büyür ve her yükleme data_version'ı artırır;
+    data_version değiştiyse yeniden okunur. Farklı değer sayısı küçük olduğundan
+    tamamı bellekte tutulur.
+    """
+
+    def __init__(self, check_interval=30.0, poll=None):
+        super().__init__(check_interval, poll)
+        self._values = {}   # string_code -> string_value
+        self._codes = {}    # (stringcol_id, string_value) -> string_code
+
+    def load(self, connection, data_version=None):
+        """string_dictionary tablosunu oku"""
+        self.reload(connection, data_version)
+
+    def refresh(self, connection, data_version):
+        cursor = connection.cursor()
+        dictionary = fetch_dictionary(cursor)
+        cursor.close()
+
+        values = dict(zip(dictionary['code'].tolist(), dictionary['value'].tolist()))
+        codes = dict(zip(zip(dictionary['col_id'].tolist(), dictionary['value'].tolist()),
+                         dictionary['code'].tolist()))
+        with self._lock:
+            self._values = values
+            self._codes = codes
+
+    def ensure_codes(self, connection, codes):
+        """ensure_fresh + bilinmeyen kod varsa (aralık içinde yükleme olmuş) hemen yeniden yükle
+
+        Poll da yenilenir ki diğer önbellekler aynı yüklemeyi görsün; kodlar data_version
+        artmadan commit edilmiş olabilir (yükleme sürüyor), o zaman doğrudan okunur.
+        """
+        self.ensure_fresh(connection)
+        if any(code not in self._values for code in codes):
+            self.poll.expire()
+            self.ensure_fresh(connection)
+        if any(code not in self._values for code in codes):
+            self.load(connection)
+
+    def value(self, string_code):
+        """Kod -> değer (bilinmeyen kod: None)"""
+        return self._values.get(string_code)
+
+    def code(self, stringcol_id, string_value):
+        """(sütun, değer) -> kod (sözlükte yoksa None: hiçbir hücre eşleşmez)"""
+        return self._codes.get((stringcol_id, string_value))
+
+    def __len__(self):
+        return len(self._values)
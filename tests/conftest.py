@@ -0,0 +1,73 @@
+"""
+Ortak fixture'lar: sentetik ham veri -> cleaning.py -> Arrow snapshot -> geçici SQLite
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import load_data  # noqa: E402
+from cleaning import execute_senior_db_cleaning, snapshot_path  # noqa: E402
+from generate_data import generate  # noqa: E402
+
+TEST_ROWS = 3000
+
+
+@pytest.fixture(scope='session')
+def raw_csv(tmp_path_factory):
+    """Ölçeklenmiş ham UCI formatı (typo'lu müşteriler, mükerrer satırlar dahil)"""
+    path = str(tmp_path_factory.mktemp('raw') / 'cylinder.csv')
+    generate(TEST_ROWS, path, seed=7)
+    return path
+
+
+@pytest.fixture(scope='session')
+def cleaned_csv(raw_csv, tmp_path_factory):
+    """cleaning.py çıktısı (yanında loader'ın okuduğu .arrow snapshot)"""
+    workdir = tmp_path_factory.mktemp('cleaned')
+    path = str(workdir / 'cleaned_cylinder.csv')
+    execute_senior_db_cleaning(raw_csv, path, str(workdir / 'report.txt'))
+    return path
+
+
+@pytest.fixture
+def loader_input(cleaned_csv):
+    """(df, string_cols, numeric_cols); loader df'i değiştirdiği için her testte yeniden okunur"""
+    return load_data.load_snapshot(snapshot_path(cleaned_csv))
+
+
+@pytest.fixture
+def load(cleaned_csv):
+    """load(sqlite_path, **kwargs) -> load_data.main ile snapshot'tan yükle"""
+    def run(sqlite_path, **kwargs):
+        load_data.main(snapshot=snapshot_path(cleaned_csv), sqlite_path=str(sqlite_path), **kwargs)
+        return str(sqlite_path)
+    return run
+
+
+@pytest.fixture(scope='session')
+def loaded_db(cleaned_csv, tmp_path_factory):
+    """Tam yüklenmiş SQLite dosyası (sadece okuyan testler paylaşır)"""
+    path = str(tmp_path_factory.mktemp('db') / 'cylinder.db')
+    load_data.main(snapshot=snapshot_path(cleaned_csv), sqlite_path=path)
+    return path
+
+
+@pytest.fixture(scope='session')
+def app_module(loaded_db):
+    """app.py, loaded_db üzerinde SQLite backend'iyle (modül bir kez import edilir)"""
+    os.environ['CYLINDER_DB_BACKEND'] = 'sqlite'
+    os.environ['CYLINDER_SQLITE_PATH'] = loaded_db
+    os.environ.setdefault('CYLINDER_SLOW_QUERY_MS', '60000')
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
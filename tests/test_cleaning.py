@@ -0,0 +1,49 @@
+import os
+
+import pyarrow as pa
+import pytest
+
+from cleaning import SNAPSHOT_METADATA_KEY, execute_senior_db_cleaning, snapshot_path
+from conftest import ROOT
+from generate_data import generate
+
+CHUNK_SIZES = [7, 13, 50, 100, 500, 1000]
+UCI_CSV = os.path.join(ROOT, 'data', 'cylinder_band.csv')
+# 7 satırlık chunk'lar chunk başına sabit maliyet öder; girdi küçük tutulur
+STREAMING_ROWS = 600
+
+
+def clean(input_file, workdir, chunksize=None):
+    """-> (csv baytları, Arrow tablosu, snapshot sınıflandırması, rapor satırları)"""
+    output_csv = os.path.join(workdir, 'cleaned_cylinder.csv')
+    report_file = os.path.join(workdir, 'report.txt')
+    execute_senior_db_cleaning(input_file, output_csv, report_file, chunksize=chunksize)
+    with open(output_csv, 'rb') as f:
+        csv_bytes = f.read()
+    with pa.memory_map(snapshot_path(output_csv)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    with open(report_file, encoding='utf-8') as f:
+        report = f.read().splitlines()
+    return csv_bytes, table, table.schema.metadata[SNAPSHOT_METADATA_KEY], report
+
+
+@pytest.fixture(scope='module', params=['generated', 'uci'])
+def in_memory(request, tmp_path_factory):
+    input_file = UCI_CSV
+    if request.param == 'generated':
+        input_file = str(tmp_path_factory.mktemp('streaming_raw') / 'cylinder.csv')
+        generate(STREAMING_ROWS, input_file, seed=11)
+    return input_file, clean(input_file, str(tmp_path_factory.mktemp('in_memory')))
+
+
+@pytest.mark.parametrize('chunksize', CHUNK_SIZES)
+def test_streaming_matches_in_memory(in_memory, tmp_path, chunksize):
+    input_file, (csv_bytes, table, classification, report) = in_memory
+    streamed_bytes, streamed_table, streamed_classification, streamed_report = clean(input_file, str(tmp_path), chunksize)
+
+    assert streamed_bytes == csv_bytes
+    assert streamed_table.schema.equals(table.schema, check_metadata=False)
+    assert streamed_table.equals(table)
+    assert streamed_classification == classification
+    # Son özet (satır/sütun sayısı) aynı
+    assert streamed_report[-2:] == report[-2:]
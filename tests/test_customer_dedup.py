@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from bench_customer_dedup import legacy_replacements, synthetic_counts
+from cleaning import find_fuzzy_replacements
+
+
+@pytest.mark.parametrize('n_names, seed', [(20, 1), (200, 2), (200, 3), (800, 42)])
+def test_fuzzy_replacements_match_get_close_matches(n_names, seed):
+    counts = synthetic_counts(n_names, seed=seed)
+    assert find_fuzzy_replacements(counts) == legacy_replacements(counts)
+
+
+def test_fuzzy_replacements_edge_cases():
+    """Kısa isimler, eşit sayılar, zincirleme eşleşmeler ve boşluklu yazımlar"""
+    counts = pd.Series({
+        'donnelley': 40, 'donnelly': 40, 'donelley': 3, 'donnelley ': 2,
+        'abc': 9, 'abd': 5, 'ab': 4, 'a': 3, 'b': 3,
+        'smith press': 12, 'smith pres': 6, 'smyth press': 6, 'smith presss': 1,
+        'ccl': 7, 'cclx': 7, 'zz top': 2,
+    }).sort_values(ascending=False, kind='stable')
+    assert find_fuzzy_replacements(counts) == legacy_replacements(counts)
+
+
+def test_fuzzy_replacements_on_generated_customers(raw_csv):
+    """Üretilmiş veri setinin müşteri yazımları (Phase 5 öncesi normalize edilmiş hali)"""
+    customers = pd.read_csv(raw_csv, usecols=['customer'])['customer'].dropna()
+    counts = customers.astype(str).str.strip().str.lower().value_counts()
+    assert find_fuzzy_replacements(counts) == legacy_replacements(counts)
@@ -0,0 +1,152 @@
+import re
+import sqlite3
+
+import numpy as np
+import pytest
+
+from facet_index import RunBitmap
+
+RUN_LINK = re.compile(r'href="/run/(\d+)"')
+SORTS = [(sort_by, order) for sort_by in ('run_id', 'timestamp') for order in ('ASC', 'DESC')]
+PAGE_LIMIT = 7
+MAX_PAGES = 12
+
+
+@pytest.fixture(scope='module')
+def filter_values(loaded_db):
+    """Veritabanındaki gerçek değerlerden /runs filtreleri"""
+    connection = sqlite3.connect(loaded_db)
+    try:
+        customer, = connection.execute("""
+            SELECT customer FROM production_runs WHERE customer IS NOT NULL
+            GROUP BY customer ORDER BY COUNT(*) DESC, customer LIMIT 1
+        """).fetchone()
+        dates = [row[0] for row in connection.execute("SELECT timestamp FROM runs ORDER BY timestamp")]
+    finally:
+        connection.close()
+    low, high = dates[len(dates) // 4], dates[len(dates) * 3 // 4]
+    return [
+        {},
+        {'customer': customer},
+        {'customer': customer[:2].upper()},  # önek, büyük/küçük harf duyarsız
+        {'band_type': 'band'},
+        {'date_from': low, 'date_to': high},
+        {'date_from': high},
+        {'customer': customer[:1], 'band_type': 'noband', 'date_to': high},
+        {'customer': 'no-such-customer'},
+    ]
+
+
+def walk_pages(client, filters, sort_by, sort_order, limit=PAGE_LIMIT):
+    """/runs'u sayfa sayfa gez -> sayfaların run_id listeleri (en fazla MAX_PAGES sayfa)"""
+    pages, after_run_id = [], None
+    while len(pages) < MAX_PAGES:
+        params = dict(filters, sort_by=sort_by, sort_order=sort_order, limit=limit)
+        if after_run_id is not None:
+            params['after_run_id'] = after_run_id
+        response = client.get('/runs', query_string=params)
+        assert response.status_code == 200
+        html = response.get_data(as_text=True)
+        run_ids = [int(run_id) for run_id in RUN_LINK.findall(html)]
+        pages.append(run_ids)
+        if 'Next Page' not in html:
+            break
+        assert len(run_ids) == limit
+        after_run_id = run_ids[-1]
+    return pages
+
+
+@pytest.mark.parametrize('sort_by, sort_order', SORTS)
+def test_runs_pages_match_sql_path(app_module, client, filter_values, monkeypatch, sort_by, sort_order):
+    for filters in filter_values:
+        monkeypatch.setattr(app_module, 'FACET_INDEX_ENABLED', True)
+        indexed = walk_pages(client, filters, sort_by, sort_order)
+        monkeypatch.setattr(app_module, 'FACET_INDEX_ENABLED', False)
+        sql = walk_pages(client, filters, sort_by, sort_order)
+        assert indexed == sql, filters
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3])
+def test_timestamp_keyset_paging_covers_ties(app_module, client, monkeypatch, limit):
+    """Aynı tarihli run'lar sayfa sınırında kaybolmaz / tekrarlanmaz"""
+    with app_module.db_backend.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT timestamp FROM runs GROUP BY timestamp "
+                       "ORDER BY COUNT(*) DESC, timestamp LIMIT 1")
+        day, = cursor.fetchone()
+        cursor.execute("SELECT run_id FROM runs WHERE timestamp = %s", (day,))
+        expected = sorted(row[0] for row in cursor.fetchall())
+        cursor.close()
+    assert len(expected) > limit
+
+    for enabled in (True, False):
+        monkeypatch.setattr(app_module, 'FACET_INDEX_ENABLED', enabled)
+        for sort_order in ('ASC', 'DESC'):
+            pages = walk_pages(client, {'date_from': str(day), 'date_to': str(day)},
+                               'timestamp', sort_order, limit=limit)
+            seen = [run_id for page in pages for run_id in page]
+            assert seen == sorted(expected, reverse=sort_order == 'DESC')
+
+
+def test_facet_counts_match_sql(app_module, loaded_db, filter_values):
+    connection = sqlite3.connect(loaded_db)
+    try:
+        with app_module.db_backend.connection() as pooled:
+            app_module.column_registry.ensure_fresh(pooled)
+            index = app_module.facet_index.ensure_fresh(pooled)
+        low, high = filter_values[4]['date_from'], filter_values[4]['date_to']
+        filters = app_module.facet_filters(index, low, high, None, 'band')
+        counts = app_module.facet_counts(index, filters, ('customer', 'band_type'))
+
+        expected_customers = connection.execute("""
+            SELECT customer, COUNT(*) FROM production_runs
+            WHERE timestamp BETWEEN ? AND ? AND band_type = 'band' AND customer IS NOT NULL
+            GROUP BY customer
+        """, (low, high)).fetchall()
+        expected_bands = connection.execute("""
+            SELECT band_type, COUNT(*) FROM production_runs
+            WHERE timestamp BETWEEN ? AND ? AND band_type IS NOT NULL
+            GROUP BY band_type
+        """, (low, high)).fetchall()
+    finally:
+        connection.close()
+    assert sorted(counts['customer']) == sorted(expected_customers)
+    assert sorted(counts['band_type']) == sorted(expected_bands)
+
+
+@pytest.mark.parametrize('density', [0.001, 0.05, 0.6])
+def test_run_bitmap_set_operations(density):
+    """Dizi ve bitmap chunk'larının karışımı Python set'iyle aynı sonucu verir"""
+    rng = np.random.default_rng(int(density * 1000))
+    universe = 3 * (1 << 16)
+    a = np.flatnonzero(rng.random(universe) < density)
+    b = np.flatnonzero(rng.random(universe) < density * 2)
+    left, right = RunBitmap.from_ids(a), RunBitmap.from_ids(b)
+
+    assert left.ids().tolist() == sorted(set(a.tolist()))
+    assert (left & right).ids().tolist() == sorted(set(a.tolist()) & set(b.tolist()))
+    assert (left | right).ids().tolist() == sorted(set(a.tolist()) | set(b.tolist()))
+    assert (left - right).ids().tolist() == sorted(set(a.tolist()) - set(b.tolist()))
+    assert len(left & right) == len(set(a.tolist()) & set(b.tolist()))
+
+
+CUSTOMER_OPTION = re.compile(r'<option value="([^"]*)">(\d+) runs</option>')
+
+
+def test_runs_customer_suggestions_without_index(app_module, client, loaded_db, monkeypatch):
+    """Index kapalıyken datalist production_runs'tan dolar (en çok run'lı değerler)"""
+    connection = sqlite3.connect(loaded_db)
+    try:
+        expected = connection.execute("""
+            SELECT customer, COUNT(*) FROM production_runs WHERE customer IS NOT NULL
+            GROUP BY customer ORDER BY 2 DESC, customer LIMIT ?
+        """, (app_module.RUNS_FACET_VALUES,)).fetchall()
+    finally:
+        connection.close()
+
+    monkeypatch.setattr(app_module, 'FACET_INDEX_ENABLED', False)
+    for params in ({}, {'band_type': 'band', 'limit': PAGE_LIMIT}):
+        response = client.get('/runs', query_string=params)
+        assert response.status_code == 200
+        options = [(name, int(count)) for name, count in CUSTOMER_OPTION.findall(response.get_data(as_text=True))]
+        assert options and sorted(options) == sorted(expected)
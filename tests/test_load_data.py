@@ -0,0 +1,169 @@
+import sqlite3
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import load_data
+from cleaning import snapshot_path
+
+TABLE_QUERIES = {
+    'runs': "SELECT * FROM runs ORDER BY run_id",
+    'strings': """
+        SELECT sv.run_id, sv.stringcol_id, d.string_value
+        FROM runid_stringvalues sv JOIN string_dictionary d ON d.string_code = sv.string_code
+        ORDER BY 1, 2
+    """,
+    'numerics': "SELECT * FROM runid_numericvalues ORDER BY 1, 2",
+    'fingerprints': "SELECT * FROM run_fingerprints ORDER BY run_id",
+    'production_runs': "SELECT * FROM production_runs ORDER BY run_id",
+    'rollup_cube': "SELECT * FROM rollup_cube ORDER BY 1, 2, 3",
+}
+
+
+def dump(path):
+    connection = sqlite3.connect(path)
+    try:
+        return {name: connection.execute(sql).fetchall() for name, sql in TABLE_QUERIES.items()}
+    finally:
+        connection.close()
+
+
+def test_parallel_load_matches_serial(tmp_path, load, loader_input):
+    serial = dump(load(tmp_path / 'serial.db'))
+    parallel = dump(load(tmp_path / 'parallel.db', workers=3))
+
+    assert len(serial['runs']) == len(loader_input[0])
+    for name in TABLE_QUERIES:
+        assert parallel[name] == serial[name], name
+
+
+def failing_partition(monkeypatch):
+    """Üçüncü bölüm kalıcı hata verir (diğerleri commit etmiş olabilir)"""
+    original = load_data.load_partition
+    calls = []
+
+    def load_partition(connections, partition, *args, **kwargs):
+        calls.append(partition)
+        if len(calls) == 3:
+            raise ValueError('partition failed')
+        return original(connections, partition, *args, **kwargs)
+    monkeypatch.setattr(load_data, 'load_partition', load_partition)
+
+
+def failing_consistency_check(monkeypatch):
+    """Tüm bölümler commit edildikten sonra tutarlılık kontrolü başarısız"""
+    monkeypatch.setattr(load_data, 'check_consistency', lambda connection, partitions=None: ['bozuk'])
+
+
+@pytest.mark.parametrize('inject', [failing_partition, failing_consistency_check])
+def test_failed_parallel_load_rerun_leaves_exactly_n_runs(tmp_path, load, loader_input, monkeypatch, inject):
+    expected_runs = len(loader_input[0])
+    path = str(tmp_path / 'cylinder.db')
+
+    with monkeypatch.context() as patch:
+        inject(patch)
+        load(path, workers=3)
+    failed = dump(path)
+    assert failed['runs'] == [] and failed['strings'] == [] and failed['numerics'] == []
+
+    load(path, workers=3)
+    reloaded = dump(path)
+    assert len(reloaded['runs']) == expected_runs
+    assert len(reloaded['fingerprints']) == expected_runs
+
+    connection = load_data.connect_to_db(sqlite_path=path)
+    try:
+        assert load_data.check_consistency(connection) == []
+    finally:
+        connection.close()
+
+    # Aynı besleme incremental: yeni run yok
+    assert reloaded == dump(load(path, incremental=True))
+
+
+def write_feed(table, df, path):
+    """DataFrame'i kaynak snapshot'ın şemasıyla (sınıflandırma metadata'sı dahil) Arrow'a yaz"""
+    feed = pa.Table.from_pandas(df, schema=table.schema, preserve_index=False)
+    with pa.ipc.new_file(str(path), table.schema) as writer:
+        writer.write_table(feed)
+    return str(path)
+
+
+@pytest.fixture
+def feeds(cleaned_csv, tmp_path):
+    """(ilk besleme, sonraki besleme): ikincisi ilkinin satırlarının bir kısmını değiştirir + yeni run'lar ekler"""
+    with pa.memory_map(snapshot_path(cleaned_csv)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    df = table.to_pandas()
+    cut = len(df) * 2 // 3
+
+    updated = df.copy()
+    rows = updated.index[:cut]
+    # Temiz veri gibi kısa ondalık (SQLite REAL'de 16.619999... ile 16.62 ayrı değerdir)
+    updated.loc[rows[0:20], 'ink_temperature'] = (updated.loc[rows[0:20], 'ink_temperature'] + 1.5).round(2)
+    updated.loc[rows[20:30], 'customer'] = updated.loc[rows[30], 'customer']
+    updated.loc[rows[30:40], 'caliper'] = None
+    updated.loc[rows[40:50], 'blade_mfg'] = None
+    updated.loc[rows[50:60], 'band_type'] = updated.loc[rows[50:60], 'band_type'].map(
+        {'band': 'noband', 'noband': 'band'})
+    updated.loc[rows[60:70], 'press_speed'] += 100
+    missing = updated.loc[rows, 'ink_pct'].isna()
+    updated.loc[missing[missing].index[:10], 'ink_pct'] = 50.0
+
+    return (write_feed(table, df.iloc[:cut], tmp_path / 'first.arrow'),
+            write_feed(table, updated, tmp_path / 'second.arrow'))
+
+
+def test_incremental_load_matches_full_load(tmp_path, feeds):
+    first, second = feeds
+    full = str(tmp_path / 'full.db')
+    load_data.main(snapshot=second, sqlite_path=full)
+    incremental = str(tmp_path / 'incremental.db')
+    load_data.main(snapshot=first, sqlite_path=incremental)
+    before = dump(incremental)
+    load_data.main(snapshot=second, sqlite_path=incremental, incremental=True)
+
+    expected, actual = dump(full), dump(incremental)
+    assert actual['runs'] == expected['runs'] and len(actual['runs']) > len(before['runs'])
+    for name in ('strings', 'numerics', 'fingerprints', 'production_runs'):
+        assert actual[name] == expected[name], name
+    assert actual['rollup_cube'] != before['rollup_cube']
+
+    # Küp: aynı hücreler; toplamlar ekleme/çıkarma sırasına göre son basamakta oynayabilir
+    assert [row[:4] for row in actual['rollup_cube']] == [row[:4] for row in expected['rollup_cube']]
+    for got, want in zip(actual['rollup_cube'], expected['rollup_cube']):
+        assert got[4:] == pytest.approx(want[4:], rel=1e-9, abs=1e-6), got[:3]
+
+
+def test_duplicate_natural_key_keeps_last_row(cleaned_csv, tmp_path):
+    """Aynı (timestamp, job_number, cylinder_number) iki kez: her iki yolda da son satır tek run olur"""
+    with pa.memory_map(snapshot_path(cleaned_csv)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    df = table.to_pandas()
+    duplicate = df.iloc[[5]].copy()
+    duplicate['ink_temperature'] = duplicate['ink_temperature'] + 2
+    feed = write_feed(table, pd.concat([df, duplicate], ignore_index=True), tmp_path / 'feed.arrow')
+    key = tuple(str(value) for value in duplicate[['job_number', 'cylinder_number']].iloc[0])
+
+    full = str(tmp_path / 'full.db')
+    load_data.main(snapshot=feed, sqlite_path=full)
+    loaded = dump(full)
+    assert len(loaded['runs']) == len(df)
+    assert [row[0] for row in loaded['fingerprints']] == [row[0] for row in loaded['runs']]
+
+    connection = sqlite3.connect(full)
+    try:
+        rows = connection.execute("""
+            SELECT ink_temperature FROM production_runs WHERE job_number = ? AND cylinder_number = ?
+        """, key).fetchall()
+    finally:
+        connection.close()
+    assert rows == [(pytest.approx(float(duplicate['ink_temperature'].iloc[0])),)]
+
+    # Aynı besleme incremental: değişiklik yok; boş veritabanına incremental: tam yüklemeyle aynı
+    load_data.main(snapshot=feed, sqlite_path=full, incremental=True)
+    assert dump(full) == loaded
+    incremental = str(tmp_path / 'incremental.db')
+    load_data.main(snapshot=feed, sqlite_path=incremental, incremental=True)
+    assert dump(incremental) == loaded
@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+# (sütun, alt, üst): çok tekrarlı değerler (sayfa sınırında eşitlik) + geniş dağılımlı değerler
+RANGES = [
+    ('chrome_content', None, None),
+    ('chrome_content', 95, 100),
+    ('humidity', 70, 80),
+    ('press_speed', 1000, None),
+    ('ink_temperature', None, 15.5),
+    ('press_speed', 5000, None),
+]
+
+
+def column_values(loaded_db, column_name):
+    connection = sqlite3.connect(loaded_db)
+    try:
+        return [row[0] for row in connection.execute("""
+            SELECT v.numeric_value FROM runid_numericvalues v
+            JOIN numericcols n ON n.numericcol_id = v.numericcol_id
+            WHERE n.column_name = ? AND v.numeric_value IS NOT NULL
+        """, (column_name,))]
+    finally:
+        connection.close()
+
+
+def walk_search(app_module, column_name, low, high, limit):
+    """numeric_search'ü next_cursor ile sonuna kadar gez -> [(run_id, timestamp, value)], toplam, histogram"""
+    rows, cursor, first = [], {}, None
+    while True:
+        page, cursor, total, histogram = app_module.numeric_search(column_name, low, high, limit=limit, **cursor)
+        first = first or (total, histogram)
+        rows.extend((row['run_id'], str(row['timestamp']), float(row['value'])) for row in page)
+        if cursor is None:
+            return rows, first
+        assert len(page) == limit
+
+
+@pytest.mark.parametrize('column_name, low, high', RANGES)
+@pytest.mark.parametrize('limit', [7, 100])
+def test_numeric_search_matches_sql_path(app_module, loaded_db, monkeypatch, column_name, low, high, limit):
+    monkeypatch.setattr(app_module, 'FACET_INDEX_ENABLED', True)
+    indexed, (total, histogram) = walk_search(app_module, column_name, low, high, limit)
+    monkeypatch.setattr(app_module, 'FACET_INDEX_ENABLED', False)
+    sql, (sql_total, sql_histogram) = walk_search(app_module, column_name, low, high, limit)
+
+    assert indexed == sql
+    assert [(value, run_id) for run_id, _, value in indexed] == sorted((value, run_id) for run_id, _, value in indexed)
+    assert sql_total is None and sql_histogram is None
+
+    values = column_values(loaded_db, column_name)
+    in_range = [value for value in values
+                if (low is None or value >= low) and (high is None or value <= high)]
+    assert total == len(in_range) == len(indexed)
+    assert sum(count for _, _, count in histogram) == len(values)
+
+
+@pytest.mark.parametrize('column_name', ['chrome_content', 'humidity', 'press_speed'])
+def test_histogram_buckets_cover_values(app_module, loaded_db, column_name):
+    """Kova sınırları artan; her kovanın sayısı (alt, üst] aralığındaki değer sayısı"""
+    with app_module.db_backend.connection() as connection:
+        app_module.column_registry.ensure_fresh(connection)
+        index = app_module.facet_index.ensure_fresh(connection)
+    histogram = index.histogram(app_module.column_registry.numeric_id(column_name))
+    values = column_values(loaded_db, column_name)
+
+    assert histogram[0][0] == min(values) and histogram[-1][1] == max(values)
+    for position, (low, high, count) in enumerate(histogram):
+        assert low <= high
+        if position:
+            assert low == histogram[position - 1][1]
+            assert count == sum(low < value <= high for value in values)
+        else:
+            assert count == sum(low <= value <= high for value in values)
+
+
+def test_numeric_search_unknown_column(app_module):
+    with pytest.raises(ValueError):
+        app_module.numeric_search('no_such_column')
@@ -0,0 +1,46 @@
+import sqlite3
+
+import pytest
+
+from versioned_cache import VersionedCache, VersionPoll
+
+
+class CountingCache(VersionedCache):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.refreshed = []
+
+    def refresh(self, connection, version):
+        self.refreshed.append(version)
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(':memory:')
+    connection.execute("CREATE TABLE load_state (id INTEGER PRIMARY KEY, data_version INTEGER, schema_version INTEGER)")
+    connection.execute("INSERT INTO load_state VALUES (1, 1, 1)")
+    yield connection
+    connection.close()
+
+
+def test_subclass_without_refresh_fails_on_creation():
+    class Incomplete(VersionedCache):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_shared_poll_refreshes_every_cache_once_per_version(connection):
+    poll = VersionPoll(check_interval=3600)
+    caches = [CountingCache(poll=poll), CountingCache(poll=poll)]
+    for _ in range(3):
+        assert [cache.ensure_fresh(connection) for cache in caches] == [1, 1]
+    assert [cache.refreshed for cache in caches] == [[1], [1]]
+
+    connection.execute("UPDATE load_state SET data_version = 2")
+    assert caches[0].ensure_fresh(connection) == 1  # aralık dolmadı: sorgu yok
+    poll.expire()
+    assert [cache.ensure_fresh(connection) for cache in caches] == [2, 2]
+    assert [cache.refreshed for cache in caches] == [[1, 2], [1, 2]]
+    assert all(cache.is_fresh() for cache in caches)
@@ -0,0 +1,111 @@
+"""
+CYLINDER BANDS DATABASE - VERSIONED CACHES
+load_state sayaçlarına bağlı process içi önbelleklerin ortak tabanı: tek bir VersionPoll
+aralıkta bir kez load_state'i okur, ona bağlı tüm önbellekler aynı sürümü görür
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+def read_versions(connection):
+    """load_state -> {'data_version': ..., 'schema_version': ...} (tek sorgu)"""
+    cursor = connection.cursor()
+    cursor.execute("SELECT data_version, schema_version FROM load_state WHERE id = 1")
+    data_version, schema_version = cursor.fetchone()
+    cursor.close()
+    return {'data_version': data_version, 'schema_version': schema_version}
+
+
+class VersionPoll:
+    """load_state'in paylaşılan okuması
+
+    `check_interval` saniyede en fazla bir sorgu atılır. Aynı poll'u kullanan önbellekler
+    (registry, sözlük, index'ler, run önbelleği) bir yüklemeden sonra aynı sürüme geçer;
+    biri yeni veriyi, diğeri eskisini gösteremez.
+    """
+
+    def __init__(self, check_interval=30.0):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._versions = None
+        self._checked_at = 0.0
+
+    def fresh(self):
+        """Aralık içinde mi? (sürüm veritabanına gitmeden biliniyor)"""
+        with self._lock:
+            return (self._versions is not None
+                    and time.monotonic() - self._checked_at < self.check_interval)
+
+    def peek(self, key):
+        """Son okunan sürüm (hiç okunmadıysa None); veritabanına gitmez"""
+        versions = self._versions
+        return versions[key] if versions is not None else None
+
+    def versions(self, connection):
+        """Güncel sürümler; aralık dolduysa tek sorguyla yeniden okunur"""
+        if self.fresh():
+            return self._versions
+        versions = read_versions(connection)
+        with self._lock:
+            self._versions = versions
+            self._checked_at = time.monotonic()
+        return versions
+
+    def expire(self):
+        """Sonraki versions() veritabanını okusun (aralık içinde yükleme olduğu anlaşıldıysa)"""
+        with self._lock:
+            self._checked_at = 0.0
+
+
+class VersionedCache(ABC):
+    """Bir load_state sayacına (`version_key`) bağlı önbellek tabanı
+
+    Alt sınıf refresh(connection, version)'ı yazar; sürüm değişince (ilk kullanım dahil)
+    çağrılır. Aynı anda tek thread yeniler, bekleyenler yeni hali kullanır.
+    poll verilmezse önbellek kendi VersionPoll'unu kullanır (CLI / loader).
+    """
+
+    version_key = 'data_version'
+
+    def __init__(self, check_interval=30.0, poll=None):
+        self.poll = poll or VersionPoll(check_interval)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._version = None
+
+    @abstractmethod
+    def refresh(self, connection, version):
+        """Önbelleği `version` için veritabanından yeniden kur"""
+
+    def ensure_fresh(self, connection):
+        """Sürüm değiştiyse yenile; güncel sürümü döndür"""
+        version = self.poll.versions(connection)[self.version_key]
+        if version != self._version:
+            with self._refresh_lock:
+                if version != self._version:
+                    self._apply(self.refresh, connection, version)
+        return version
+
+    def reload(self, connection, version=None, refresh=None):
+        """Sürüme bakmadan yenile (version None -> veritabanından okunur)"""
+        if version is None:
+            version = read_versions(connection)[self.version_key]
+        with self._refresh_lock:
+            self._apply(refresh or self.refresh, connection, version)
+        return version
+
+    def _apply(self, refresh, connection, version):
+        refresh(connection, version)
+        with self._lock:
+            self._version = version
+
+    def is_fresh(self):
+        """Poll aralık içinde ve önbellek poll'un sürümünde mi? (veritabanına gitmez)"""
+        return (self._version is not None and self.poll.fresh()
+                and self.poll.peek(self.version_key) == self._version)
+
+    @property
+    def version(self):
+        return self._version